@@ -50,14 +50,15 @@ export const fetchSectors = async () => {
 export const fetchAnalysisPrediction = async (
     stock_name: string,
     days_out: number,
-    noise_level: number
+    noise_level: number,
+    seed?: number // Optional noise seed; defaults to one derived from the ticker and last bar
   ) => {
     const response = await fetch(`http://127.0.0.1:10000/analysis/predict`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify({ stock_name, days_out, noise_level }),
+      body: JSON.stringify({ stock_name, days_out, noise_level, seed }),
     });
   
     if (!response.ok) {
@@ -65,7 +66,59 @@ export const fetchAnalysisPrediction = async (
     }
     return await response.json();
   };
-  
+
+// Streams a forecast day by day over server-sent events; resolves with the full lists once done
+export const streamAnalysisPrediction = (
+    stock_name: string,
+    days_out: number,
+    noise_level: number,
+    onDay: (day: { day: number; historical: number; recent: number }) => void,
+    seed?: number
+  ): Promise<{ stock_name: string; historical_predictions: number[]; recent_predictions: number[] }> => {
+    const params = new URLSearchParams({
+      stock_name,
+      days_out: String(days_out),
+      noise_level: String(noise_level),
+    });
+    if (seed !== undefined) {
+      params.set("seed", String(seed));
+    }
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`http://127.0.0.1:10000/analysis/predict/stream?${params}`);
+      source.addEventListener("day", (event) => onDay(JSON.parse((event as MessageEvent).data)));
+      source.addEventListener("done", (event) => {
+        source.close();
+        resolve(JSON.parse((event as MessageEvent).data));
+      });
+      source.addEventListener("error", (event) => {
+        source.close();
+        const data = (event as MessageEvent).data;
+        reject(new Error(data ? JSON.parse(data).error : `Failed to stream prediction for stock: ${stock_name}`));
+      });
+    });
+  };
+
+// Predicts several tickers in one request; tickers sharing a sector model are advanced together
+export const fetchBatchAnalysisPredictions = async (
+    tickers: string[],
+    days_out: number,
+    noise_level: number
+  ) => {
+    const response = await fetch(`http://127.0.0.1:10000/analysis/predict/batch`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ tickers, days_out, noise_level }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch batch predictions for: ${tickers.join(", ")}`);
+    }
+    return await response.json();
+  };
+
 
 export const fetchHistoricalData = async (sector: string, timeframe: string) => {
     const response = await fetch(`http://127.0.0.1:10000/data/historical/${sector}/${timeframe}`);
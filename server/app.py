@@ -2,8 +2,9 @@ from config import app, api, db
 from resources.user_resource import UserResource, UserListResource
 from resources.stock_resource import StockResource, StockListResource, StockBySymbolResource, StocksBySectorResourceID
 from resources.sector_resource import SectorResource, SectorListResource, SectorStockCountResource, SectorByNameResource, StocksBySectorResourceName
-from resources.analysis_resource import AnalysisPredictResource
+from resources.analysis_resource import AnalysisPredictResource, AnalysisPredictBatchResource, AnalysisPredictStreamResource, ModelRegistryStatsResource
 from resources.data_resource import DataFetchResource, StockDataFetchResource
+from resources.cache_resource import CacheStatsResource
 from models import User, Stock, Sector, Analysis, Alert, Notification
 
 # User resources
@@ -27,10 +28,17 @@ api.add_resource(SectorStockCountResource, '/sectors/stocks/min_count/<int:min_c
 
 # Analysis resources
 api.add_resource(AnalysisPredictResource, '/analysis/predict')
+api.add_resource(AnalysisPredictBatchResource, '/analysis/predict/batch')
+api.add_resource(AnalysisPredictStreamResource, '/analysis/predict/stream')
+api.add_resource(ModelRegistryStatsResource, '/analysis/models/stats')
 
 # Data resources
 api.add_resource(StockDataFetchResource, '/stocks/fetch/<string:symbol>')
 api.add_resource(DataFetchResource, '/data/historical/<string:sector>/<string:timeframe>')
+api.add_resource(DataFetchResource, '/data/<string:symbol>', endpoint='data_by_symbol')
+
+# Cache resources
+api.add_resource(CacheStatsResource, '/cache/stats')
 
 if __name__ == '__main__':
     with app.app_context():
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import pandas as pd
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils import redis_helper
+from utils.redis_helper import ArrowCodec, PickleCodec, decode_value
+from utils.indicator_engine import add_indicators
+from utils.intraday_features import transform_intraday
+from benchmarks.fixtures import make_ohlcv, make_minute_bars
+
+# A period="max" daily history and a month of one-minute bars
+DAILY_ROWS = 25 * 252
+INTRADAY_SESSIONS = 21
+REPEATS = 5
+
+
+def best_of(function, repeats=REPEATS):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def codecs():
+    """
+    (label, encode, decode) of the legacy JSON-inside-pickle format and of every codec.
+    """
+    yield (
+        "json records in pickle",
+        lambda frame: pickle.dumps(frame.to_json(orient="records")),
+        lambda data: pd.DataFrame(json.loads(pickle.loads(data))),
+    )
+    pickle_codec = PickleCodec()
+    yield "pickle", lambda frame: redis_helper.encode_value(frame, pickle_codec.name), decode_value
+    if redis_helper.pa is None:
+        return
+    for compression in ("none", "lz4", "zstd"):
+        codec = ArrowCodec(compression)
+
+        def encode(frame, codec=codec):
+            header = redis_helper.CODEC_MAGIC + bytes([redis_helper.CODEC_FORMAT_VERSION]) + codec.tag
+            return header + codec.encode(frame)
+
+        yield f"arrow {compression}", encode, decode_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare payload size and decode time of the cache codecs.")
+    parser.add_argument("--daily-rows", type=int, default=DAILY_ROWS)
+    parser.add_argument("--intraday-sessions", type=int, default=INTRADAY_SESSIONS)
+    args = parser.parse_args()
+    if redis_helper.pa is None:
+        print("pyarrow is not installed; only the pickle codecs are timed.")
+
+    payloads = {
+        "daily transformed": add_indicators(make_ohlcv(args.daily_rows)),
+        "intraday transformed": transform_intraday(make_minute_bars(args.intraday_sessions)),
+    }
+    for name, frame in payloads.items():
+        print(f"{name}: {len(frame)} rows x {frame.shape[1]} columns")
+        print(f"  {'codec':24} {'KB':>9} {'encode ms':>10} {'decode ms':>10}")
+        for label, encode, decode in codecs():
+            encode_seconds, data = best_of(lambda: encode(frame))
+            decode_seconds, _ = best_of(lambda: decode(data))
+            print(f"  {label:24} {len(data) / 1024:9.1f} {encode_seconds * 1000:10.2f} {decode_seconds * 1000:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import FLOAT32_RTOL, compact_frame, feature_drift, sliding_windows
+from utils.indicator_engine import DERIVED_COLUMNS, FEATURE_COLUMNS, add_indicators_by_ticker
+from benchmarks.fixtures import make_ohlcv
+
+TICKERS = 25
+ROWS = 25 * 252
+SEQUENCE_LENGTH = 200
+LSTM_TICKERS = 5  # Windows of a few tickers; the legacy list of copies grows with every window
+REPEATS = 3
+
+
+def best_of(function, repeats=REPEATS):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def megabytes(nbytes):
+    return nbytes / 2 ** 20
+
+
+def report(name, full_bytes, compact_bytes, full_seconds, compact_seconds):
+    print(
+        f"{name:26} {megabytes(full_bytes):9.1f} {megabytes(compact_bytes):9.1f} {full_bytes / compact_bytes:6.1f}x"
+        f" {full_seconds * 1000:9.1f} {compact_seconds * 1000:9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare float64 and compact float32 feature representations.")
+    parser.add_argument("--tickers", type=int, default=TICKERS)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--sequence-length", type=int, default=SEQUENCE_LENGTH)
+    args = parser.parse_args()
+
+    raw = pd.concat(
+        [make_ohlcv(args.rows, seed=seed).assign(Ticker=f"T{seed:03d}") for seed in range(args.tickers)],
+        ignore_index=True,
+    )
+    print(f"{args.tickers} tickers x {args.rows} rows, LSTM windows of {args.sequence_length} rows")
+    print(f"{'':26} {'f64 MB':>9} {'f32 MB':>9} {'ratio':>7} {'f64 ms':>9} {'f32 ms':>9}")
+
+    # Feature frame: the indicator columns stored compact, then the whole frame
+    full_seconds, full = best_of(lambda: add_indicators_by_ticker(raw.copy(), DERIVED_COLUMNS, fill="ffill"))
+    compact_seconds, compact = best_of(
+        lambda: add_indicators_by_ticker(raw.copy(), DERIVED_COLUMNS, fill="ffill", dtype=np.float32)
+    )
+    compact = compact_frame(compact)
+    report(
+        "feature frame", full[FEATURE_COLUMNS].memory_usage().sum(), compact[FEATURE_COLUMNS].memory_usage().sum(),
+        full_seconds, compact_seconds,
+    )
+    drift = feature_drift(full[FEATURE_COLUMNS], compact[FEATURE_COLUMNS])
+    worst = max(drift, key=drift.get)
+    print(f"{'':26} largest drift {drift[worst]:.2e} ({worst}), tolerance {FLOAT32_RTOL:.2e}")
+
+    # Random Forest .npy artifact
+    full_seconds, rf_full = best_of(lambda: full[FEATURE_COLUMNS].to_numpy())
+    compact_seconds, rf_compact = best_of(lambda: compact[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+    report("RandomForest_*.npy", rf_full.nbytes, rf_compact.nbytes, full_seconds, compact_seconds)
+
+    # LSTM windows: a list of float64 slices stacked into an array, against zero-copy float32 views
+    features = full[full["Ticker"].isin(full["Ticker"].unique()[:LSTM_TICKERS])][FEATURE_COLUMNS].to_numpy()
+    length = args.sequence_length
+
+    def legacy_windows():
+        return np.array([features[i:i + length] for i in range(len(features) - length)])
+
+    def compact_windows():
+        return np.ascontiguousarray(sliding_windows(features, length)[:len(features) - length])
+
+    legacy_seconds, legacy = best_of(legacy_windows, repeats=1)
+    copied_seconds, copied = best_of(compact_windows, repeats=1)
+    report("LSTM windows (copied)", legacy.nbytes, copied.nbytes, legacy_seconds, copied_seconds)
+    view_seconds, _ = best_of(lambda: sliding_windows(features, length))
+    held = np.asarray(features, dtype=np.float32).nbytes
+    print(f"{'LSTM windows (view)':26} {'':9} {megabytes(held):9.1f} {'':7} {'':9} {view_seconds * 1000:9.1f}")
+    del legacy, copied
+
+    # Inference throughput of a forest on float64 and float32 rows
+    target = full["Close"].to_numpy()
+    model = RandomForestRegressor(n_estimators=50, max_depth=12, random_state=0, n_jobs=1)
+    model.fit(compact[FEATURE_COLUMNS].to_numpy(dtype=np.float32)[:20000], target[:20000])
+    X_full = full[FEATURE_COLUMNS].to_numpy()
+    X_compact = compact[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    full_seconds, full_predictions = best_of(lambda: model.predict(X_full))
+    compact_seconds, compact_predictions = best_of(lambda: model.predict(X_compact))
+    report("forest predict", X_full.nbytes, X_compact.nbytes, full_seconds, compact_seconds)
+    print(f"{'':26} predictions identical: {np.array_equal(full_predictions, compact_predictions)}")
+
+
+if __name__ == "__main__":
+    main()
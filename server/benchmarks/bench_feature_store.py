@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils import feature_store
+from utils.indicator_engine import TRAINING_COLUMNS, add_indicators
+from benchmarks.fixtures import make_ohlcv
+
+# One sector dataset: 25 tickers x 25 years
+TICKERS = 25
+ROWS = 25 * 252
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV parsing plus feature computation with feature store reads.")
+    parser.add_argument("--tickers", type=int, default=TICKERS)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    args = parser.parse_args()
+    if feature_store.pa is None:
+        sys.exit("The feature store benchmark requires pyarrow.")
+
+    tickers = [f"T{index:03d}" for index in range(args.tickers)]
+    bars = pd.concat(
+        [make_ohlcv(args.rows, seed=seed).assign(Ticker=ticker) for seed, ticker in enumerate(tickers)],
+        ignore_index=True,
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        csv_path = os.path.join(root, "dataset.csv")
+        bars.to_csv(csv_path, index=False)
+        _, write_seconds = timed(lambda: feature_store.write_features(bars, root=root))
+
+        # What training and evaluation did for every run
+        def from_csv():
+            data = pd.read_csv(csv_path)
+            return add_indicators(data, TRAINING_COLUMNS, fill="mean")
+
+        _, csv_seconds = timed(from_csv)
+        _, sector_seconds = timed(lambda: feature_store.read_features(tickers, root=root))
+        _, ticker_seconds = timed(lambda: feature_store.read_features(tickers[:1], root=root))
+        _, projected_seconds = timed(
+            lambda: feature_store.read_features(tickers[:1], columns=["Close", "RSI", "MACD"], start="2020-01-01", root=root)
+        )
+
+    print(f"{args.tickers} tickers x {args.rows} rows; store written once in {write_seconds:.2f}s")
+    print(f"csv + features         {csv_seconds * 1000:9.1f} ms")
+    print(f"store, whole sector    {sector_seconds * 1000:9.1f} ms")
+    print(f"store, one ticker      {ticker_seconds * 1000:9.1f} ms")
+    print(f"store, projected range {projected_seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.flat_forest import FlatForest
+
+# Same shape as the production models: 100 trees over the 25 input columns
+N_ESTIMATORS = 100
+N_FEATURES = 25
+
+
+def time_per_call(predict, rows, repeat):
+    """
+    Return the median latency of `predict(rows)` in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare RandomForestRegressor.predict with FlatForest.predict.")
+    parser.add_argument("--train-rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(args.train_rows, N_FEATURES))
+    y = X[:, 0] + 0.5 * X[:, 1] ** 2 + rng.normal(scale=0.1, size=args.train_rows)
+    model = RandomForestRegressor(n_estimators=N_ESTIMATORS, random_state=42, n_jobs=-1).fit(X, y)
+    forest = FlatForest.from_estimator(model)
+    print(f"Forest: {forest.n_estimators} trees, {forest.feature.size} nodes, max depth {forest.max_depth}")
+
+    for batch in (1, 25, 200):
+        rows = rng.normal(size=(batch, N_FEATURES))
+        max_diff = np.max(np.abs(forest.predict(rows) - model.predict(rows)))
+        sklearn_ms = time_per_call(model.predict, rows, args.repeat)
+        flat_ms = time_per_call(forest.predict, rows, args.repeat)
+        print(
+            f"rows={batch:<4} sklearn={sklearn_ms:8.3f} ms  flat={flat_ms:8.3f} ms  "
+            f"speedup={sklearn_ms / flat_ms:5.1f}x  max_diff={max_diff:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import (
+    PRICE_COLUMNS, DERIVED_COLUMNS, add_indicators, add_indicators_by_ticker, compute_indicators,
+)
+from benchmarks.fixtures import make_ohlcv, legacy_transform_data
+
+# 25 years of business days for the full three-sector universe
+YEARS = 25
+TICKERS = 75
+ROWS_PER_YEAR = 252
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pandas indicator code with the NumPy indicator engine.")
+    parser.add_argument("--tickers", type=int, default=TICKERS)
+    parser.add_argument("--years", type=int, default=YEARS)
+    parser.add_argument(
+        "--legacy-tickers", type=int, default=3,
+        help="Tickers timed with the pandas implementation (its row loops take seconds per ticker).",
+    )
+    args = parser.parse_args()
+
+    rows = args.years * ROWS_PER_YEAR
+    frames = [make_ohlcv(rows, seed=seed) for seed in range(args.tickers)]
+    print(f"{args.tickers} tickers x {rows} rows")
+
+    start = time.perf_counter()
+    for frame in frames[:args.legacy_tickers]:
+        legacy_transform_data(frame)
+    legacy_per_ticker = (time.perf_counter() - start) / args.legacy_tickers
+
+    start = time.perf_counter()
+    for frame in frames:
+        add_indicators(frame.copy(), DERIVED_COLUMNS, fill="ffill")
+    engine_per_ticker = (time.perf_counter() - start) / args.tickers
+
+    # Every ticker at once, one row per ticker along the leading axis
+    prices = {name: np.stack([frame[name].to_numpy(dtype=float) for frame in frames]) for name in PRICE_COLUMNS}
+    start = time.perf_counter()
+    compute_indicators(prices)
+    batched_total = time.perf_counter() - start
+
+    # The multi-ticker CSV layout: one long frame, grouped on the fly
+    long = pd.concat([frame.assign(Ticker=f"T{seed:03d}") for seed, frame in enumerate(frames)], ignore_index=True)
+    start = time.perf_counter()
+    add_indicators_by_ticker(long, DERIVED_COLUMNS)
+    grouped_total = time.perf_counter() - start
+
+    legacy_total = legacy_per_ticker * args.tickers
+    print(f"pandas    {legacy_per_ticker * 1000:9.1f} ms/ticker  {legacy_total:8.2f} s total (extrapolated)")
+    print(f"engine    {engine_per_ticker * 1000:9.1f} ms/ticker  {engine_per_ticker * args.tickers:8.2f} s total")
+    print(f"batched   {batched_total / args.tickers * 1000:9.1f} ms/ticker  {batched_total:8.2f} s total")
+    print(f"grouped   {grouped_total / args.tickers * 1000:9.1f} ms/ticker  {grouped_total:8.2f} s total (long format)")
+    print(f"speedup   {legacy_per_ticker / engine_per_ticker:5.1f}x per frame, {legacy_total / batched_total:5.1f}x batched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import DERIVED_COLUMNS, add_indicators
+from utils.intraday_features import INTRADAY_CHUNK_ROWS, iter_intraday_features
+from benchmarks.fixtures import SESSION_BARS, make_minute_bars
+
+SESSIONS = [250, 500, 1000, 2000]  # About 0.1 to 0.8 million one-minute bars
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the chunked intraday transform against a single pass.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSIONS)
+    parser.add_argument("--chunk-rows", type=int, default=INTRADAY_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    print(f"{SESSION_BARS} bars per session, chunks of {args.chunk_rows} bars (peak memory excludes the input)")
+    print(f"{'bars':>10} {'single s':>9} {'peak MB':>8} {'chunked s':>10} {'peak MB':>8} {'us/bar':>7}")
+    for sessions in args.sessions:
+        raw = make_minute_bars(sessions)
+        single_seconds, single_peak = measure(lambda: add_indicators(raw.copy(), DERIVED_COLUMNS, fill="ffill"))
+
+        def stream():
+            # Chunks are consumed as they come, as a writer to disk or a socket would
+            for _ in iter_intraday_features(raw, chunk_rows=args.chunk_rows):
+                pass
+
+        chunked_seconds, chunked_peak = measure(stream)
+        print(
+            f"{len(raw):10d} {single_seconds:9.2f} {single_peak / 2 ** 20:8.1f} {chunked_seconds:10.2f}"
+            f" {chunked_peak / 2 ** 20:8.1f} {chunked_seconds / len(raw) * 1e6:7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
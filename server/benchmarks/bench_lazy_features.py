@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from joblib import load
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import (
+    PRICE_COLUMNS, DERIVED_COLUMNS, FEATURE_COLUMNS, add_indicators, columns_for_features, compute_indicators,
+)
+from utils.indicator_state import IndicatorState
+from utils.model_registry import get_model_path
+from utils.sectors import SECTOR_TICKERS
+from benchmarks.fixtures import make_ohlcv
+
+ROWS = 25 * 252
+FORECAST_DAYS = 30
+FORECAST_PATHS = 1000
+REPEATS = 5
+
+# Feature sets timed when no trained model is found
+EXAMPLE_FEATURE_SETS = {
+    "all training inputs": FEATURE_COLUMNS,
+    "trend": PRICE_COLUMNS + ["MA_10", "MA_50", "EMA_10", "EMA_50"],
+    "bands": PRICE_COLUMNS + ["Volatility", "BB_Lower", "BB_Middle", "BB_Upper"],
+    "momentum": PRICE_COLUMNS + ["RSI", "MACD", "MACD_Signal", "Williams %R"],
+}
+
+
+def model_feature_sets():
+    """
+    Feature names of every trained sector model, keyed by model name.
+    """
+    feature_sets = {}
+    for sector in SECTOR_TICKERS:
+        for timeframe in ("historical", "recent"):
+            path = get_model_path(sector, timeframe)
+            if os.path.exists(path):
+                feature_sets[f"rf_{sector}_{timeframe}"] = list(load(path).feature_names_in_)
+    return feature_sets
+
+
+def best_of(function, repeats=REPEATS):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_forecast(history, feature_names, days, paths):
+    def run():
+        state = IndicatorState.from_history(history, feature_names).repeat(paths)
+        close = np.full(paths, history["Close"].iloc[-1])
+        for _ in range(days):
+            close = close + 0.1
+            state.advance(close)
+    return best_of(run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure what computing only a model's feature columns saves.")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--days", type=int, default=FORECAST_DAYS)
+    parser.add_argument("--paths", type=int, default=FORECAST_PATHS)
+    args = parser.parse_args()
+
+    feature_sets = model_feature_sets()
+    if not feature_sets:
+        print("No trained models found; timing example feature sets.")
+        feature_sets = EXAMPLE_FEATURE_SETS
+
+    data = make_ohlcv(args.rows)
+    prices = {name: data[name].to_numpy(dtype=float) for name in PRICE_COLUMNS}
+    history = add_indicators(make_ohlcv(300))
+
+    full_engine = best_of(lambda: compute_indicators(prices, DERIVED_COLUMNS))
+    full_forecast = time_forecast(history, None, args.days, args.paths)
+    print(f"{args.rows} rows, forecast of {args.days} days x {args.paths} paths")
+    print(f"{'model':24} {'columns':>7} {'history ms':>11} {'saved':>6} {'forecast ms':>12} {'saved':>6}")
+    print(f"{'(every column)':24} {len(DERIVED_COLUMNS):7d} {full_engine * 1000:11.1f} {'':>6} {full_forecast * 1000:12.1f}")
+
+    for name, feature_names in feature_sets.items():
+        columns = columns_for_features(feature_names)
+        engine = best_of(lambda: compute_indicators(prices, columns))
+        forecast = time_forecast(history, feature_names, args.days, args.paths)
+        print(
+            f"{name:24} {len(columns):7d} {engine * 1000:11.1f} {1 - engine / full_engine:6.0%}"
+            f" {forecast * 1000:12.1f} {1 - forecast / full_forecast:6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import on_balance_volume, parabolic_sar, njit
+from benchmarks.fixtures import make_ohlcv, legacy_obv, legacy_parabolic_sar
+
+# Roughly a period="max" daily history
+DEFAULT_ROWS = 10000
+
+
+def timed(function, repeat):
+    """
+    Return the result of `function()` and its median run time in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the OBV and Parabolic SAR row loops with the array kernels.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_ohlcv(args.rows)
+    o, h, l, c, v = (data[name].to_numpy(dtype=float) for name in ["Open", "High", "Low", "Close", "Volume"])
+
+    legacy, legacy_ms = timed(lambda: np.asarray(legacy_obv(data), dtype=float), 1)
+    kernel, kernel_ms = timed(lambda: on_balance_volume(c, v), args.repeat)
+    print(f"OBV   loop={legacy_ms:9.2f} ms  kernel={kernel_ms:7.3f} ms  "
+          f"speedup={legacy_ms / kernel_ms:7.1f}x  exact={np.array_equal(legacy, kernel)}")
+
+    backends = ["python"] + (["jit"] if njit is not None else [])
+    legacy, legacy_ms = timed(lambda: legacy_parabolic_sar(data).to_numpy(), 1)
+    for backend in backends:
+        parabolic_sar(o, h, l, c, backend=backend)  # Warm up (JIT compilation)
+        kernel, kernel_ms = timed(lambda: parabolic_sar(o, h, l, c, backend=backend), args.repeat)
+        print(f"PSAR  loop={legacy_ms:9.2f} ms  {backend}={kernel_ms:7.3f} ms  "
+              f"speedup={legacy_ms / kernel_ms:7.1f}x  exact={np.array_equal(legacy, kernel)}")
+
+
+if __name__ == "__main__":
+    main()
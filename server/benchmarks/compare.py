@@ -0,0 +1,80 @@
+import sys
+import json
+import argparse
+
+# Relative change reported as a regression or an improvement
+THRESHOLD = 0.10
+# The fastest run is the least disturbed by other load on the machine
+STATISTIC = "min_s"
+
+
+def load_results(path):
+    """
+    Map (name, fixture, rows, tickers) to the result of a suite.py run.
+    """
+    with open(path) as f:
+        results = json.load(f)
+    return results["environment"], {
+        (result["name"], result["fixture"], result["rows"], result["tickers"]): result
+        for result in results["results"]
+    }
+
+
+def compare(baseline, candidate, threshold=THRESHOLD, statistic=STATISTIC):
+    """
+    Compare the times of benchmarks present in both runs.
+
+    Returns:
+        list: (key, baseline seconds, candidate seconds, ratio, verdict), slowest change first.
+    """
+    rows = []
+    for key in baseline.keys() & candidate.keys():
+        before = baseline[key][statistic]
+        after = candidate[key][statistic]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "slower"
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = ""
+        rows.append((key, before, after, ratio, verdict))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files written by suite.py.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Relative change that counts (0.10 = 10%%).")
+    parser.add_argument("--statistic", choices=["min_s", "median_s"], default=STATISTIC)
+    parser.add_argument("--all", action="store_true", help="Also list benchmarks within the threshold.")
+    args = parser.parse_args()
+
+    baseline_environment, baseline = load_results(args.baseline)
+    candidate_environment, candidate = load_results(args.candidate)
+    print(f"baseline  {baseline_environment.get('commit')}  {baseline_environment.get('created')}")
+    print(f"candidate {candidate_environment.get('commit')}  {candidate_environment.get('created')}")
+    for field in ("python", "numpy", "pandas", "machine", "cpus"):
+        if baseline_environment.get(field) != candidate_environment.get(field):
+            print(f"warning: {field} differs ({baseline_environment.get(field)} vs {candidate_environment.get(field)})")
+
+    rows = compare(baseline, candidate, args.threshold, args.statistic)
+    print(f"{'fixture':9} {'rows':>7} {'tickers':>7}  {'benchmark':40} {'before ms':>11} {'after ms':>11} {'ratio':>6}")
+    for (name, fixture, size, tickers), before, after, ratio, verdict in rows:
+        if verdict or args.all:
+            print(f"{fixture:9} {size:7d} {tickers:7d}  {name:40} {before * 1000:11.2f} {after * 1000:11.2f} {ratio:6.2f} {verdict}")
+
+    for label, missing in (("only in baseline", baseline.keys() - candidate.keys()), ("only in candidate", candidate.keys() - baseline.keys())):
+        if missing:
+            print(f"{len(missing)} benchmarks {label}")
+
+    regressions = sum(1 for row in rows if row[4] == "slower")
+    faster = sum(1 for row in rows if row[4] == "faster")
+    print(f"{len(rows)} compared: {regressions} slower, {faster} faster (threshold {args.threshold:.0%})")
+    # A non-zero exit status lets CI fail on regressions
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
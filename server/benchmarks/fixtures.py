@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+# Synthetic bars and the pandas implementations the indicator engine replaced,
+# shared by the benchmarks and the tests comparing the engine against them
+
+SESSION_BARS = 390  # One-minute bars from 9:30 to 16:00
+
+
+def make_minute_bars(sessions, seed=11):
+    """
+    Build one-minute bars of consecutive sessions with exchange-local timestamps.
+    """
+    rows = sessions * SESSION_BARS
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, rows))
+    close[40:45] = close[40]  # Unchanged closes (OBV steps of 0)
+    days = pd.date_range("2024-03-04 09:30", periods=sessions, freq="B", tz="America/New_York")
+    minutes = pd.to_timedelta(np.tile(np.arange(SESSION_BARS), sessions), unit="min")
+    return pd.DataFrame({
+        "Datetime": days.repeat(SESSION_BARS) + minutes,
+        "Open": close + rng.normal(0, 0.02, rows),
+        "High": close + np.abs(rng.normal(0, 0.04, rows)),
+        "Low": close - np.abs(rng.normal(0, 0.04, rows)),
+        "Close": close,
+        "Volume": rng.integers(0, 50_000, rows),  # Includes bars without trades
+    })
+
+
+def make_ohlcv(rows, seed=11):
+    """
+    Build a raw OHLCV history with flat stretches, integer volumes and a zero-range bar.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, rows))
+    close[40:45] = close[40]  # Unchanged closes (OBV steps of 0, RSI 0/0)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2000-01-03", periods=rows, freq="B"),
+        "Open": close + rng.normal(0, 0.7, rows),
+        "High": close + np.abs(rng.normal(0, 1.2, rows)),
+        "Low": close - np.abs(rng.normal(0, 1.2, rows)),
+        "Close": close,
+        "Volume": rng.integers(100_000, 9_000_000, rows),
+    })
+    data.loc[60:75, ["Open", "High", "Low"]] = close[60]  # 14-bar window with no range
+    data.loc[60:75, "Close"] = close[60]
+    return data
+
+
+def legacy_parabolic_sar(data, step=0.02, max_step=0.2):
+    psar = data["Close"].copy()
+    af = step
+    ep = data["High"].iloc[0] if data["Close"].iloc[0] > data["Open"].iloc[0] else data["Low"].iloc[0]
+    rising = data["Close"].iloc[0] > data["Open"].iloc[0]
+
+    for i in range(1, len(data)):
+        psar.iloc[i] = psar.iloc[i - 1] + af * (ep - psar.iloc[i - 1])
+
+        if rising:
+            if data["Low"].iloc[i] < psar.iloc[i]:
+                rising = False
+                psar.iloc[i] = ep
+                ep = data["Low"].iloc[i]
+                af = step
+            elif data["High"].iloc[i] > ep:
+                ep = data["High"].iloc[i]
+                af = min(af + step, max_step)
+        else:
+            if data["High"].iloc[i] > psar.iloc[i]:
+                rising = True
+                psar.iloc[i] = ep
+                ep = data["High"].iloc[i]
+                af = step
+            elif data["Low"].iloc[i] < ep:
+                ep = data["Low"].iloc[i]
+                af = min(af + step, max_step)
+
+    return psar
+
+
+def legacy_derived_features(data):
+    """
+    The pandas implementation shared by transform_data and calculate_derived_features.
+    """
+    data["VWAP"] = ((data["Close"] + data["High"] + data["Low"]) / 3 * data["Volume"]).cumsum() / data["Volume"].cumsum()
+    data["MA_10"] = data["Close"].rolling(window=10).mean()
+    data["MA_50"] = data["Close"].rolling(window=50).mean()
+    data["EMA_10"] = data["Close"].ewm(span=10, adjust=False).mean()
+    data["EMA_50"] = data["Close"].ewm(span=50, adjust=False).mean()
+    delta = data["Close"].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    data["RSI"] = 100 - (100 / (1 + rs))
+    rolling_mean = data["Close"].rolling(window=20).mean()
+    rolling_std = data["Close"].rolling(window=20).std()
+    data["BB_Lower"] = rolling_mean - (2 * rolling_std)
+    data["BB_Middle"] = rolling_mean
+    data["BB_Upper"] = rolling_mean + (2 * rolling_std)
+    ema_12 = data["Close"].ewm(span=12, adjust=False).mean()
+    ema_26 = data["Close"].ewm(span=26, adjust=False).mean()
+    data["MACD"] = ema_12 - ema_26
+    data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
+    data["MACD_Hist"] = data["MACD"] - data["MACD_Signal"]
+    lowest_low = data["Low"].rolling(window=14).min()
+    highest_high = data["High"].rolling(window=14).max()
+    data["Stochastic"] = 100 * (data["Close"] - lowest_low) / (highest_high - lowest_low)
+    data["Williams %R"] = -100 * (highest_high - data["Close"]) / (highest_high - lowest_low)
+    data["Parabolic_SAR"] = legacy_parabolic_sar(data)
+    data["OBV"] = legacy_obv(data)
+    data["Pivot"] = (data["High"] + data["Low"] + data["Close"]) / 3
+    data["R1"] = (2 * data["Pivot"]) - data["Low"]
+    data["S1"] = (2 * data["Pivot"]) - data["High"]
+    return data
+
+
+def legacy_transform_data(data):
+    """
+    DataFetchResource.transform_data before the indicator engine.
+    """
+    data = legacy_derived_features(data.copy())
+    data["Volatility"] = data["Close"].rolling(window=10).std()
+    data = data.ffill()
+    return data.bfill()
+
+
+def legacy_obv(data):
+    obv = [0]
+    for i in range(1, len(data)):
+        if data["Close"].iloc[i] > data["Close"].iloc[i - 1]:
+            obv.append(obv[-1] + data["Volume"].iloc[i])
+        elif data["Close"].iloc[i] < data["Close"].iloc[i - 1]:
+            obv.append(obv[-1] - data["Volume"].iloc[i])
+        else:
+            obv.append(obv[-1])
+    return obv
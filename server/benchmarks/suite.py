@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import warnings
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Ensure the server root and the training scripts are in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+for path in (server_root, os.path.join(server_root, "ml_components", "RF_multi_output")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from train_rf_multi_output import calculate_derived_features
+from resources.analysis_resource import update_derived_features
+from resources.data_resource import DataFetchResource
+from utils.indicator_engine import PRICE_COLUMNS, DERIVED_COLUMNS, FEATURE_COLUMNS, compute_indicators
+from utils.indicator_state import IndicatorState
+from utils.forecast import prepare_input_row, iter_forecast
+from utils.sectors import SECTOR_TICKERS
+
+# Version of the results file layout read by compare.py
+RESULTS_VERSION = 1
+
+# Fixture sizes: bars per ticker and tickers (1, one sector, the three sectors)
+ROWS = [1_000, 10_000, 100_000]
+TICKERS = [1, 25, 75]
+
+# Runs per benchmark: at least one, at most REPEAT, stopping once TIME_BUDGET seconds are spent
+REPEAT = 5
+TIME_BUDGET = 2.0
+
+# Bars of history seeding the forecast state, and the forest predicting the next close
+FORECAST_HISTORY_ROWS = 300
+FORECAST_TREES = 50
+FORECAST_DEPTH = 12
+
+
+def synthetic_fixture(rows, tickers, seed=0):
+    """
+    Geometric random-walk OHLCV bars with integer volumes, one frame per ticker.
+
+    Returns:
+        dict: Ticker to a frame with Date and OHLCV columns, oldest bar first.
+    """
+    frames = {}
+    dates = pd.date_range("1900-01-01", periods=rows, freq="D")
+    for index in range(tickers):
+        rng = np.random.default_rng(seed + index)
+        # Geometric walk: prices stay positive and never flatten out over 100k bars
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+        frames[f"T{index:03d}"] = pd.DataFrame({
+            "Date": dates,
+            "Open": close * (1 + rng.normal(0, 0.005, rows)),
+            "High": close * (1 + np.abs(rng.normal(0, 0.01, rows))),
+            "Low": close * (1 - np.abs(rng.normal(0, 0.01, rows))),
+            "Close": close,
+            "Volume": rng.integers(100_000, 9_000_000, rows),
+        })
+    return frames
+
+
+def record_fixture(path, tickers=None, period="max"):
+    """
+    Download daily bars from yFinance and save them as a recorded fixture.
+
+    Args:
+        path (str): CSV written in the long format of the top-25 datasets (Ticker, Date, OHLCV).
+        tickers (list): Tickers to record (default: every sector ticker).
+    """
+    import yfinance as yf
+
+    tickers = tickers or [ticker for sector_tickers in SECTOR_TICKERS.values() for ticker in sector_tickers]
+    frames = []
+    for ticker in tickers:
+        bars = yf.Ticker(ticker).history(period=period).reset_index()
+        if bars.empty:
+            print(f"No bars for {ticker}, skipped")
+            continue
+        bars["Date"] = pd.to_datetime(bars["Date"]).dt.tz_localize(None)
+        frames.append(bars[["Date"] + PRICE_COLUMNS].assign(Ticker=ticker))
+    pd.concat(frames, ignore_index=True)[["Ticker", "Date"] + PRICE_COLUMNS].to_csv(path, index=False)
+    print(f"Recorded {len(frames)} tickers to {path}")
+
+
+def recorded_fixture(bars, rows, tickers):
+    """
+    The last `rows` bars of the first `tickers` tickers with that much complete history.
+
+    Returns:
+        dict: Ticker to frame, or None when the recording is too small.
+    """
+    frames = {}
+    for ticker, frame in bars.groupby("Ticker", sort=False):
+        frame = frame.dropna(subset=PRICE_COLUMNS).sort_values("Date")
+        if len(frame) >= rows:
+            frames[ticker] = frame.iloc[-rows:][["Date"] + PRICE_COLUMNS].reset_index(drop=True)
+        if len(frames) == tickers:
+            return frames
+    return None
+
+
+def time_call(function, repeat=REPEAT, budget=TIME_BUDGET):
+    """
+    Run `function` until `repeat` runs or `budget` seconds, whichever comes first.
+
+    Returns:
+        dict: Number of runs and the minimum and median wall time in seconds.
+    """
+    timings = []
+    while len(timings) < repeat and sum(timings) < budget:
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {"runs": len(timings), "min_s": min(timings), "median_s": float(np.median(timings))}
+
+
+def forecast_cases(frames):
+    """
+    Benchmarks of one recursive forecast day for every ticker at once.
+
+    Histories are transformed as for /analysis/predict, and the forest is
+    trained on them, so prediction cost is realistic.
+    """
+    histories = [
+        DataFetchResource.transform_data(frame.iloc[-FORECAST_HISTORY_ROWS:].reset_index(drop=True))
+        for frame in frames.values()
+    ]
+    training = pd.concat(histories, ignore_index=True)
+    model = RandomForestRegressor(
+        n_estimators=FORECAST_TREES, max_depth=FORECAST_DEPTH, random_state=0, n_jobs=1,
+    ).fit(training[FEATURE_COLUMNS].iloc[:-1], training["Close"].shift(-1).iloc[:-1])
+
+    input_rows = np.vstack([prepare_input_row(history, model.feature_names_in_) for history in histories])
+    state = IndicatorState.concat([IndicatorState.from_history(history) for history in histories])
+    advance_state = state.repeat(1)
+    close = input_rows[:, list(model.feature_names_in_).index("Close")]
+
+    # Each next() feeds the previous day back into the state and predicts one more day
+    steps = iter_forecast(model, model, input_rows, state, 10 ** 9, np.random.default_rng(0))
+    return [
+        ("forecast:advance", lambda: advance_state.advance(close)),
+        ("forecast:step", lambda: next(steps)),
+    ]
+
+
+def benchmark_cases(frames):
+    """
+    (name, function) for every indicator, every transform entry point and the forecast step.
+    """
+    # Equal-length fixtures are stacked, one ticker per row, as add_indicators_by_ticker does
+    prices = {name: np.stack([frame[name].to_numpy(dtype=float) for frame in frames.values()]) for name in PRICE_COLUMNS}
+    cases = [(f"indicator:{name}", lambda name=name: compute_indicators(prices, [name])) for name in DERIVED_COLUMNS]
+    cases.append(("indicator:all", lambda: compute_indicators(prices, DERIVED_COLUMNS)))
+
+    def each_frame(transform):
+        return lambda: [transform(frame.copy()) for frame in frames.values()]
+
+    cases += [
+        ("transform:transform_data", each_frame(DataFetchResource.transform_data)),
+        ("transform:calculate_derived_features", each_frame(calculate_derived_features)),
+        ("transform:update_derived_features", each_frame(update_derived_features)),
+    ]
+    return cases + forecast_cases(frames)
+
+
+def environment():
+    """
+    What the results depend on besides the code: commit, interpreter, libraries and host.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=server_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(rows_list, tickers_list, recorded=None, repeat=REPEAT, budget=TIME_BUDGET, pattern=None):
+    """
+    Time every benchmark on every fixture.
+
+    Returns:
+        dict: Results in the layout read by compare.py.
+    """
+    results = []
+    fixtures = ["synthetic"] + (["recorded"] if recorded is not None else [])
+    for fixture in fixtures:
+        for rows in rows_list:
+            for tickers in tickers_list:
+                frames = synthetic_fixture(rows, tickers) if fixture == "synthetic" else recorded_fixture(recorded, rows, tickers)
+                if frames is None:
+                    print(f"{fixture} {rows}x{tickers}: not enough recorded bars, skipped")
+                    continue
+
+                for name, function in benchmark_cases(frames):
+                    if pattern and pattern not in name:
+                        continue
+                    timing = time_call(function, repeat, budget)
+                    results.append({"name": name, "fixture": fixture, "rows": rows, "tickers": tickers, **timing})
+                    print(f"{fixture:9} {rows:7d} x {tickers:2d}  {name:40} {timing['median_s'] * 1000:11.2f} ms")
+    return {"version": RESULTS_VERSION, "environment": environment(), "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time indicators, transforms and the forecast step on OHLCV fixtures.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file, see compare.py.")
+    parser.add_argument("--rows", type=int, nargs="+", default=ROWS)
+    parser.add_argument("--tickers", type=int, nargs="+", default=TICKERS)
+    parser.add_argument("--recorded", help="Recorded fixture CSV (Ticker, Date, OHLCV), timed besides the synthetic one.")
+    parser.add_argument("--record", help="Download the sector tickers into this CSV and exit.")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET, help="Seconds after which a benchmark stops repeating.")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text.")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(args.record)
+        return
+
+    recorded = pd.read_csv(args.recorded, parse_dates=["Date"]) if args.recorded else None
+    with warnings.catch_warnings():
+        # Forecast inputs are arrays, the forest was fitted on named columns
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        results = run_suite(args.rows, args.tickers, recorded, args.repeat, args.budget, args.filter)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"{len(results['results'])} results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,13 @@ class Config:
     # Redis configuration
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+    # Connection pool shared by the request threads and the cache invalidation listener
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+    REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', 5.0))  # Wait for a free connection
+    # Short timeouts so a hung Redis trips the cache circuit breaker quickly
+    REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', 2.0))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv('REDIS_CONNECT_TIMEOUT', 1.0))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
     REDIS_DB = 1  # Always use Redis DB 1
     REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
@@ -95,17 +102,24 @@ app.config.from_object(config_by_name[env])
 
 # Set up Redis
 try:
-    redis_client = redis.StrictRedis(
+    # Blocking pool: bursts wait for a free connection instead of failing at the limit
+    redis_pool = redis.BlockingConnectionPool(
         host=app.config['REDIS_HOST'],
         port=app.config['REDIS_PORT'],
         db=0,
+        max_connections=app.config['REDIS_MAX_CONNECTIONS'],
+        timeout=app.config['REDIS_POOL_TIMEOUT'],
+        socket_timeout=app.config['REDIS_SOCKET_TIMEOUT'],
+        socket_connect_timeout=app.config['REDIS_CONNECT_TIMEOUT'],
+        health_check_interval=app.config['REDIS_HEALTH_CHECK_INTERVAL'],
         decode_responses=False
     )
+    redis_client = redis.StrictRedis(connection_pool=redis_pool)
     redis_client.ping()
     app.logger.info(f"Connected to Redis at {app.config['REDIS_HOST']}:{app.config['REDIS_PORT']} DB 0")
-except redis.ConnectionError as e:
+except (redis.ConnectionError, redis.TimeoutError) as e:
+    # The client is kept: the cache runs on its local tier and reconnects once Redis is back
     app.logger.error(f"Redis connection error: {e}")
-    redis_client = None
 
 # Set up JSON formatting
 app.json.compact = app.config.get('JSON_COMPACT', False)
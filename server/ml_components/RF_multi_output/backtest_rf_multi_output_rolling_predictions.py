@@ -2,8 +2,16 @@ import pandas as pd
 import joblib
 import numpy as np
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from train_rf_multi_output import calculate_derived_features
+from train_rf_multi_output import load_dataset
 import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.batch_scoring import BatchScorer
 
 def clean_data(data, model):
     """
@@ -60,7 +68,7 @@ def add_noise_to_features(data, noise_level=0.01):
             noisy_data[feature] += noise
     return noisy_data
 
-def backtest_batch(model, batch_data, noise_level=0.01):
+def backtest_batch(model, batch_data, noise_level=0.01, scorer=None):
     """
     Process a single batch of data with added noise and return predictions.
 
@@ -68,6 +76,7 @@ def backtest_batch(model, batch_data, noise_level=0.01):
     - model: Trained model to use for predictions.
     - batch_data (pd.DataFrame): Batch of test data.
     - noise_level (float): Percentage of the feature's value to use as noise.
+    - scorer (BatchScorer): Optional parallel scorer sharing `model`.
 
     Returns:
     - np.array: Predictions for the batch.
@@ -82,7 +91,7 @@ def backtest_batch(model, batch_data, noise_level=0.01):
         batch_data_noisy = batch_data_noisy[expected_features]
 
     # Convert batch data to numpy array for prediction
-    predictions = model.predict(batch_data_noisy.values)
+    predictions = (scorer or model).predict(batch_data_noisy.values)
     return predictions
 
 
@@ -104,30 +113,21 @@ def backtest_model(model_path, test_data_path, intervals, batch_size=3000, noise
     model = joblib.load(model_path)
     print(f"Loaded model from {model_path}")
 
-    # Load and clean test dataset
-    test_data = pd.read_csv(test_data_path)
-    test_data = clean_data(test_data, model)  # Clean and align the dataset
-    test_data = calculate_derived_features(test_data)  # Add derived features
+    # Load the test dataset with its derived features, then clean and align it
+    test_data = load_dataset(test_data_path, model.feature_names_in_)
+    test_data = clean_data(test_data, model)
 
     # Match training feature set
     print(f"Test data aligned with model features. Dataset size: {test_data.shape}")
 
+    # The model is shared by every batch; rows come back in order
+    scorer = BatchScorer(model=model, model_path=model_path, batch_size=batch_size)
+
     results = {}
     for interval in intervals:
         print(f"Backtesting for interval: {interval} days...")
-        predictions = []
-
-        # Process data in batches
-        for start_idx in range(0, len(test_data) - interval, batch_size):
-            end_idx = min(start_idx + batch_size, len(test_data) - interval)
-            batch_data = test_data.iloc[start_idx:end_idx]
-
-            # Debug output
-            print(f"Processing batch {start_idx // batch_size + 1} from index {start_idx} to {end_idx}...")
-
-            # Perform predictions on the batch with noise
-            batch_predictions = backtest_batch(model, batch_data, noise_level)
-            predictions.extend(batch_predictions)
+        batch_data = test_data.iloc[:len(test_data) - interval]
+        predictions = backtest_batch(model, batch_data, noise_level, scorer)
 
         # Evaluate predictions
         mse = mean_squared_error(test_data["Close"][interval:], predictions)
@@ -153,10 +153,10 @@ def main():
 
     # Generate combinations of models and datasets
     for sector in sectors:
-        combinations.append((f"{models_dir}/rf_{sector}_historical.joblib", f"{data_dir}/final_enhanced_{sector}_historical.csv"))
-        combinations.append((f"{models_dir}/rf_{sector}_historical.joblib", f"{data_dir}/final_enhanced_{sector}_recent.csv"))
-        combinations.append((f"{models_dir}/rf_{sector}_recent.joblib", f"{data_dir}/final_enhanced_{sector}_recent.csv"))
-        combinations.append((f"{models_dir}/rf_{sector}_recent.joblib", f"{data_dir}/final_enhanced_{sector}_historical.csv"))
+        combinations.append((f"{models_dir}/rf_{sector}_historical.joblib", f"{data_dir}/final_enhanced_top25_{sector}_historical.csv"))
+        combinations.append((f"{models_dir}/rf_{sector}_historical.joblib", f"{data_dir}/final_enhanced_top25_{sector}_recent.csv"))
+        combinations.append((f"{models_dir}/rf_{sector}_recent.joblib", f"{data_dir}/final_enhanced_top25_{sector}_recent.csv"))
+        combinations.append((f"{models_dir}/rf_{sector}_recent.joblib", f"{data_dir}/final_enhanced_top25_{sector}_historical.csv"))
 
     # Backtest all combinations
     all_results = {}
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.feature_store import FEATURE_STORE_DIR, KEY_COLUMNS, write_features, read_features
+from utils.indicator_engine import PRICE_COLUMNS
+from utils.sectors import SECTOR_TICKERS
+
+
+def load_sector_bars(data_dir, sector):
+    """
+    Merge a sector's historical and recent datasets into one long OHLCV frame.
+
+    Bars present in both keep the recent file's values.
+    """
+    frames = []
+    for timeframe in ("historical", "recent"):
+        path = os.path.join(data_dir, f"final_enhanced_top25_{sector}_{timeframe}.csv")
+        if os.path.exists(path):
+            frames.append(pd.read_csv(path, usecols=KEY_COLUMNS + PRICE_COLUMNS, parse_dates=["Date"]))
+    if not frames:
+        raise FileNotFoundError(f"No datasets found for sector: {sector}")
+    bars = pd.concat(frames, ignore_index=True)
+    return bars.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the top-25 features once and write them to the feature store.")
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+    parser.add_argument("--root", default=FEATURE_STORE_DIR)
+    args = parser.parse_args()
+
+    for sector, tickers in SECTOR_TICKERS.items():
+        start = time.perf_counter()
+        try:
+            bars = load_sector_bars(args.data_dir, sector)
+        except FileNotFoundError as e:
+            print(f"Skipped {sector}: {e}")
+            continue
+        bars = bars[bars["Ticker"].isin(tickers)]
+        version = write_features(bars, root=args.root)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stored = read_features(tickers, root=args.root)
+        print(
+            f"{sector}: wrote {len(bars)} rows as version {version} in {elapsed:.2f}s; "
+            f"read back {len(stored)} rows in {time.perf_counter() - start:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
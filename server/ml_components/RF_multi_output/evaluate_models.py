@@ -1,8 +1,15 @@
-import pandas as pd
 import joblib
 import os
+import sys
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from train_rf_multi_output import clean_data, calculate_derived_features
+from train_rf_multi_output import load_dataset
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.batch_scoring import BatchScorer
 
 def evaluate_model(model_path, test_data_path):
     """
@@ -21,20 +28,16 @@ def evaluate_model(model_path, test_data_path):
     model = joblib.load(model_path)
     print(f"Loaded model from {model_path}.")
 
-    # Load the test dataset
-    test_data = pd.read_csv(test_data_path)
+    # Load the test dataset with its derived features
+    test_data = load_dataset(test_data_path, model.feature_names_in_)
     print(f"Loaded test data from {test_data_path}. Dataset size: {test_data.shape}")
 
-    # Clean and prepare the test data
-    test_data = clean_data(test_data)  # Handle missing or invalid values
-    test_data = calculate_derived_features(test_data)  # Add derived features
-
     # Extract input features (X) and true values (y)
     X_test = test_data[model.feature_names_in_]  # Ensure feature alignment
     y_true = test_data["Close"]  # Target variable
 
-    # Predict using the model
-    predictions = model.predict(X_test)
+    # Predict using the model, scoring batches in parallel
+    predictions = BatchScorer(model=model, model_path=model_path).predict(X_test.values)
 
     # Evaluate predictions
     mse = mean_squared_error(y_true, predictions)
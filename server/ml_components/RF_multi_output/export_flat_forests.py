@@ -0,0 +1,41 @@
+import os
+import sys
+import glob
+import time
+import numpy as np
+from joblib import load
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.flat_forest import export_flat_forest
+from utils.model_registry import MODEL_DIRECTORY, get_flat_forest_path
+
+
+def export_directory(model_dir):
+    """
+    Export a flattened forest next to every `rf_*.joblib` artifact in a directory.
+
+    Each export is checked against `model.predict` on random rows before it is kept.
+    """
+    for model_path in sorted(glob.glob(os.path.join(model_dir, "rf_*.joblib"))):
+        model = load(model_path)
+        flat_path = get_flat_forest_path(model_path)
+
+        start = time.perf_counter()
+        forest = export_flat_forest(model, flat_path)
+        elapsed = time.perf_counter() - start
+
+        rows = np.random.default_rng(0).normal(size=(32, model.n_features_in_))
+        max_diff = np.max(np.abs(forest.predict(rows) - model.predict(rows)))
+        if max_diff > 1e-9:
+            os.remove(flat_path)
+            print(f"Skipped {model_path}: parity check failed (max diff {max_diff})")
+            continue
+        print(f"Exported {flat_path} ({forest.feature.size} nodes) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    export_directory(sys.argv[1] if len(sys.argv) > 1 else MODEL_DIRECTORY)
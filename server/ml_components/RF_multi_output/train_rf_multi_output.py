@@ -1,10 +1,27 @@
 import pandas as pd
 import numpy as np
 import os
+import re
+import sys
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error
 from joblib import dump
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.flat_forest import export_flat_forest
+from utils.indicator_engine import (
+    add_indicators, parabolic_sar, columns_for_features, PRICE_COLUMNS, DERIVED_COLUMNS, FEATURE_COLUMNS, TRAINING_COLUMNS,
+)
+from utils.feature_store import KEY_COLUMNS, compute_features, has_version, normalize_keys, read_features
+from utils.compact_features import compact_frame
+
+# Sector and timeframe encoded in the dataset file names
+DATASET_PATTERN = re.compile(r"final_enhanced_top25_(\w+?)_(historical|recent)\.csv$")
+
 # Define function to clean data
 def clean_data(data):
     """
@@ -23,9 +40,12 @@ def clean_data(data):
     return data
 
 # Define function to calculate derived features
-def calculate_derived_features(data):
+def calculate_derived_features(data, columns=TRAINING_COLUMNS):
     """
     Adds derived technical indicators to the dataset.
+
+    Args:
+    - columns (list): Derived columns to compute (default: every training column).
     """
     # Ensure required columns are available
     required_columns = ["Open", "High", "Low", "Close", "Volume"]
@@ -33,90 +53,71 @@ def calculate_derived_features(data):
         if col not in data.columns:
             raise ValueError(f"Missing required column: {col}")
 
-    # Add derived features
-    data["VWAP"] = ((data["Close"] + data["High"] + data["Low"]) / 3 * data["Volume"]).cumsum() / data["Volume"].cumsum()
-    data["MA_10"] = data["Close"].rolling(window=10).mean()
-    data["MA_50"] = data["Close"].rolling(window=50).mean()
-    data["EMA_10"] = data["Close"].ewm(span=10, adjust=False).mean()
-    data["EMA_50"] = data["Close"].ewm(span=50, adjust=False).mean()
-    delta = data["Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    data["RSI"] = 100 - (100 / (1 + rs))
-    rolling_mean = data["Close"].rolling(window=20).mean()
-    rolling_std = data["Close"].rolling(window=20).std()
-    data["BB_Lower"] = rolling_mean - (2 * rolling_std)
-    data["BB_Middle"] = rolling_mean
-    data["BB_Upper"] = rolling_mean + (2 * rolling_std)
-    ema_12 = data["Close"].ewm(span=12, adjust=False).mean()
-    ema_26 = data["Close"].ewm(span=26, adjust=False).mean()
-    data["MACD"] = ema_12 - ema_26
-    data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
-    data["MACD_Hist"] = data["MACD"] - data["MACD_Signal"]
-    lowest_low = data["Low"].rolling(window=14).min()
-    highest_high = data["High"].rolling(window=14).max()
-    data["Stochastic"] = 100 * (data["Close"] - lowest_low) / (highest_high - lowest_low)
-    data["Williams %R"] = -100 * (highest_high - data["Close"]) / (highest_high - lowest_low)
-    data["Parabolic_SAR"] = calculate_parabolic_sar(data)
-    obv = [0]
-    for i in range(1, len(data)):
-        if data["Close"].iloc[i] > data["Close"].iloc[i - 1]:
-            obv.append(obv[-1] + data["Volume"].iloc[i])
-        elif data["Close"].iloc[i] < data["Close"].iloc[i - 1]:
-            obv.append(obv[-1] - data["Volume"].iloc[i])
-        else:
-            obv.append(obv[-1])
-    data["OBV"] = obv
-    data["Pivot"] = (data["High"] + data["Low"] + data["Close"]) / 3
-    data["R1"] = (2 * data["Pivot"]) - data["Low"]
-    data["S1"] = (2 * data["Pivot"]) - data["High"]
-    
-     # Ensure no NaN values remain after calculations
-    data.fillna(data.mean(), inplace=True)  # Fill remaining NaNs with column means
-    return data
+    # Add derived features; remaining NaNs are filled with column means
+    return add_indicators(data, columns, fill="mean")
 
 def calculate_parabolic_sar(data, step=0.02, max_step=0.2):
     """
     Helper function to calculate Parabolic SAR.
     """
-    psar = data["Close"].copy()
-    af = step
-    ep = data["High"].iloc[0] if data["Close"].iloc[0] > data["Open"].iloc[0] else data["Low"].iloc[0]
-    rising = data["Close"].iloc[0] > data["Open"].iloc[0]
-
-    for i in range(1, len(data)):
-        psar.iloc[i] = psar.iloc[i - 1] + af * (ep - psar.iloc[i - 1])
-
-        if rising:
-            if data["Low"].iloc[i] < psar.iloc[i]:
-                rising = False
-                psar.iloc[i] = ep
-                ep = data["Low"].iloc[i]
-                af = step
-            elif data["High"].iloc[i] > ep:
-                ep = data["High"].iloc[i]
-                af = min(af + step, max_step)
-        else:
-            if data["High"].iloc[i] > psar.iloc[i]:
-                rising = True
-                psar.iloc[i] = ep
-                ep = data["High"].iloc[i]
-                af = step
-            elif data["Low"].iloc[i] < ep:
-                ep = data["Low"].iloc[i]
-                af = min(af + step, max_step)
-
-    return psar
+    psar = parabolic_sar(
+        data["Open"].to_numpy(dtype=float), data["High"].to_numpy(dtype=float),
+        data["Low"].to_numpy(dtype=float), data["Close"].to_numpy(dtype=float), step, max_step,
+    )
+    return pd.Series(psar, index=data.index, name="Close")
+
+def load_dataset(data_path, feature_names=None):
+    """
+    Load a top-25 dataset with its derived features.
+
+    When the feature store holds the current feature version, the sector's
+    precomputed features are read from it instead of parsing the CSV and
+    recomputing every indicator. The store must hold every (Ticker, Date) row
+    of the dataset; otherwise, as without a store, the CSV's OHLCV bars go
+    through the same per-ticker computation and fill. Both paths return the
+    dataset's rows; stored indicators of a recent dataset are warmed up on
+    the full history instead of its first rows.
+
+    Args:
+    - data_path (str): Path to a final_enhanced_top25_<sector>_<timeframe>.csv dataset.
+    - feature_names (list): Inputs of the model the data is for (e.g. `feature_names_in_`).
+      Only those features and the Close target are read or computed.
+
+    Returns:
+    - pd.DataFrame: Numeric dataset with derived features.
+    """
+    columns = None
+    if feature_names is not None:
+        wanted = set(feature_names) | {"Close"}
+        columns = [name for name in FEATURE_COLUMNS if name in wanted]
+
+    if DATASET_PATTERN.search(os.path.basename(data_path)) and has_version():
+        # The store is read for exactly the dataset's rows, and only if it holds all of them
+        keys = normalize_keys(pd.read_csv(data_path, usecols=KEY_COLUMNS)).drop_duplicates()
+        keys = keys.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
+        stored = read_features(keys["Ticker"].unique(), columns=columns, start=keys["Date"].min(), end=keys["Date"].max())
+        stored = keys.merge(stored, on=KEY_COLUMNS, how="inner")
+        if len(stored) == len(keys):
+            print(f"Reading the features of {os.path.basename(data_path)} from the feature store...")
+            return stored.drop(columns=KEY_COLUMNS)
+        print(f"The feature store holds {len(stored)} of {len(keys)} rows of {os.path.basename(data_path)}; computing them...")
+
+    # Indicators are computed and filled per ticker exactly as the store does
+    data = pd.read_csv(data_path, usecols=KEY_COLUMNS + PRICE_COLUMNS)
+    data[PRICE_COLUMNS] = data[PRICE_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    derived_columns = DERIVED_COLUMNS
+    if feature_names is not None:
+        model_columns = set(columns_for_features(feature_names))
+        derived_columns = [name for name in DERIVED_COLUMNS if name in model_columns]
+    return compute_features(data, derived_columns).drop(columns=KEY_COLUMNS)
 
 # Define function to train the model
 def train_rf_model(data_path, output_dir, target_columns, input_columns, model_name):
     print(f"Loading dataset from {data_path}...")
-    data = pd.read_csv(data_path)
-    data = clean_data(data)  # Initial cleaning
-    data = calculate_derived_features(data)
+    data = load_dataset(data_path)
     data = clean_data(data)  # Final cleaning after derived features
-    X = data[input_columns]
+    # Forests train on float32 inputs; converting once here avoids a float64 copy inside fit
+    X = compact_frame(data[input_columns])
     y = data[target_columns].values.ravel()
     print(f"Dataset size: {data.shape}")
     model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
@@ -124,6 +125,8 @@ def train_rf_model(data_path, output_dir, target_columns, input_columns, model_n
     mse = mean_squared_error(y, model.predict(X))
     print(f"Model: {model_name} | MSE: {mse}")
     dump(model, os.path.join(output_dir, f"{model_name}.joblib"))
+    # Flattened node arrays used by the API for fast single-row inference
+    export_flat_forest(model, os.path.join(output_dir, f"{model_name}_flat.npz"))
 
 # Main function
 def main():
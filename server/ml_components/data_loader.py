@@ -6,6 +6,14 @@ import torch
 from torch.utils.data import Dataset, DataLoader, TensorDataset
 from sklearn.preprocessing import StandardScaler
 import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE, sliding_windows
 
 # Define the data directory path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -47,15 +55,16 @@ def create_dataloader(sector, timeframe, batch_size=32, sequence_length=60):
         raise ValueError(f"Missing required columns: {feature_columns}")
 
     scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(df[feature_columns].values)
+    scaled_data = scaler.fit_transform(df[feature_columns].values).astype(COMPACT_DTYPE)
 
     # Create sequences and labels
-    sequences = np.array([scaled_data[i:i + sequence_length] for i in range(len(scaled_data) - sequence_length)])
+    n_sequences = max(len(scaled_data) - sequence_length, 0)
+    sequences = sliding_windows(scaled_data, sequence_length)[:n_sequences]
     labels = scaled_data[sequence_length:, 3]  # Use 'Close' as the target
 
-    # Convert to tensors
-    sequences = torch.tensor(sequences, dtype=torch.float32)
-    labels = torch.tensor(labels, dtype=torch.float32)
+    # Convert to tensors, copying each float32 window once
+    sequences = torch.from_numpy(np.ascontiguousarray(sequences))
+    labels = torch.from_numpy(np.ascontiguousarray(labels))
 
     # Create DataLoader
     dataset = TensorDataset(sequences, labels)
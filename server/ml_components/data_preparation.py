@@ -3,8 +3,16 @@
 import pandas as pd
 import yfinance as yf
 import os
+import sys
 from datetime import datetime
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import add_indicators
+
 # Define sectors and stocks to fetch
 SECTORS = {
     "tech": ["AAPL", "MSFT", "GOOGL", "AMZN", "FB"],
@@ -35,9 +43,7 @@ def prepare_and_save_data(sector, data, timeframe):
     combined_data = pd.concat(data.values())
 
     # Add any additional preprocessing steps, such as feature engineering
-    combined_data['MA_10'] = combined_data['Close'].rolling(window=10).mean()
-    combined_data['MA_50'] = combined_data['Close'].rolling(window=50).mean()
-    combined_data['Volatility'] = combined_data['Close'].rolling(window=10).std()
+    add_indicators(combined_data, ["MA_10", "MA_50", "Volatility"], fill=None)
 
     # Drop NaN rows that may have been created by rolling calculations
     combined_data.dropna(inplace=True)
@@ -1,5 +1,14 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import compute_indicators
 
 def transform_data(api_data):
     # Create DataFrame from the raw API data
@@ -17,9 +26,10 @@ def transform_data(api_data):
     print("Initial DataFrame length:", len(df))
 
     # Calculate moving averages and volatility to match training features
-    df['MA_10'] = df['close'].rolling(window=10).mean()
-    df['MA_50'] = df['close'].rolling(window=50).mean()
-    df['volatility'] = df['close'].rolling(window=10).std()
+    indicators = compute_indicators({"Close": df['close'].to_numpy(dtype=float)}, ["MA_10", "MA_50", "Volatility"])
+    df['MA_10'] = indicators["MA_10"]
+    df['MA_50'] = indicators["MA_50"]
+    df['volatility'] = indicators["Volatility"]
 
     # Drop rows with NaN values from rolling calculations
     df = df.dropna().reset_index(drop=True)
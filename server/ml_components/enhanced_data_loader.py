@@ -1,7 +1,20 @@
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
 import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import add_indicators_by_ticker, PANDAS_TA_INDICATORS
+
+# Indicators added on top of the loaded columns, as pandas_ta defined them
+ENHANCED_COLUMNS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist', 'Stochastic', 'Williams %R', 'BB_Lower', 'BB_Middle',
+    'BB_Upper', 'EMA_10', 'EMA_50', 'Parabolic_SAR', 'OBV', 'VWAP', 'Pivot', 'R1', 'S1'
+]
 
 class DataEnhancer:
     def __init__(self, data_dir):
@@ -30,28 +43,8 @@ class DataEnhancer:
         return df
 
     def add_indicators(self, df):
-        # Technical indicators
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-        df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = macd['MACD_12_26_9'], macd['MACDs_12_26_9'], macd['MACDh_12_26_9']
-        df['Stochastic'] = ta.stoch(df['High'], df['Low'], df['Close'])['STOCHk_14_3_3']
-        
-        lookback = 14
-        df['Williams %R'] = ((df['High'].rolling(window=lookback).max() - df['Close']) /
-                            (df['High'].rolling(window=lookback).max() - df['Low'].rolling(window=lookback.min()))) * -100
-        
-        bbands = ta.bbands(df['Close'], length=20, std=2)
-        df['BB_Lower'], df['BB_Middle'], df['BB_Upper'] = bbands['BBL_20_2.0'], bbands['BBM_20_2.0'], bbands['BBU_20_2.0']
-        
-        df['EMA_10'], df['EMA_50'] = ta.ema(df['Close'], length=10), ta.ema(df['Close'], length=50)
-        df['Parabolic_SAR'] = ta.psar(df['High'], df['Low'], df['Close'], af=0.02, max_af=0.2)['PSARl_0.02_0.2']
-        df['OBV'] = ta.obv(df['Close'], df['Volume'])
-        df['VWAP'] = ta.vwap(df['High'], df['Low'], df['Close'], df['Volume'], anchor="D")
-
-        # Calculate Pivot Points, R1, and S1
-        df['Pivot'] = (df['High'] + df['Low'] + df['Close']) / 3
-        df['R1'] = 2 * df['Pivot'] - df['Low']
-        df['S1'] = 2 * df['Pivot'] - df['High']
+        # Technical indicators per ticker; MA_10, MA_50 and Volatility come with the input data
+        add_indicators_by_ticker(df, ENHANCED_COLUMNS, registry=PANDAS_TA_INDICATORS)
 
         return df[self.columns]
 
@@ -1,9 +1,17 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE
+
 def prepare_new_data(data_file, output_file):
     """
     Processes historical Top 25 data for model input.
@@ -30,7 +38,7 @@ def prepare_new_data(data_file, output_file):
     feature_data = scaler.fit_transform(feature_data)
 
     # Save processed data
-    np.save(output_file, feature_data)
+    np.save(output_file, feature_data.astype(COMPACT_DTYPE))
     print(f"Processed data saved to {output_file}")
 
 if __name__ == "__main__":
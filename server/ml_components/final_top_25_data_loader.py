@@ -1,7 +1,20 @@
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
 import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import add_indicators_by_ticker, PANDAS_TA_INDICATORS
+
+# Indicators added on top of the loaded columns, as pandas_ta defined them
+ENHANCED_COLUMNS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist', 'Stochastic', 'Williams %R', 'BB_Lower', 'BB_Middle',
+    'BB_Upper', 'EMA_10', 'EMA_50', 'Parabolic_SAR', 'OBV', 'VWAP', 'Pivot', 'R1', 'S1'
+]
 
 class Top25DataEnhancer:
     def __init__(self, data_dir):
@@ -30,41 +43,8 @@ class Top25DataEnhancer:
         # Ensure Date is a regular column, not an index
         df = df.reset_index(drop=True)
 
-        # Technical indicators
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        
-        macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-        df['MACD'] = macd['MACD_12_26_9']
-        df['MACD_Signal'] = macd['MACDs_12_26_9']
-        df['MACD_Hist'] = macd['MACDh_12_26_9']
-        
-        df['Stochastic'] = ta.stoch(df['High'], df['Low'], df['Close'])['STOCHk_14_3_3']
-        
-        lookback = 14
-        # Calculate rolling max and min for Williams %R
-        rolling_high = df['High'].rolling(window=lookback).max()
-        rolling_low = df['Low'].rolling(window=lookback).min()
-        df['Williams %R'] = ((rolling_high - df['Close']) / (rolling_high - rolling_low)) * -100
-        
-        bbands = ta.bbands(df['Close'], length=20, std=2)
-        df['BB_Lower'] = bbands['BBL_20_2.0']
-        df['BB_Middle'] = bbands['BBM_20_2.0']
-        df['BB_Upper'] = bbands['BBU_20_2.0']
-        
-        df['EMA_10'] = ta.ema(df['Close'], length=10)
-        df['EMA_50'] = ta.ema(df['Close'], length=50)
-        df['Parabolic_SAR'] = ta.psar(df['High'], df['Low'], df['Close'], af=0.02, max_af=0.2)['PSARl_0.02_0.2']
-        df['OBV'] = ta.obv(df['Close'], df['Volume'])
-        
-        # Set Date as the index for VWAP calculation, ensuring it is in datetime format
-        df.set_index('Date', inplace=True)
-        df['VWAP'] = ta.vwap(df['High'], df['Low'], df['Close'], df['Volume'])
-        df.reset_index(inplace=True)  # Reset index back to default after VWAP calculation
-
-        # Calculate Pivot Points, R1, and S1
-        df['Pivot'] = (df['High'] + df['Low'] + df['Close']) / 3
-        df['R1'] = 2 * df['Pivot'] - df['Low']
-        df['S1'] = 2 * df['Pivot'] - df['High']
+        # Technical indicators per ticker; MA_10, MA_50 and Volatility come with the input data
+        add_indicators_by_ticker(df, ENHANCED_COLUMNS, registry=PANDAS_TA_INDICATORS)
 
         return df[self.columns]
 
@@ -1,5 +1,13 @@
 import numpy as np
 import os
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE
 
 def dynamic_formatter(lstm_preds, rf_preds, lstm_targets, rf_targets):
     """
@@ -33,7 +41,7 @@ def dynamic_formatter(lstm_preds, rf_preds, lstm_targets, rf_targets):
         rf_targets = rf_targets[:rf_preds.shape[0]]
 
     # Combine LSTM and RF predictions for meta-model input
-    X_meta = np.hstack((lstm_preds, rf_preds))
+    X_meta = np.hstack((lstm_preds, rf_preds)).astype(COMPACT_DTYPE, copy=False)
     print(f"Formatted Meta-Model Input Shape: {X_meta.shape}")
 
     return X_meta, {"LSTM": lstm_targets, "RandomForest": rf_targets}
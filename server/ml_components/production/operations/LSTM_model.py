@@ -1,4 +1,5 @@
 import os
+import sys
 import numpy as np
 import pandas as pd
 import tensorflow as tf
@@ -9,6 +10,13 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error
 from sklearn.model_selection import train_test_split
 import argparse
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE, sliding_windows
+
 class LSTMModel:
     def __init__(self, sequence_length=200):
         self.sequence_length = sequence_length
@@ -26,16 +34,13 @@ class LSTMModel:
         df.fillna(df.mean(), inplace=True)
 
         # Create sequences for LSTM (use sliding window technique)
-        features = df.drop(columns=['Close']).values  # Exclude 'Close' from input features
-        target = df['Close'].values  # 'Close' is the target variable
-
-        X, y = [], []
-        for i in range(len(features) - self.sequence_length):
-            X.append(features[i:i + self.sequence_length])
-            y.append(target[i + self.sequence_length])
+        features = df.drop(columns=['Close']).to_numpy(dtype=COMPACT_DTYPE)  # Exclude 'Close' from input features
+        target = df['Close'].to_numpy(dtype=COMPACT_DTYPE)  # 'Close' is the target variable
 
-        X = np.array(X)
-        y = np.array(y)
+        # Windows are views of the feature rows; each is followed by the Close it predicts
+        n_sequences = max(len(features) - self.sequence_length, 0)
+        X = sliding_windows(features, self.sequence_length)[:n_sequences]
+        y = target[self.sequence_length:]
 
         print(f"Generated {len(X)} sequences for LSTM model.")
         return train_test_split(X, y, test_size=0.2, random_state=42)
@@ -1,10 +1,18 @@
 import os
+import sys
 import numpy as np
 import pandas as pd
 from sklearn.metrics import mean_squared_error, r2_score
 from tensorflow.keras.models import load_model
 from joblib import load
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE, sliding_windows
+
 # Paths
 BASE_DIR = "/Users/luisjorge/code/Flatiron-Phase-5/MarketAI/server/ml_components"
 MODELS_DIR = os.path.join(BASE_DIR, "models")
@@ -72,16 +80,15 @@ def preprocess_data(ticker_data, expected_features, exclude_columns=["Ticker", "
     ticker_data = ticker_data.drop(columns=exclude_columns, errors="ignore")
     ticker_data = ticker_data[expected_features]
     ticker_data.fillna(ticker_data.mean(), inplace=True)
-    return ticker_data.to_numpy()
+    return ticker_data.to_numpy(dtype=COMPACT_DTYPE)
 
 def create_lstm_input(data, sequence_length):
     """
     Reshape data into a format compatible with LSTM models.
+
+    Windows are read-only views of `data` rather than copies.
     """
-    sequences = []
-    for i in range(len(data) - sequence_length + 1):
-        sequences.append(data[i:i + sequence_length])
-    return np.array(sequences)
+    return sliding_windows(data, sequence_length)
 
 def evaluate_predictions(ticker, targets, predictions, model_name):
     """
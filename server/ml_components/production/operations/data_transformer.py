@@ -1,7 +1,14 @@
 import pandas as pd
 import numpy as np
 import os
-import pandas_ta as ta  # Pandas Technical Analysis library
+import sys
+
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import add_indicators, add_indicators_by_ticker, DERIVED_COLUMNS, PANDAS_TA_INDICATORS
 
 class DataTransformer:
     def __init__(self, input_dir, output_dir):
@@ -16,54 +23,11 @@ class DataTransformer:
         """
         Calculate all required technical indicators and add them as new columns.
         """
-        # Calculate Moving Averages
-        df['MA_10'] = df['Close'].rolling(window=10).mean()
-        df['MA_50'] = df['Close'].rolling(window=50).mean()
-        
-        # Volatility (Standard Deviation over a rolling window)
-        df['Volatility'] = df['Close'].rolling(window=10).std()
-        
-        # Relative Strength Index (RSI)
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        
-        # MACD and its components
-        macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-        df['MACD'] = macd['MACD_12_26_9']
-        df['MACD_Signal'] = macd['MACDs_12_26_9']
-        df['MACD_Hist'] = macd['MACDh_12_26_9']
-        
-        # Stochastic Oscillator
-        stoch = ta.stoch(df['High'], df['Low'], df['Close'])
-        df['Stochastic'] = stoch['STOCHk_14_3_3']
-        
-        # Williams %R
-        df['Williams %R'] = ta.willr(df['High'], df['Low'], df['Close'], length=14)
-        
-        # Bollinger Bands
-        bb = ta.bbands(df['Close'], length=20, std=2)
-        df['BB_Lower'] = bb['BBL_20_2.0']
-        df['BB_Middle'] = bb['BBM_20_2.0']
-        df['BB_Upper'] = bb['BBU_20_2.0']
-        
-        # Exponential Moving Averages
-        df['EMA_10'] = ta.ema(df['Close'], length=10)
-        df['EMA_50'] = ta.ema(df['Close'], length=50)
-        
-        # Parabolic SAR
-        df['Parabolic_SAR'] = ta.psar(df['High'], df['Low'], df['Close'])['PSARl_0.02_0.2']
-        
-        # On-Balance Volume (OBV)
-        df['OBV'] = ta.obv(df['Close'], df['Volume'])
-        
-        # Volume-Weighted Average Price (VWAP)
-        df['VWAP'] = ta.vwap(df['High'], df['Low'], df['Close'], df['Volume'])
-        
-        # Pivot Points, Resistance, and Support
-        df['Pivot'] = (df['High'] + df['Low'] + df['Close']) / 3
-        df['R1'] = (2 * df['Pivot']) - df['Low']
-        df['S1'] = (2 * df['Pivot']) - df['High']
-        
-        return df
+        # pandas_ta definitions, which the LSTM models were trained on.
+        # NaNs from the rolling warm-up are dropped by transform_data
+        if 'Ticker' in df.columns:
+            return add_indicators_by_ticker(df, DERIVED_COLUMNS, registry=PANDAS_TA_INDICATORS)
+        return add_indicators(df, DERIVED_COLUMNS, fill=None, registry=PANDAS_TA_INDICATORS)
 
     def transform_data(self, df):
         # Ensure all technical indicators are calculated
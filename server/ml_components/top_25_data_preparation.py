@@ -1,12 +1,22 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 from tensorflow.keras.preprocessing.sequence import pad_sequences  # Import pad_sequences
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.compact_features import COMPACT_DTYPE
+
 class DataPreparer:
-    def __init__(self, input_dir, output_dir):
+    def __init__(self, input_dir, output_dir, dtype=COMPACT_DTYPE):
         self.input_dir = input_dir
         self.output_dir = output_dir
+        # Storage type of the prepared arrays (float32 halves their size)
+        self.dtype = dtype
 
     def load_data(self, file_name):
         df = pd.read_csv(os.path.join(self.input_dir, file_name), parse_dates=['Date'])
@@ -17,7 +27,7 @@ class DataPreparer:
 
     def prepare_data_for_random_forest(self, df):
         # Random Forest preparation (no padding needed)
-        return df.drop(columns=['Date', 'Ticker']).values
+        return df.drop(columns=['Date', 'Ticker']).to_numpy(dtype=self.dtype)
 
     def prepare_data_for_lstm(self, df):
         # Normalize the columns and retain all technical indicators
@@ -38,13 +48,13 @@ class DataPreparer:
         
         for ticker in tickers:
             ticker_data = df[df['Ticker'] == ticker].sort_values(by='Date')
-            ticker_data = ticker_data[columns_to_normalize].values
+            ticker_data = ticker_data[columns_to_normalize].to_numpy(dtype=self.dtype)
             prepared_data.append(ticker_data)
 
         # Pad sequences so that all sequences are of the same length
-        padded_data = pad_sequences(prepared_data, maxlen=max_sequence_length, padding='post', dtype='float32')
+        padded_data = pad_sequences(prepared_data, maxlen=max_sequence_length, padding='post', dtype=np.dtype(self.dtype).name)
         
-        return np.array(padded_data)
+        return np.asarray(padded_data)
 
     def process_file(self, file_name):
         df = self.load_data(file_name)
@@ -1,8 +1,16 @@
+import os
+import sys
 import yfinance as yf
 import pandas as pd
-import pandas_ta as ta
 from datetime import datetime, timedelta
 
+# Ensure the server root is in PYTHONPATH
+server_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if server_root not in sys.path:
+    sys.path.append(server_root)
+
+from utils.indicator_engine import add_indicators_by_ticker
+
 # Define top 25 stocks for each sector
 finance_tickers = ['JPM', 'BAC', 'WFC', 'C', 'MS', 'GS', 'HSBC', 'USB', 'TD', 'RY', 'AXP', 'SCHW', 'BMO', 'PNC', 'BNS', 'MUFG', 'SPGI', 'MCO', 'BLK', 'ICE', 'COF', 'CME', 'CB', 'CINF', 'MET']
 health_tickers = ['UNH', 'JNJ', 'PFE', 'MRK', 'ABBV', 'TMO', 'LLY', 'MDT', 'DHR', 'BMY', 'AMGN', 'GILD', 'CVS', 'CI', 'ABT', 'SYK', 'REGN', 'BAX', 'BSX', 'ZBH', 'EW', 'ILMN', 'HCA', 'HUM', 'IQV']
@@ -15,10 +23,7 @@ end_date = datetime.today().strftime('%Y-%m-%d')
 
 # Define function to calculate indicators
 def calculate_indicators(df):
-    df['MA_10'] = df['Close'].rolling(window=10).mean()
-    df['MA_50'] = df['Close'].rolling(window=50).mean()
-    df['Volatility'] = df['Close'].rolling(window=10).std()
-    return df
+    return add_indicators_by_ticker(df, ['MA_10', 'MA_50', 'Volatility'])
 
 # Fetch data and save for each sector
 def fetch_and_save_data(tickers, historical_file, recent_file):
@@ -1,30 +1,36 @@
-from flask import request, jsonify
+from flask import request, jsonify, Response
 from flask_restful import Resource
 import pandas as pd
 import numpy as np
-from joblib import load
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import os
-from concurrent.futures import ThreadPoolExecutor
-from utils.redis_helper import get_from_cache, set_to_cache
+from utils.redis_helper import get_from_cache, get_many, set_to_cache
+from utils.model_registry import model_registry, get_model_path
+from utils.indicator_state import IndicatorState
+from utils.indicator_engine import add_indicators, columns_for_features, FORECAST_COLUMNS
+from utils.sectors import SECTOR_TICKERS
+from utils.forecast import prepare_input_row, iter_forecast, forecast_bands
+from utils.forecast_cache import (
+    MAX_SEED, last_bar_date, models_version, default_seed, forecast_cache_key,
+    get_cached_forecast, store_forecast,
+)
+from utils.forecast_table import read_forecast_row, is_current
+from utils.single_flight import SingleFlight
+from utils.batch_scoring import score_in_batches, DEFAULT_BATCH_SIZE
 from datetime import datetime
 import json
-from resources.data_resource import DataFetchResource
+from resources.data_resource import DataFetchResource, cached_records
 import logging
 
 # Cache expiration for predictions
 PREDICTION_CACHE_EXPIRY = 86400  # 24 hours
-DEFAULT_BATCH_SIZE = 2000  # Default batch size for predictions
+MAX_FORECAST_PATHS = 1000  # Upper bound on Monte Carlo paths per request
+MAX_BATCH_TICKERS = 75  # Upper bound on tickers per batch request
+DEFAULT_NOISE_LEVEL = 0.000000000016180339887  # Noise level served from the nightly forecast table
 
-# Utility functions for model paths
-def get_model_path(sector, timeframe):
-    """
-    Returns the absolute path to the model based on sector and timeframe.
-    """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    model_dir = os.path.join(base_dir, '../ml_components/RF_multi_output/models')
-    model_file = f"rf_{sector}_{timeframe}.joblib"
-    return os.path.join(model_dir, model_file)
+# Coalesce identical concurrent downloads and forecasts
+transformed_data_flight = SingleFlight("transformed_data")
+forecast_flight = SingleFlight("forecast")
 
 def evaluate_predictions(y_true, y_pred):
     """
@@ -39,63 +45,168 @@ def identify_sector(stock_name):
     """
     Maps stock tickers to their respective sectors.
     """
-    tech_stocks = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "ADBE", "AVGO", "CRM", "INTC", "AMD", "CSCO", "QCOM", "TXN", "INTU", "ORCL", "IBM", "V", "PYPL", "ADI", "SNOW", "SHOP", "NOW", "SQ", "MA"]
-    finance_stocks = ["JPM", "BAC", "WFC", "GS", "MS", "PNC", "USB", "AXP", "RY", "TD", "SPGI", "CB", "CME", "MET", "ICE", "HSBC", "MCO", "SCHW", "COF", "C", "BLK", "BNS", "MUFG", "BMO", "CINF"]
-    health_stocks = ["JNJ", "PFE", "MRK", "TMO", "UNH", "ABBV", "LLY", "BMY", "AMGN", "CVS", "MDT", "ABT", "SYK", "DHR", "BSX", "GILD", "HCA", "EW", "REGN", "CI", "IQV", "ILMN", "HUM", "ZBH", "BAX"]
-
-    if stock_name in tech_stocks:
-        return "tech"
-    elif stock_name in finance_stocks:
-        return "finance"
-    elif stock_name in health_stocks:
-        return "health"
-    else:
-        raise ValueError(f"Unknown sector for stock: {stock_name}")
+    for sector, tickers in SECTOR_TICKERS.items():
+        if stock_name in tickers:
+            return sector
+    raise ValueError(f"Unknown sector for stock: {stock_name}")
     
 # Utility function to update derived features
-def update_derived_features(data):
+def update_derived_features(data, feature_names=None):
     """
     Recalculates derived features (e.g., moving averages, RSI, MACD, etc.) dynamically
     to include new predictions or updates.
+
+    With `feature_names` (a model's `feature_names_in_`), only the columns the
+    model reads are recalculated.
+    """
+    columns = FORECAST_COLUMNS
+    if feature_names is not None:
+        model_columns = set(columns_for_features(feature_names))
+        columns = [name for name in FORECAST_COLUMNS if name in model_columns]
+    # Missing values of new rows are forward filled, then back filled, then zeroed
+    return add_indicators(data, columns, fill="ffill_zero")
+
+def transformed_data_cache_key(stock_name):
+    """
+    Redis key of a ticker's transformed daily history.
+    """
+    return f"market_ai:stock_data:transformed_data:{stock_name}"
+
+def fetch_transformed_data(stock_name):
+    """
+    Bring a ticker's transformed daily history up to date and cache the result.
+
+    Only bars published since the stored history are downloaded and transformed.
+    """
+    materialized, pending = DataFetchResource().materialize(stock_name)
+    _, transformed_data = materialized.preview(pending)
+    set_to_cache(transformed_data_cache_key(stock_name), transformed_data, ttl=PREDICTION_CACHE_EXPIRY)
+    return transformed_data
+
+def load_transformed_data(stock_name, refresh=False):
+    """
+    Return the full transformed daily history for a ticker, from cache or yFinance.
+
+    Concurrent misses for the same ticker share one download. With `refresh`,
+    the cache is bypassed and rewritten with freshly fetched bars.
+    """
+    cache_key = transformed_data_cache_key(stock_name)
+    if refresh:
+        return transformed_data_flight.do(f"{stock_name}:refresh", lambda: fetch_transformed_data(stock_name))
+
+    transformed_data = get_from_cache(cache_key)
+    if transformed_data is None:
+        transformed_data = transformed_data_flight.do(
+            stock_name, lambda: fetch_transformed_data(stock_name), lambda: get_from_cache(cache_key)
+        )
+    # DataFetchResource shares the key and used to cache JSON records
+    return cached_records(transformed_data)
+
+def load_transformed_data_many(tickers, refresh=False):
+    """
+    Return the transformed daily histories of several tickers.
+
+    Cached histories are read in one round trip; only misses go through
+    `load_transformed_data` one ticker at a time.
+
+    Returns:
+        tuple: (histories, errors), both keyed by ticker.
+    """
+    cached = {}
+    if not refresh:
+        try:
+            cached = get_many([transformed_data_cache_key(stock_name) for stock_name in tickers])
+        except RuntimeError as e:
+            logging.warning(f"Bulk read of transformed data failed, loading tickers one by one: {e}")
+
+    histories, errors = {}, {}
+    for stock_name in tickers:
+        try:
+            transformed_data = cached.get(transformed_data_cache_key(stock_name))
+            if transformed_data is None:
+                histories[stock_name] = load_transformed_data(stock_name, refresh=refresh)
+            else:
+                histories[stock_name] = cached_records(transformed_data)
+        except Exception as e:
+            logging.error(f"Error loading transformed data for {stock_name}: {e}")
+            errors[stock_name] = str(e)
+    return histories, errors
+
+def resolve_forecast_cache_key(stock_name, sector, transformed_data, seed=None):
+    """
+    Return the forecast cache key for a ticker's current bar and models, and the noise seed it uses.
+    """
+    last_bar = last_bar_date(transformed_data)
+    if seed is None:
+        seed = default_seed(stock_name, last_bar)
+    version = models_version(
+        model_registry.version(sector, "historical"), model_registry.version(sector, "recent")
+    )
+    return forecast_cache_key(stock_name, version, last_bar, seed), seed
+
+def forecast_sector(sector, tickers, days_out, refresh=False):
+    """
+    Forecast several tickers of one sector together.
+
+    Each ticker keeps the default noise seed it would get from
+    `/analysis/predict`, while both models get one stacked predict call per day.
+
+    Args:
+        sector (str): Sector whose models are used.
+        tickers (list): Tickers belonging to the sector.
+        days_out (int): Number of days to forecast.
+        refresh (bool): Re-fetch the daily bars instead of reading them from cache.
+
+    Returns:
+        tuple: (forecasts, errors). Forecasts map each ticker to its "historical"
+        and "recent" arrays and a "meta" dict (model version, last bar, seed).
+
+    Raises:
+        FileNotFoundError: If a model for the sector is missing.
+    """
+    historical_model = model_registry.get_predictor(sector, "historical", len(tickers))
+    recent_model = model_registry.get_predictor(sector, "recent", len(tickers))
+    version = models_version(
+        model_registry.version(sector, "historical"), model_registry.version(sector, "recent")
+    )
+
+    # Seed one input row, indicator state and noise source per ticker
+    histories, errors = load_transformed_data_many(tickers, refresh=refresh)
+    batch_tickers, input_rows, states, metas = [], [], [], []
+    for stock_name, transformed_data in histories.items():
+        try:
+            last_bar = last_bar_date(transformed_data)
+            input_rows.append(prepare_input_row(transformed_data, historical_model.feature_names_in_))
+            states.append(IndicatorState.from_history(transformed_data, historical_model.feature_names_in_))
+            metas.append({"version": version, "last_bar": last_bar, "seed": default_seed(stock_name, last_bar)})
+            batch_tickers.append(stock_name)
+        except Exception as e:
+            logging.error(f"Error preparing {stock_name} for batch prediction: {e}")
+            errors[stock_name] = str(e)
+    if not batch_tickers:
+        return {}, errors
+
+    historical = np.empty((days_out, len(batch_tickers)))
+    recent = np.empty((days_out, len(batch_tickers)))
+    steps = iter_forecast(
+        historical_model, recent_model, np.vstack(input_rows), IndicatorState.concat(states), days_out,
+        [np.random.RandomState(meta["seed"]) for meta in metas],
+    )
+    for day, (next_close_historical, next_close_recent) in enumerate(steps):
+        historical[day] = next_close_historical
+        recent[day] = next_close_recent
+
+    forecasts = {
+        stock_name: {"historical": historical[:, column], "recent": recent[:, column], "meta": meta}
+        for column, (stock_name, meta) in enumerate(zip(batch_tickers, metas))
+    }
+    return forecasts, errors
+
+def format_sse(event, payload):
+    """
+    Encode one server-sent event with a JSON payload.
     """
-    # Moving averages
-    data["MA_10"] = data["Close"].rolling(window=10).mean()
-    data["MA_50"] = data["Close"].rolling(window=50).mean()
-
-    # Volatility
-    data["Volatility"] = data["Close"].rolling(window=10).std()
-
-    # Relative Strength Index (RSI)
-    delta = data["Close"].diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-    rs = gain / loss
-    data["RSI"] = 100 - (100 / (1 + rs))
-
-    # MACD and Signal Line
-    ema_12 = data["Close"].ewm(span=12, adjust=False).mean()
-    ema_26 = data["Close"].ewm(span=26, adjust=False).mean()
-    data["MACD"] = ema_12 - ema_26
-    data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
-
-    # Bollinger Bands
-    rolling_mean = data["Close"].rolling(window=20).mean()
-    rolling_std = data["Close"].rolling(window=20).std()
-    data["BB_Lower"] = rolling_mean - (2 * rolling_std)
-    data["BB_Middle"] = rolling_mean
-    data["BB_Upper"] = rolling_mean + (2 * rolling_std)
-
-    # Williams %R
-    high_14 = data["High"].rolling(window=14).max()
-    low_14 = data["Low"].rolling(window=14).min()
-    data["Williams %R"] = ((high_14 - data["Close"]) / (high_14 - low_14)) * -100
-
-    # Fill missing values for new rows
-    data.fillna(method="ffill", inplace=True)
-    data.fillna(method="bfill", inplace=True)
-    data.fillna(0, inplace=True)
-
-    return data
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
 class AnalysisPredictResource(Resource):
     def post(self):
@@ -107,7 +218,9 @@ class AnalysisPredictResource(Resource):
             data = request.get_json()
             stock_name = data.get("stock_name")
             days_out = data.get("days_out", 30)
-            noise_level = data.get("noise_level", 0.000000000016180339887) 
+            noise_level = data.get("noise_level", DEFAULT_NOISE_LEVEL) 
+            paths = data.get("paths")
+            seed = data.get("seed")
             
             # Validate inputs
             if not stock_name:
@@ -116,6 +229,10 @@ class AnalysisPredictResource(Resource):
                 return {"error": "Days out must be between 1 and 180."}, 400
             if not (0 <= noise_level <= 1):
                 return {"error": "Noise level must be between 0 and 1."}, 400
+            if paths is not None and (not isinstance(paths, int) or isinstance(paths, bool) or not (1 <= paths <= MAX_FORECAST_PATHS)):
+                return {"error": f"Paths must be an integer between 1 and {MAX_FORECAST_PATHS}."}, 400
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or not (0 <= seed < MAX_SEED)):
+                return {"error": f"Seed must be an integer between 0 and {MAX_SEED - 1}."}, 400
 
             # Identify sector
             sector = identify_sector(stock_name)
@@ -128,71 +245,75 @@ class AnalysisPredictResource(Resource):
             if not os.path.exists(historical_model_path) or not os.path.exists(recent_model_path):
                 return {"error": f"Model(s) not found for sector: {sector}"}, 404
 
-            # Load models
-            historical_model = load(historical_model_path)
-            recent_model = load(recent_model_path)
+            # Load models (kept warm across requests by the registry)
+            rows_per_call = paths or 1
+            historical_model = model_registry.get_predictor(sector, "historical", rows_per_call)
+            recent_model = model_registry.get_predictor(sector, "recent", rows_per_call)
+
+            # Default requests are served from the nightly forecast table while it matches the models
+            # and no session has closed since it was written
+            if paths is None and seed is None and noise_level == DEFAULT_NOISE_LEVEL:
+                row = read_forecast_row(stock_name, days_out)
+                version = models_version(
+                    model_registry.version(sector, "historical"), model_registry.version(sector, "recent")
+                )
+                if row is not None and row["meta"]["version"] == version and is_current(row["meta"]):
+                    return {
+                        "stock_name": stock_name,
+                        "historical_predictions": row["historical"],
+                        "recent_predictions": row["recent"],
+                    }, 200
 
             # Retrieve transformed data
-            transformed_cache_key = f"market_ai:stock_data:transformed_data:{stock_name}"
-            transformed_data = get_from_cache(transformed_cache_key)
-            if transformed_data is None:
-                data_fetcher = DataFetchResource()
-                raw_data = data_fetcher.fetch_raw_data(stock_name, period="max", interval="1d")
-                transformed_data = data_fetcher.transform_data(raw_data)
-                set_to_cache(transformed_cache_key, transformed_data, ttl=PREDICTION_CACHE_EXPIRY)
-
-            # Prepare input data
-            input_data = transformed_data.iloc[-1:].drop(columns=["Date"], errors="ignore")
-            input_data.fillna(input_data.mean(), inplace=True)
-            input_data = input_data.reindex(columns=historical_model.feature_names_in_, fill_value=0)
-
-            # Predictions with noise
-            predictions_historical = []
-            predictions_recent = []
-
-            for day in range(1, days_out + 1):
-                # Predict the next close price
-                next_close_historical = historical_model.predict(input_data.to_numpy())[0]
-                next_close_recent = recent_model.predict(input_data.to_numpy())[0]
-
-                # Calculate 10-day rolling volatility. This will be the second factor to noise to keep it aligned with the stock's natural movement/trading activity.
-                # using 90 days (1 fiscal quarter) of rolled volatility as a strong basis
-                volatility = transformed_data["Close"].rolling(window=90).std().iloc[-1]
-                if np.isnan(volatility) or volatility == 0:
-                    volatility = 0.01  # Default small volatility for stability
-
-                # Introduce noise proportional to volatility using the golden ratio ϕ= (1+√5)/2=1.6180339887. This is a natural number and I think would be best for natural progression of noise.
-                scale_factor_historical = np.random.uniform(0.0000000000016180339887, 1.0)  
-                scale_factor_recent = np.random.uniform(0.0000000000016180339887, 1.0)  
-
-                noise_historical = np.random.normal(0, scale_factor_historical * (volatility / 1.6180339887 ** 2))
-                noise_recent = np.random.normal(0, scale_factor_recent * (volatility / 1.6180339887 ** 2))
-
-                next_close_historical += noise_historical
-                next_close_recent += noise_recent
-
-                # Append predictions with noise
-                predictions_historical.append(next_close_historical)
-                predictions_recent.append(next_close_recent)
-
-                # Update input data for the next prediction
-                new_row = input_data.copy()
-                new_row["Close"] = next_close_historical
-                transformed_data = pd.concat([transformed_data, new_row], ignore_index=True)
-                transformed_data = update_derived_features(transformed_data)
-                input_data = transformed_data.iloc[-1:].drop(columns=["Date"], errors="ignore")
-                input_data = input_data.reindex(columns=historical_model.feature_names_in_, fill_value=0)
-
-            # Cache results
-            historical_cache_key = f"market_ai:predictions:{stock_name}:historical:{days_out}"
-            recent_cache_key = f"market_ai:predictions:{stock_name}:recent:{days_out}"
-            set_to_cache(historical_cache_key, predictions_historical, ttl=PREDICTION_CACHE_EXPIRY)
-            set_to_cache(recent_cache_key, predictions_recent, ttl=PREDICTION_CACHE_EXPIRY)
+            transformed_data = load_transformed_data(stock_name)
+
+            # Prepare input data and seed the streaming indicator state once from the history
+            input_row = prepare_input_row(transformed_data, historical_model.feature_names_in_)
+            state = IndicatorState.from_history(transformed_data, historical_model.feature_names_in_)
+
+            if paths is not None:
+                # Monte Carlo mode: all paths move forward together, one predict call per step
+                rng = np.random if seed is None else np.random.RandomState(seed)
+                bands = forecast_bands(historical_model, recent_model, input_row, state, days_out, paths, rng)
+                return {
+                    "stock_name": stock_name,
+                    "paths": paths,
+                    "historical": bands["historical"],
+                    "recent": bands["recent"],
+                }, 200
+
+            # Serve any horizon from the longest forecast cached for this bar, models and seed
+            cache_key, seed = resolve_forecast_cache_key(stock_name, sector, transformed_data, seed)
+            cached = get_cached_forecast(cache_key, days_out)
+            if cached is not None:
+                return {
+                    "stock_name": stock_name,
+                    "historical_predictions": cached["historical"],
+                    "recent_predictions": cached["recent"],
+                }, 200
+
+            # Predictions with noise, computed once for concurrent identical requests
+            def compute_forecast():
+                predictions_historical = []
+                predictions_recent = []
+                for next_close_historical, next_close_recent in iter_forecast(
+                    historical_model, recent_model, input_row, state.repeat(1), days_out, np.random.RandomState(seed)
+                ):
+                    predictions_historical.append(float(next_close_historical[0]))
+                    predictions_recent.append(float(next_close_recent[0]))
+
+                # Cache results
+                store_forecast(cache_key, predictions_historical, predictions_recent, ttl=PREDICTION_CACHE_EXPIRY)
+                return {"historical": predictions_historical, "recent": predictions_recent}
+
+            forecast = forecast_flight.do(
+                f"{cache_key}:{days_out}", compute_forecast, lambda: get_cached_forecast(cache_key, days_out)
+            )
 
             return {
                 "stock_name": stock_name,
-                "historical_predictions": predictions_historical,
-                "recent_predictions": predictions_recent,
+                "historical_predictions": forecast["historical"],
+                "recent_predictions": forecast["recent"],
             }, 200
 
         except Exception as e:
@@ -200,10 +321,14 @@ class AnalysisPredictResource(Resource):
             return {"error": f"An error occurred: {str(e)}"}, 500
 
 
+    @staticmethod
     def parallel_predictions(input_data, model_path, batch_size=DEFAULT_BATCH_SIZE):
         """
         Use parallel computation for batch predictions of single-target models.
 
+        The model is loaded once and shared by every batch; predictions keep
+        the row order of `input_data`.
+
         Args:
             input_data (np.ndarray): Input data for predictions.
             model_path (str): Path to the pre-trained model.
@@ -216,24 +341,8 @@ class AnalysisPredictResource(Resource):
         input_data = np.array(input_data) if not isinstance(input_data, np.ndarray) else input_data
         logging.info(f"Input data shape: {input_data.shape}, Type: {type(input_data)}")
 
-        def predict_batch(data_batch):
-            """
-            Load a model and predict a batch of data.
-            """
-            model = load(model_path)
-            return model.predict(data_batch)
-
         try:
-            # Split input data into batches
-            batches = [input_data[i:i + batch_size] for i in range(0, len(input_data), batch_size)]
-
-            with ThreadPoolExecutor() as executor:
-                # Submit tasks for predictions
-                futures = [executor.submit(predict_batch, batch) for batch in batches]
-
-                # Gather results
-                predictions = np.concatenate([future.result() for future in futures])
-
+            predictions = score_in_batches(input_data, model_path=model_path, batch_size=batch_size)
             logging.info(f"Predictions shape: {predictions.shape}, Type: {type(predictions)}")
             return predictions
         except Exception as e:
@@ -274,13 +383,12 @@ class AnalysisPredictResource(Resource):
         """
         try:
             if action == "set" and transformed_data is not None:
-                cache_value = transformed_data.to_json(orient="records")
-                set_to_cache(cache_key, cache_value, expiry)
+                set_to_cache(cache_key, transformed_data, expiry)
                 logging.info(f"Data successfully set to cache for key: {cache_key}")
             elif action == "get":
                 cached_value = get_from_cache(cache_key)
-                if cached_value:
-                    return pd.DataFrame(json.loads(cached_value))
+                if cached_value is not None:
+                    return cached_records(cached_value)
                 logging.info(f"No data found in cache for key: {cache_key}")
             elif action == "clear":
                 # Implement clearing cache logic if required
@@ -288,3 +396,151 @@ class AnalysisPredictResource(Resource):
         except Exception as e:
             logging.error(f"Cache management failed for key {cache_key}: {e}")
             raise e
+
+
+class AnalysisPredictBatchResource(Resource):
+    def post(self):
+        """
+        Predict several tickers at once, advancing each sector's tickers together.
+
+        Tickers are grouped by sector so the historical and recent models each
+        get one stacked predict call per forecast day.
+        """
+        try:
+            data = request.get_json()
+            tickers = data.get("tickers")
+            days_out = data.get("days_out", 30)
+            noise_level = data.get("noise_level", DEFAULT_NOISE_LEVEL)
+
+            # Validate inputs
+            if not tickers or not isinstance(tickers, list):
+                return {"error": "A non-empty list of tickers is required"}, 400
+            if len(tickers) > MAX_BATCH_TICKERS:
+                return {"error": f"At most {MAX_BATCH_TICKERS} tickers can be predicted per request."}, 400
+            if not (1 <= days_out <= 180):
+                return {"error": "Days out must be between 1 and 180."}, 400
+            if not (0 <= noise_level <= 1):
+                return {"error": "Noise level must be between 0 and 1."}, 400
+
+            # Group tickers by sector model
+            errors = {}
+            tickers_by_sector = {}
+            for stock_name in dict.fromkeys(tickers):
+                try:
+                    tickers_by_sector.setdefault(identify_sector(stock_name), []).append(stock_name)
+                except ValueError as e:
+                    errors[stock_name] = str(e)
+
+            predictions = {}
+            for sector, sector_tickers in tickers_by_sector.items():
+                try:
+                    forecasts, sector_errors = forecast_sector(sector, sector_tickers, days_out)
+                except FileNotFoundError:
+                    for stock_name in sector_tickers:
+                        errors[stock_name] = f"Model(s) not found for sector: {sector}"
+                    continue
+
+                errors.update(sector_errors)
+                for stock_name, forecast in forecasts.items():
+                    predictions[stock_name] = {
+                        "sector": sector,
+                        "historical_predictions": forecast["historical"].tolist(),
+                        "recent_predictions": forecast["recent"].tolist(),
+                    }
+
+            return {"predictions": predictions, "errors": errors}, 200
+
+        except Exception as e:
+            logging.error(f"Error during batch prediction: {e}")
+            return {"error": f"An error occurred: {str(e)}"}, 500
+
+
+class AnalysisPredictStreamResource(Resource):
+    def get(self):
+        """
+        Stream a single-path forecast as server-sent events, one "day" event per forecast day.
+
+        Query parameters match `/analysis/predict` (stock_name, days_out,
+        noise_level, seed). A final "done" event carries the full lists; a
+        failure mid-stream is reported as an "error" event.
+        """
+        stock_name = request.args.get("stock_name")
+        days_out = request.args.get("days_out", 30, type=int)
+        noise_level = request.args.get("noise_level", DEFAULT_NOISE_LEVEL, type=float)
+        seed = request.args.get("seed", type=int)
+
+        # Validate inputs
+        if not stock_name:
+            return {"error": "Stock name is required"}, 400
+        if days_out is None or not (1 <= days_out <= 180):
+            return {"error": "Days out must be between 1 and 180."}, 400
+        if noise_level is None or not (0 <= noise_level <= 1):
+            return {"error": "Noise level must be between 0 and 1."}, 400
+        if "seed" in request.args and (seed is None or not (0 <= seed < MAX_SEED)):
+            return {"error": f"Seed must be an integer between 0 and {MAX_SEED - 1}."}, 400
+
+        try:
+            sector = identify_sector(stock_name)
+            historical_model = model_registry.get_predictor(sector, "historical")
+            recent_model = model_registry.get_predictor(sector, "recent")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        except FileNotFoundError:
+            return {"error": f"Model(s) not found for sector: {sector}"}, 404
+
+        def generate():
+            try:
+                transformed_data = load_transformed_data(stock_name)
+                cache_key, forecast_seed = resolve_forecast_cache_key(stock_name, sector, transformed_data, seed)
+                cached = get_cached_forecast(cache_key, days_out)
+
+                if cached is not None:
+                    steps = zip(cached["historical"], cached["recent"])
+                else:
+                    input_row = prepare_input_row(transformed_data, historical_model.feature_names_in_)
+                    state = IndicatorState.from_history(transformed_data, historical_model.feature_names_in_).repeat(1)
+                    steps = (
+                        (float(historical[0]), float(recent[0]))
+                        for historical, recent in iter_forecast(
+                            historical_model, recent_model, input_row, state, days_out,
+                            np.random.RandomState(forecast_seed),
+                        )
+                    )
+
+                predictions_historical = []
+                predictions_recent = []
+                for day, (next_close_historical, next_close_recent) in enumerate(steps, start=1):
+                    predictions_historical.append(next_close_historical)
+                    predictions_recent.append(next_close_recent)
+                    yield format_sse("day", {
+                        "day": day,
+                        "historical": next_close_historical,
+                        "recent": next_close_recent,
+                    })
+
+                if cached is None:
+                    store_forecast(cache_key, predictions_historical, predictions_recent, ttl=PREDICTION_CACHE_EXPIRY)
+
+                yield format_sse("done", {
+                    "stock_name": stock_name,
+                    "historical_predictions": predictions_historical,
+                    "recent_predictions": predictions_recent,
+                })
+            except Exception as e:
+                logging.error(f"Error during streamed prediction: {e}")
+                yield format_sse("error", {"error": f"An error occurred: {str(e)}"})
+
+        # Disable proxy buffering so each day reaches the client as soon as it is computed
+        return Response(
+            generate(),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+class ModelRegistryStatsResource(Resource):
+    def get(self):
+        """
+        Report load time, memory footprint and hit counts of the warm models.
+        """
+        return {"models": model_registry.stats()}, 200
@@ -0,0 +1,13 @@
+# server/resources/cache_resource.py
+
+from flask_restful import Resource
+from utils.redis_helper import cache_stats
+from utils.single_flight import single_flight_stats
+
+
+class CacheStatsResource(Resource):
+    def get(self):
+        """
+        Report per-tier cache hit ratios and request coalescing counts for this worker process.
+        """
+        return {"tiers": cache_stats(), "single_flight": single_flight_stats()}, 200
@@ -4,18 +4,39 @@ from flask import jsonify, abort, request
 from flask_restful import Resource
 import os
 import json
+import time
 import yfinance as yf
 import pandas as pd
 from config import redis_client
-from utils.redis_helper import get_from_cache, set_to_cache
+from utils.redis_helper import get_from_cache, get_many, set_many
+from utils.single_flight import SingleFlight, should_refresh
+from utils.indicator_engine import add_indicators, parabolic_sar
+from utils.incremental_features import MaterializedFeatures, load_materialized, store_materialized
+from utils.intraday_features import INTRADAY_INTERVALS, transform_intraday
+from utils.forecast_table import MARKET_TIMEZONE, last_session_close
 import logging
 
 # Redis cache expiration
 CACHE_EXPIRY = 86400  # 24 hours
+# Seconds an expired value is still served while one worker refreshes it in the background
+STALE_WHILE_REVALIDATE = 3600
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 
+# Coalesce identical concurrent yFinance downloads
+stock_data_flight = SingleFlight("stock_data")
+
+# Columns of a raw daily history
+RAW_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+# Derived columns in the order they are added to transformed data
+TRANSFORMED_COLUMNS = [
+    "VWAP", "MA_10", "MA_50", "EMA_10", "EMA_50", "RSI", "BB_Lower", "BB_Middle", "BB_Upper",
+    "MACD", "MACD_Signal", "MACD_Hist", "Stochastic", "Williams %R", "Parabolic_SAR", "OBV",
+    "Pivot", "R1", "S1", "Volatility",
+]
+
 # Define the directory where data files are stored
 DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), '../ml_components/data')
 
@@ -32,34 +53,93 @@ def get_json_path(sector, data_type):
     return os.path.join(DATA_DIRECTORY, f"{sector}_{data_type}_attributions.json")
 
 
+def cached_records(value):
+    """
+    DataFrame of a cached value: stored as is, or as JSON records by earlier versions.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value
+    records = pd.DataFrame(json.loads(value))
+    # to_json wrote timestamps as epoch milliseconds
+    for name in ("Date", "Datetime"):
+        if name in records.columns and pd.api.types.is_numeric_dtype(records[name]):
+            records[name] = pd.to_datetime(records[name], unit="ms")
+    return records
+
+
+def split_open_session(raw, now=None):
+    """
+    Split daily bars into final ones and those of a session that has not closed yet.
+
+    Returns:
+        tuple: (final bars, open-session bars), both with a fresh index.
+    """
+    dates = pd.to_datetime(raw["Date"])
+    if dates.dt.tz is not None:
+        # Keep the exchange-local trading date
+        dates = dates.dt.tz_convert(MARKET_TIMEZONE).dt.tz_localize(None)
+    last_closed = last_session_close(now).tz_localize(None).normalize()
+    is_final = (dates.dt.normalize() <= last_closed).to_numpy()
+    return raw[is_final].reset_index(drop=True), raw[~is_final].reset_index(drop=True)
+
+
 class BaseDataFetchResource(Resource):
     @staticmethod
-    def fetch_and_cache(symbol, cache_key, fetch_function, transform_function=None):
+    def fetch_and_cache(symbol, cache_key, fetch_function, transform_function=None, ttl=CACHE_EXPIRY):
         """
         Fetch data from cache or execute fetch_function and transform_function if not cached.
 
+        Values stay fresh for `ttl` seconds and are kept STALE_WHILE_REVALIDATE
+        seconds longer. A reader that finds the value expired, or decides to
+        refresh it early (see `should_refresh`), still gets the cached value
+        while one worker recomputes it in the background. Only when nothing
+        is cached do callers wait, sharing a single computation.
+
         Parameters:
             symbol (str): Stock ticker symbol.
             cache_key (str): Redis cache key.
             fetch_function (callable): Function to fetch raw data.
             transform_function (callable): Function to transform the fetched data.
+            ttl (int): Seconds the value is fresh.
 
         Returns:
             DataFrame: Cached or newly fetched/transformed data.
         """
-        cached_data = get_from_cache(cache_key)
-        if cached_data:
+        # Expiry time and computation time of the cached value
+        freshness_key = f"{cache_key}:freshness"
+
+        def read_cached():
+            cached_data = get_from_cache(cache_key)
+            if cached_data is None or isinstance(cached_data, pd.DataFrame):
+                return cached_data
             try:
-                return pd.DataFrame(json.loads(cached_data))
+                return cached_records(cached_data)
             except Exception as e:
                 logging.error(f"Deserialization failed for {cache_key}: {e}")
                 raise
-        else:
+
+        def fetch_and_store():
+            start = time.time()
             raw_data = fetch_function(symbol)
             transformed_data = transform_function(raw_data) if transform_function else raw_data
-            set_to_cache(cache_key, transformed_data.to_json(orient="records"))
+            finished = time.time()
+            # Value and freshness are written in one round trip
+            set_many(
+                {cache_key: transformed_data, freshness_key: {"expires_at": finished + ttl, "delta": finished - start}},
+                ttl + STALE_WHILE_REVALIDATE,
+            )
             return transformed_data
 
+        cached_data = read_cached()
+        if cached_data is not None:
+            freshness = get_from_cache(freshness_key)
+            # Values cached without freshness predate stale-while-revalidate
+            if freshness is None or should_refresh(freshness["expires_at"], freshness["delta"]):
+                stock_data_flight.refresh(cache_key, fetch_and_store)
+            return cached_data
+        # Concurrent misses for the same key share one download and transform
+        return stock_data_flight.do(cache_key, fetch_and_store, read_cached)
+
 
 class DataFetchResource(Resource):
     def get(self, symbol):
@@ -72,14 +152,17 @@ class DataFetchResource(Resource):
             transformed_cache_key = f"market_ai:stock_data:transformed_data:{symbol}"
 
             # Fetch raw and transformed data
-            raw_data, transformed_data = self.fetch_and_transform(
-                symbol, raw_cache_key, transformed_cache_key, self.fetch_raw_data, self.transform_data
-            )
-
-            return {
-                "raw_data": raw_data.to_dict(orient="records"),
-                "transformed_data": transformed_data.to_dict(orient="records")
-            }, 200
+            raw_data, transformed_data = self.fetch_and_transform(symbol, raw_cache_key, transformed_cache_key)
+
+            response = {
+                "raw_data": json.loads(raw_data.to_json(orient="records")),
+                "transformed_data": json.loads(transformed_data.to_json(orient="records"))
+            }
+            # On-demand check of the incrementally built features against a full recompute
+            if request.args.get("verify", "false").lower() == "true":
+                materialized = load_materialized(symbol)
+                response["consistency"] = materialized.verify() if materialized is not None else None
+            return response, 200
         except Exception as e:
             return {"error": f"An error occurred: {str(e)}"}, 500
 
@@ -92,7 +175,18 @@ class DataFetchResource(Resource):
         raw_data = stock.history(period=period, interval=interval).reset_index()
         if raw_data.empty:
             raise ValueError(f"No data available for stock: {symbol}")
-        return raw_data[["Date", "Open", "High", "Low", "Close", "Volume"]]
+        return raw_data[RAW_COLUMNS]
+
+    @staticmethod
+    def fetch_raw_data_since(symbol, start, interval="1d"):
+        """
+        Fetch raw stock data from `start` (inclusive) to today; empty when there are no bars.
+        """
+        stock = yf.Ticker(symbol)
+        raw_data = stock.history(start=start.strftime("%Y-%m-%d"), interval=interval).reset_index()
+        if raw_data.empty:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        return raw_data[RAW_COLUMNS]
 
     @staticmethod
     def transform_data(data):
@@ -104,56 +198,8 @@ class DataFetchResource(Resource):
 
         data = data.copy()
         try:
-            # Derived features
-            data["VWAP"] = ((data["Close"] + data["High"] + data["Low"]) / 3 * data["Volume"]).cumsum() / data["Volume"].cumsum()
-            data["MA_10"] = data["Close"].rolling(window=10).mean()
-            data["MA_50"] = data["Close"].rolling(window=50).mean()
-            data["EMA_10"] = data["Close"].ewm(span=10, adjust=False).mean()
-            data["EMA_50"] = data["Close"].ewm(span=50, adjust=False).mean()
-
-            delta = data["Close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            data["RSI"] = 100 - (100 / (1 + rs))
-
-            rolling_mean = data["Close"].rolling(window=20).mean()
-            rolling_std = data["Close"].rolling(window=20).std()
-            data["BB_Lower"] = rolling_mean - (2 * rolling_std)
-            data["BB_Middle"] = rolling_mean
-            data["BB_Upper"] = rolling_mean + (2 * rolling_std)
-
-            ema_12 = data["Close"].ewm(span=12, adjust=False).mean()
-            ema_26 = data["Close"].ewm(span=26, adjust=False).mean()
-            data["MACD"] = ema_12 - ema_26
-            data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
-            data["MACD_Hist"] = data["MACD"] - data["MACD_Signal"]
-
-            lowest_low = data["Low"].rolling(window=14).min()
-            highest_high = data["High"].rolling(window=14).max()
-            data["Stochastic"] = 100 * (data["Close"] - lowest_low) / (highest_high - lowest_low)
-            data["Williams %R"] = -100 * (highest_high - data["Close"]) / (highest_high - lowest_low)
-            data["Parabolic_SAR"] = DataFetchResource.calculate_parabolic_sar(data)
-
-            obv = [0]
-            for i in range(1, len(data)):
-                if data["Close"].iloc[i] > data["Close"].iloc[i - 1]:
-                    obv.append(obv[-1] + data["Volume"].iloc[i])
-                elif data["Close"].iloc[i] < data["Close"].iloc[i - 1]:
-                    obv.append(obv[-1] - data["Volume"].iloc[i])
-                else:
-                    obv.append(obv[-1])
-            data["OBV"] = obv
-
-            data["Pivot"] = (data["High"] + data["Low"] + data["Close"]) / 3
-            data["R1"] = (2 * data["Pivot"]) - data["Low"]
-            data["S1"] = (2 * data["Pivot"]) - data["High"]
-            data["Volatility"] = data["Close"].rolling(window=10).std()
-
-            # Fill NaNs if any
-            data.fillna(method="ffill", inplace=True)
-            data.fillna(method="bfill", inplace=True)
-
+            # Derived features, with NaNs forward then back filled
+            add_indicators(data, TRANSFORMED_COLUMNS, fill="ffill")
         except Exception as e:
             raise RuntimeError(f"Error during data transformation: {str(e)}")
 
@@ -168,56 +214,62 @@ class DataFetchResource(Resource):
         """
         Helper function to calculate Parabolic SAR.
         """
-        psar = data["Close"].copy()
-        af = step
-        ep = data["High"].iloc[0] if data["Close"].iloc[0] > data["Open"].iloc[0] else data["Low"].iloc[0]
-        rising = data["Close"].iloc[0] > data["Open"].iloc[0]
-
-        for i in range(1, len(data)):
-            psar.iloc[i] = psar.iloc[i - 1] + af * (ep - psar.iloc[i - 1])
-
-            if rising:
-                if data["Low"].iloc[i] < psar.iloc[i]:
-                    rising = False
-                    psar.iloc[i] = ep
-                    ep = data["Low"].iloc[i]
-                    af = step
-                elif data["High"].iloc[i] > ep:
-                    ep = data["High"].iloc[i]
-                    af = min(af + step, max_step)
-            else:
-                if data["High"].iloc[i] > psar.iloc[i]:
-                    rising = True
-                    psar.iloc[i] = ep
-                    ep = data["High"].iloc[i]
-                    af = step
-                elif data["Low"].iloc[i] < ep:
-                    ep = data["Low"].iloc[i]
-                    af = min(af + step, max_step)
-
-        return psar
-
-    def fetch_and_transform(self, symbol, raw_cache_key, transformed_cache_key, fetch_function, transform_function):
-        # Ensure transformed data is returned as a DataFrame
-        transformed_data = get_from_cache(transformed_cache_key)
-        if transformed_data:
+        psar = parabolic_sar(
+            data["Open"].to_numpy(dtype=float), data["High"].to_numpy(dtype=float),
+            data["Low"].to_numpy(dtype=float), data["Close"].to_numpy(dtype=float), step, max_step,
+        )
+        return pd.Series(psar, index=data.index, name="Close")
+
+    def materialize(self, symbol):
+        """
+        Bring a ticker's full transformed history up to date.
+
+        Only bars newer than the stored history are downloaded and transformed;
+        the history is rebuilt from `period="max"` when none is stored or it
+        cannot be extended (restated bars, missing prices). Bars of a session
+        that has not closed yet are returned apart and not stored, so their
+        final version extends the history on the next call.
+
+        Returns:
+            tuple: The up-to-date MaterializedFeatures, also persisted to Redis,
+            and the raw bars of the open session (see `MaterializedFeatures.preview`).
+        """
+        materialized = load_materialized(symbol)
+        if materialized is not None:
+            try:
+                closed, pending = split_open_session(self.fetch_raw_data_since(symbol, materialized.last_date))
+                appended = materialized.extend(closed)
+                logging.info(f"Appended {appended} new bars to the materialized features of {symbol}")
+            except ValueError as e:
+                logging.info(f"Rebuilding materialized features for {symbol}: {e}")
+                materialized = None
+
+        if materialized is None:
+            closed, pending = split_open_session(self.fetch_raw_data(symbol))
+            if closed.empty:
+                # Nothing final yet: a first session of trading
+                closed, pending = pending, pending.iloc[:0]
+            materialized = MaterializedFeatures.build(closed, TRANSFORMED_COLUMNS)
+        store_materialized(symbol, materialized)
+        return materialized, pending
+
+    def fetch_and_transform(self, symbol, raw_cache_key, transformed_cache_key):
+        # Both keys are read in one round trip
+        cached = get_many([raw_cache_key, transformed_cache_key])
+        transformed_data = cached[transformed_cache_key]
+        if transformed_data is not None:
             logging.info(f"Cache hit for transformed data: {transformed_cache_key}")
-            transformed_data = pd.DataFrame(json.loads(transformed_data))  # Always convert to DataFrame
-            logging.info(f"Deserialized data for {transformed_cache_key}: {transformed_data}")
-        else:
-            # Fetch and transform raw data
-            raw_data = get_from_cache(raw_cache_key)
-            if raw_data:
-                logging.info(f"Cache hit for raw data: {raw_cache_key}")
-                raw_data = pd.DataFrame(json.loads(raw_data))
+            transformed_data = cached_records(transformed_data)  # Always convert to DataFrame
+            raw_data = cached[raw_cache_key]
+            if raw_data is not None:
+                raw_data = cached_records(raw_data)
             else:
-                logging.info(f"Cache miss for raw data. Fetching {symbol} from yFinance.")
-                raw_data = fetch_function(symbol)
-                logging.info(f"Storing transformed data in cache for {transformed_cache_key}: {transformed_data.to_json(orient='records')}")
-                set_to_cache(raw_cache_key, raw_data.to_json(orient="records"), CACHE_EXPIRY)
-
-            transformed_data = transform_function(raw_data)
-            set_to_cache(transformed_cache_key, transformed_data.to_json(orient="records"), CACHE_EXPIRY)
+                raw_data = transformed_data[RAW_COLUMNS]
+        else:
+            # Extend the stored history with the bars published since it was built
+            materialized, pending = self.materialize(symbol)
+            raw_data, transformed_data = materialized.preview(pending)
+            set_many({raw_cache_key: raw_data, transformed_cache_key: transformed_data}, CACHE_EXPIRY)
 
         return pd.DataFrame(raw_data), pd.DataFrame(transformed_data)  # Ensure both are DataFrames
 
@@ -241,12 +293,17 @@ class StockDataFetchResource(BaseDataFetchResource):
             # Redis cache key
             cache_key = f"stock_data:{symbol}:{period}:{interval}"
 
+            # Minute-level histories are transformed in chunks, with session VWAP
+            transform_function = (
+                self.transform_intraday_data if interval in INTRADAY_INTERVALS else DataFetchResource.transform_data
+            )
+
             # Fetch data from cache or yFinance
             derived_data = self.fetch_and_cache(
                 symbol,
                 cache_key,
                 lambda x: yf.Ticker(x).history(period=period, interval=interval).reset_index(),
-                DataFetchResource.transform_data,
+                transform_function,
             )
 
             return {"symbol": symbol, "data": json.loads(derived_data.to_json(orient="records"))}, 200
@@ -254,3 +311,19 @@ class StockDataFetchResource(BaseDataFetchResource):
         except Exception as e:
             logging.error(f"Error fetching stock data for {symbol}: {e}")
             return {"error": f"Failed to fetch stock data for {symbol}: {str(e)}"}, 500
+
+    @staticmethod
+    def transform_intraday_data(data):
+        """
+        Add derived features to intraday data in bounded-memory chunks.
+
+        VWAP restarts at every trading session; the other indicators match
+        `DataFetchResource.transform_data`.
+        """
+        if data.empty:
+            raise ValueError("Input data for transformation is empty.")
+
+        try:
+            return transform_intraday(data, TRANSFORMED_COLUMNS)
+        except Exception as e:
+            raise RuntimeError(f"Error during data transformation: {str(e)}")
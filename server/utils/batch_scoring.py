@@ -0,0 +1,154 @@
+import os
+import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from joblib import load
+from utils.compact_features import COMPACT_DTYPE
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_BATCH_SIZE = 2000  # Rows scored per task
+PROCESS_MIN_ROWS = 200000  # Below this, process start-up costs more than it saves
+
+# Per-process state of the process pool workers
+_worker = {}
+
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(model, model_path, inputs, outputs):
+    """
+    Load the model once per worker and map the shared input and output matrices.
+    """
+    model = load(model_path) if model is None else model
+    if hasattr(model, "n_jobs"):
+        # The pool already uses every core
+        model.n_jobs = 1
+    _worker["model"] = model
+    _worker["inputs"] = _attach(*inputs)
+    _worker["outputs"] = _attach(*outputs)
+
+
+def _score_slice(start, end):
+    X = _worker["inputs"][1]
+    predictions = _worker["outputs"][1]
+    predictions[start:end] = _worker["model"].predict(X[start:end])
+    return start, end
+
+
+def is_tree_ensemble(model):
+    """
+    Whether a model is an ensemble of fitted sklearn trees, which compare float32 inputs.
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        return False
+    return all(hasattr(estimator, "tree_") for estimator in np.ravel(estimators))
+
+
+class BatchScorer:
+    """
+    Score large matrices with a single model instance shared read-only.
+
+    Rows are split into fixed batches and each batch writes its predictions
+    into its own slice of the output, so results come back in input order
+    whatever the scheduling. Threads share the in-memory model; for large
+    matrices a process pool is used instead, where each worker loads the
+    model once and reads/writes the matrices through shared memory.
+    """
+
+    def __init__(
+        self, model=None, model_path=None, batch_size=DEFAULT_BATCH_SIZE, n_workers=None, backend="auto",
+        dtype=None,
+    ):
+        if model is None and model_path is None:
+            raise ValueError("Either a model or a model path is required.")
+        if backend not in ("auto", "thread", "process"):
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self.model = load(model_path) if model is None else model
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.backend = backend
+        # Trees compare float32 inputs, so for forests a float32 matrix gives the same
+        # predictions at half the size; other models keep full precision
+        if dtype is None:
+            dtype = COMPACT_DTYPE if is_tree_ensemble(self.model) else np.float64
+        self.dtype = dtype
+
+    def _output_shape(self, n_rows):
+        n_outputs = getattr(self.model, "n_outputs_", 1)
+        return (n_rows,) if n_outputs == 1 else (n_rows, n_outputs)
+
+    def _slices(self, n_rows):
+        return [(start, min(start + self.batch_size, n_rows)) for start in range(0, n_rows, self.batch_size)]
+
+    def predict(self, X):
+        """
+        Predict every row of X.
+
+        Args:
+            X (array-like): Input matrix of shape (n_rows, n_features).
+
+        Returns:
+            np.ndarray: Predictions in input order.
+        """
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        n_rows = X.shape[0]
+        slices = self._slices(n_rows)
+        if len(slices) <= 1 or self.n_workers == 1:
+            return np.asarray(self.model.predict(X), dtype=float).reshape(self._output_shape(n_rows))
+
+        backend = self.backend
+        if backend == "auto":
+            backend = "process" if n_rows >= PROCESS_MIN_ROWS else "thread"
+        if backend == "process":
+            return self._predict_processes(X, slices)
+        return self._predict_threads(X, slices)
+
+    def _predict_threads(self, X, slices):
+        predictions = np.empty(self._output_shape(X.shape[0]))
+
+        def score(bounds):
+            start, end = bounds
+            predictions[start:end] = self.model.predict(X[start:end])
+
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            list(executor.map(score, slices))
+        return predictions
+
+    def _predict_processes(self, X, slices):
+        output_shape = self._output_shape(X.shape[0])
+        input_block = shared_memory.SharedMemory(create=True, size=X.nbytes)
+        output_block = shared_memory.SharedMemory(create=True, size=int(np.prod(output_shape)) * 8)
+        try:
+            np.ndarray(X.shape, dtype=X.dtype, buffer=input_block.buf)[:] = X
+            # Workers load from disk when they can, instead of receiving the pickled model
+            model = None if self.model_path is not None else self.model
+            init_args = (
+                model, self.model_path,
+                (input_block.name, X.shape, X.dtype), (output_block.name, output_shape, np.float64),
+            )
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker, initargs=init_args) as executor:
+                starts, ends = zip(*slices)
+                list(executor.map(_score_slice, starts, ends))
+            return np.ndarray(output_shape, dtype=np.float64, buffer=output_block.buf).copy()
+        finally:
+            input_block.close()
+            input_block.unlink()
+            output_block.close()
+            output_block.unlink()
+
+
+def score_in_batches(X, model=None, model_path=None, batch_size=DEFAULT_BATCH_SIZE, n_workers=None, backend="auto"):
+    """
+    Convenience wrapper to score X once with a fresh BatchScorer.
+    """
+    scorer = BatchScorer(model=model, model_path=model_path, batch_size=batch_size, n_workers=n_workers, backend=backend)
+    return scorer.predict(X)
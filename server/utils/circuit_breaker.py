@@ -0,0 +1,90 @@
+import time
+import random
+import logging
+import threading
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing dependency and probe it again with exponential backoff.
+
+    Closed, every call is allowed. `failure_threshold` consecutive failures
+    open the circuit: calls are refused without waiting on the dependency
+    until the backoff has passed. Then a single probe call is allowed (half
+    open); its success closes the circuit, its failure reopens it with twice
+    the backoff, up to `max_reset_timeout`. Backoffs are jittered so workers
+    that lost the dependency together do not all probe at once.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=1.0, max_reset_timeout=60.0,
+                 clock=time.monotonic, rng=random):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self.rng = rng
+        self._state = CLOSED
+        self._failures = 0
+        self._backoff = reset_timeout
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"trips": 0, "rejected": 0, "probes": 0, "recoveries": 0}
+
+    def allow(self):
+        """
+        Return True if a call may go to the dependency now.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self.clock() >= self._retry_at:
+                self._state = HALF_OPEN
+                self._stats["probes"] += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logging.info(f"{self.name} is reachable again; circuit closed.")
+                self._stats["recoveries"] += 1
+            self._state = CLOSED
+            self._failures = 0
+            self._backoff = self.reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._backoff = min(self._backoff * 2, self.max_reset_timeout)
+            elif self._state == OPEN or self._failures < self.failure_threshold:
+                return
+            else:
+                self._stats["trips"] += 1
+            self._state = OPEN
+            # Half to all of the backoff
+            delay = self._backoff * (0.5 + self.rng.random() / 2)
+            self._retry_at = self.clock() + delay
+            logging.warning(f"{self.name} unavailable after {self._failures} failures; next attempt in {delay:.1f}s.")
+
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def stats(self):
+        """
+        Return the state, trip and rejection counts and the seconds until the next probe.
+        """
+        with self._lock:
+            stats = dict(self._stats, state=self._state, failures=self._failures)
+            stats["retry_in"] = max(self._retry_at - self.clock(), 0.0) if self._state == OPEN else None
+        return stats
@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Compact representation of feature frames, prepared arrays and model inputs.
+# Forests compare their inputs as float32 anyway, so their predictions do not change.
+COMPACT_DTYPE = np.float32
+
+# Relative drift of a float64 value rounded once to float32 (half a unit in the last place).
+# Indicators are still accumulated in float64, so this is the whole error of a compact feature.
+FLOAT32_RTOL = float(np.finfo(np.float32).eps) / 2
+
+
+def compact_frame(frame, dtype=COMPACT_DTYPE):
+    """
+    Copy of `frame` with every float64 column stored as `dtype`.
+
+    Integer, date and text columns keep their type.
+    """
+    columns = frame.select_dtypes(include=[np.float64]).columns
+    return frame.astype({name: dtype for name in columns})
+
+
+def sliding_windows(values, length, dtype=COMPACT_DTYPE):
+    """
+    All windows of `length` consecutive rows, without copying them.
+
+    Args:
+        values (array-like): Rows of features, shape (n_rows, n_features).
+        length (int): Rows per window.
+
+    Returns:
+        np.ndarray: Read-only view of shape (n_rows - length + 1, length, n_features).
+            Only the converted `values` are held in memory, not one copy per window.
+    """
+    values = np.asarray(values, dtype=dtype)
+    if len(values) < length:
+        return np.empty((0, length) + values.shape[1:], dtype=dtype)
+    windows = sliding_window_view(values, length, axis=0)
+    # sliding_window_view puts the window axis last
+    return np.moveaxis(windows, -1, 1)
+
+
+def feature_drift(reference, compact):
+    """
+    Largest relative difference per column between full-precision and compact features.
+
+    Args:
+        reference (dict | pd.DataFrame): Column name to float64 values.
+        compact (dict | pd.DataFrame): The same columns in the compact dtype.
+
+    Returns:
+        dict: Column name to drift; NaN positions must match and are ignored.
+    """
+    drift = {}
+    for name in reference.keys():
+        expected = np.asarray(reference[name], dtype=np.float64)
+        actual = np.asarray(compact[name], dtype=np.float64)
+        if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+            drift[name] = np.inf
+            continue
+        finite = np.isfinite(expected) & (expected != 0)
+        error = np.abs(actual[finite] - expected[finite]) / np.abs(expected[finite])
+        drift[name] = float(error.max()) if error.size else 0.0
+    return drift
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# Inputs of the DriftModel stand-in
+FORECAST_FEATURES = ["Open", "High", "Low", "Close", "Volume", "MA_10", "MA_50", "RSI", "MACD"]
+
+
+class FakeClock:
+    """
+    A clock that only moves when a test sets `now`.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class DriftModel:
+    """
+    Minimal stand-in for a fitted regressor: predicts Close plus a fixed drift.
+    """
+
+    def __init__(self, feature_names, drift):
+        self.feature_names_in_ = np.array(feature_names, dtype=object)
+        self.drift = drift
+
+    def predict(self, rows):
+        rows = np.asarray(rows, dtype=float)
+        return rows[:, list(self.feature_names_in_).index("Close")] + self.drift
+
+
+def build_history(rows, seed=7):
+    """
+    Build a synthetic OHLCV history with the derived columns already filled in.
+    """
+    # Imported here so collecting unrelated tests does not load the API resources
+    from resources.analysis_resource import update_derived_features
+
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, rows))
+    history = pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=rows, freq="B"),
+        "Open": close + rng.normal(0, 0.5, rows),
+        "High": close + np.abs(rng.normal(0, 1, rows)),
+        "Low": close - np.abs(rng.normal(0, 1, rows)),
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, rows).astype(float),
+    })
+    return update_derived_features(history)
+
+
+@pytest.fixture
+def make_history():
+    return build_history
+
+
+@pytest.fixture
+def drift_model():
+    """
+    Factory of DriftModel instances reading FORECAST_FEATURES.
+    """
+    return lambda drift: DriftModel(FORECAST_FEATURES, drift)
@@ -0,0 +1,198 @@
+import os
+import json
+import hashlib
+import logging
+import pandas as pd
+from urllib.parse import unquote
+from datetime import datetime, timezone
+from utils import indicator_engine
+from utils.indicator_engine import PRICE_COLUMNS, DERIVED_COLUMNS, add_indicators_by_ticker
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# Root of the store: one directory per feature version, then hive partitions Ticker=.../year=...
+FEATURE_STORE_DIR = os.environ.get(
+    "FEATURE_STORE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "ml_components", "data", "feature_store")),
+)
+# Warm-up gaps are filled per ticker, as for served data
+FEATURE_STORE_FILL = "ffill"
+MANIFEST_FILE = "manifest.json"
+KEY_COLUMNS = ["Ticker", "Date"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("The feature store requires pyarrow.")
+
+
+def feature_config():
+    """
+    Everything that changes the stored feature values: columns, fill mode and indicator declarations.
+    """
+    return {
+        "columns": DERIVED_COLUMNS,
+        "fill": FEATURE_STORE_FILL,
+        "indicators": indicator_engine.INDICATORS.describe(DERIVED_COLUMNS),
+    }
+
+
+def feature_version(config=None):
+    """
+    Short hash identifying a feature configuration.
+    """
+    payload = json.dumps(feature_config() if config is None else config, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def version_path(version=None, root=FEATURE_STORE_DIR):
+    return os.path.join(root, f"version={version or feature_version()}")
+
+
+def has_version(version=None, root=FEATURE_STORE_DIR):
+    """
+    Whether features for a version (by default the current configuration) have been written and can be read.
+    """
+    return pa is not None and os.path.exists(os.path.join(version_path(version, root), MANIFEST_FILE))
+
+
+def normalize_keys(frame):
+    """
+    Convert the Ticker and Date columns, in place, to the types they are stored with.
+    """
+    frame["Ticker"] = frame["Ticker"].astype(str)
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    if frame["Date"].dt.tz is not None:
+        # Keep the exchange-local trading date
+        frame["Date"] = frame["Date"].dt.tz_localize(None)
+    return frame
+
+
+def compute_features(raw, columns=DERIVED_COLUMNS):
+    """
+    Compute the features of a long-format OHLCV frame as they are stored.
+
+    Indicators are computed per ticker and filled with FEATURE_STORE_FILL,
+    so callers without a stored version get the same values as readers.
+
+    Args:
+        raw (pd.DataFrame): Ticker, Date and OHLCV columns for any number of tickers.
+        columns (list): Derived columns to compute.
+
+    Returns:
+        pd.DataFrame: Key, price and derived columns, sorted by Ticker and Date.
+    """
+    frame = normalize_keys(raw[KEY_COLUMNS + PRICE_COLUMNS].copy())
+    frame = frame.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
+    return add_indicators_by_ticker(frame, columns, fill=FEATURE_STORE_FILL)
+
+
+def write_features(raw, root=FEATURE_STORE_DIR):
+    """
+    Compute the features of a long-format OHLCV frame and write them to the current version.
+
+    Partitions of the tickers in `raw` are replaced; other tickers are kept.
+
+    Args:
+        raw (pd.DataFrame): Ticker, Date and OHLCV columns for any number of tickers.
+
+    Returns:
+        str: The version written.
+    """
+    _require_pyarrow()
+    version = feature_version()
+    path = version_path(version, root)
+
+    frame = compute_features(raw)
+    frame["year"] = frame["Date"].dt.year
+
+    ds.write_dataset(
+        pa.Table.from_pandas(frame, preserve_index=False), path, format="parquet",
+        partitioning=["Ticker", "year"], partitioning_flavor="hive",
+        existing_data_behavior="delete_matching", basename_template="part-{i}.parquet",
+    )
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    tickers = set(frame["Ticker"].unique())
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            tickers |= set(json.load(manifest_file)["tickers"])
+    with open(manifest_path, "w") as manifest_file:
+        json.dump({
+            "version": version,
+            "config": feature_config(),
+            "tickers": sorted(tickers),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }, manifest_file, indent=2)
+
+    logging.info(f"Wrote features of {frame['Ticker'].nunique()} tickers ({len(frame)} rows) to {path}")
+    return version
+
+
+def read_features(tickers=None, columns=None, start=None, end=None, version=None, root=FEATURE_STORE_DIR):
+    """
+    Read stored features, reading only the needed partitions and columns.
+
+    Ticker and year filters prune whole partitions by directory name; the
+    date range is then pushed down to the Parquet row-group statistics.
+
+    Args:
+        tickers (list): Tickers to read (default: all).
+        columns (list): Feature columns to read besides Ticker and Date (default: all).
+        start, end: Inclusive date range.
+        version (str): Feature version (default: the current configuration).
+
+    Returns:
+        pd.DataFrame: Rows sorted by Ticker and Date.
+
+    Raises:
+        FileNotFoundError: If the version has not been written.
+    """
+    _require_pyarrow()
+    path = version_path(version, root)
+    if not has_version(version, root):
+        raise FileNotFoundError(f"No features stored at {path}")
+    if tickers is not None:
+        tickers = {str(ticker) for ticker in tickers}
+
+    if start is not None:
+        start = pd.Timestamp(start)
+    if end is not None:
+        end = pd.Timestamp(end)
+
+    # Prune partitions from the directory names instead of discovering every file
+    files = []
+    for ticker_dir in sorted(os.listdir(path)):
+        # Hive partition values are URL-encoded
+        if not ticker_dir.startswith("Ticker=") or (tickers is not None and unquote(ticker_dir[len("Ticker="):]) not in tickers):
+            continue
+        for year_dir in sorted(os.listdir(os.path.join(path, ticker_dir))):
+            year = int(year_dir[len("year="):])
+            if (start is not None and year < start.year) or (end is not None and year > end.year):
+                continue
+            year_path = os.path.join(path, ticker_dir, year_dir)
+            files.extend(os.path.join(year_path, name) for name in sorted(os.listdir(year_path)))
+
+    projection = KEY_COLUMNS + [name for name in (columns or PRICE_COLUMNS + DERIVED_COLUMNS) if name not in KEY_COLUMNS]
+    if not files:
+        return pd.DataFrame(columns=projection)
+
+    dataset = ds.dataset(files, format="parquet", partitioning="hive", partition_base_dir=path)
+    condition = None
+    if start is not None:
+        condition = ds.field("Date") >= pa.scalar(start.to_datetime64())
+    if end is not None:
+        upper = ds.field("Date") <= pa.scalar(end.to_datetime64())
+        condition = upper if condition is None else condition & upper
+
+    frame = dataset.to_table(columns=projection, filter=condition).to_pandas()
+    frame["Ticker"] = frame["Ticker"].astype(str)
+    return frame.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)
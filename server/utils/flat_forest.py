@@ -0,0 +1,137 @@
+import json
+import numpy as np
+
+# Node index used by scikit-learn to mark a missing child
+TREE_LEAF = -1
+
+# Above this many rows per call the threaded scikit-learn predict is faster
+FLAT_FOREST_MAX_ROWS = 64
+
+
+class FlatForest:
+    """
+    Array-based evaluator for a fitted RandomForestRegressor.
+
+    All trees are flattened into contiguous node arrays (feature, threshold,
+    left/right child, leaf value) with global node indices. Leaves point to
+    themselves, so every row can walk all trees in lock-step for `max_depth`
+    vectorized steps without per-call validation or thread dispatch. This
+    makes single-row and small-batch predictions much cheaper than
+    `RandomForestRegressor.predict`, which is what the recursive forecast
+    loop calls hundreds of times per request.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, feature_names_in_=None):
+        self.feature = np.ascontiguousarray(feature)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left)
+        self.right = np.ascontiguousarray(right)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots)
+        self.max_depth = int(max_depth)
+        self.n_outputs = self.value.shape[1]
+        if feature_names_in_ is not None:
+            self.feature_names_in_ = np.asarray(feature_names_in_, dtype=object)
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Flatten a fitted forest (anything exposing `estimators_` with `tree_`).
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == TREE_LEAF
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(tree.value[:, :, 0])
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        index_dtype = np.int32 if offset < np.iinfo(np.int32).max else np.int64
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(index_dtype),
+            right=np.concatenate(rights).astype(index_dtype),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=index_dtype),
+            max_depth=max_depth,
+            feature_names_in_=getattr(model, "feature_names_in_", None),
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def predict(self, X):
+        """
+        Predict one row or a small batch.
+
+        Args:
+            X (array-like): Shape (n_features,) or (n_rows, n_features).
+
+        Returns:
+            np.ndarray: Shape (n_rows,) for single-output forests, else (n_rows, n_outputs).
+        """
+        # Trees compare float32 inputs against float64 thresholds, as in scikit-learn
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.repeat(self.roots[np.newaxis, :], X.shape[0], axis=0)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        predictions = self.value[nodes].mean(axis=1)
+        return predictions[:, 0] if self.n_outputs == 1 else predictions
+
+    def save(self, path):
+        """
+        Write the flattened arrays to an uncompressed .npz archive.
+        """
+        feature_names = getattr(self, "feature_names_in_", None)
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            max_depth=np.asarray(self.max_depth),
+            feature_names=np.asarray(json.dumps(None if feature_names is None else list(feature_names))),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a forest written by `save`.
+        """
+        with np.load(path) as archive:
+            return cls(
+                feature=archive["feature"],
+                threshold=archive["threshold"],
+                left=archive["left"],
+                right=archive["right"],
+                value=archive["value"],
+                roots=archive["roots"],
+                max_depth=int(archive["max_depth"]),
+                feature_names_in_=json.loads(str(archive["feature_names"])),
+            )
+
+
+def export_flat_forest(model, path):
+    """
+    Flatten a fitted forest and save it next to its joblib artifact.
+    """
+    forest = FlatForest.from_estimator(model)
+    forest.save(path)
+    return forest
@@ -0,0 +1,132 @@
+import numpy as np
+
+# Golden ratio ϕ=(1+√5)/2 used to scale the forecast noise
+GOLDEN_RATIO = 1.6180339887
+MIN_NOISE_SCALE = 0.0000000000016180339887
+DEFAULT_VOLATILITY = 0.01  # Default small volatility for stability
+
+# Quantiles reported for Monte Carlo forecasts
+FORECAST_QUANTILES = {"p5": 5, "p50": 50, "p95": 95}
+
+
+def prepare_input_row(transformed_data, feature_names):
+    """
+    Build the model input for the last row of the transformed history.
+
+    Args:
+        transformed_data (pd.DataFrame): History with derived features.
+        feature_names (list): Feature columns expected by the model.
+
+    Returns:
+        np.ndarray: Array of shape (1, n_features).
+    """
+    input_data = transformed_data.iloc[-1:].drop(columns=["Date"], errors="ignore")
+    input_data = input_data.fillna(input_data.mean())
+    input_data = input_data.reindex(columns=feature_names, fill_value=0)
+    return input_data.to_numpy(dtype=float)
+
+
+def iter_forecast(historical_model, recent_model, input_rows, state, days_out, rng=np.random):
+    """
+    Run the recursive forecast for a batch of series, yielding one day at a time.
+
+    Each step makes a single `predict` call per model on the stacked
+    (n_series, n_features) matrix and draws the noise for every series at
+    once. The noisy historical prediction is fed back as the next Close.
+
+    Args:
+        historical_model: Fitted model trained on the historical timeframe.
+        recent_model: Fitted model trained on the recent timeframe.
+        input_rows (np.ndarray): Initial inputs of shape (n_series, n_features).
+        state (IndicatorState): Batched state with one series per input row
+            (see `IndicatorState.repeat`).
+        days_out (int): Number of days to forecast.
+        rng: NumPy random source (module, RandomState or Generator), or a list
+            with one source per series so each series draws exactly the noise
+            it would draw when forecast on its own.
+
+    Yields:
+        tuple: (historical, recent) arrays of shape (n_series,) for each day.
+    """
+    input_rows = np.array(input_rows, dtype=float)
+    n_series = input_rows.shape[0]
+    feature_index = {name: i for i, name in enumerate(historical_model.feature_names_in_)}
+
+    for _ in range(days_out):
+        # Predict the next close price
+        next_close_historical = np.asarray(historical_model.predict(input_rows), dtype=float)
+        next_close_recent = np.asarray(recent_model.predict(input_rows), dtype=float)
+
+        # Noise follows the 90-day (1 fiscal quarter) rolled volatility of each series
+        volatility = state.close_volatility()
+        volatility = np.where(np.isnan(volatility) | (volatility == 0), DEFAULT_VOLATILITY, volatility)
+
+        scale_factor_historical = _draw(rng, "uniform", MIN_NOISE_SCALE, np.ones(n_series))
+        scale_factor_recent = _draw(rng, "uniform", MIN_NOISE_SCALE, np.ones(n_series))
+
+        noise_historical = _draw(rng, "normal", 0, scale_factor_historical * (volatility / GOLDEN_RATIO ** 2))
+        noise_recent = _draw(rng, "normal", 0, scale_factor_recent * (volatility / GOLDEN_RATIO ** 2))
+
+        next_close_historical = next_close_historical + noise_historical
+        next_close_recent = next_close_recent + noise_recent
+
+        yield next_close_historical, next_close_recent
+
+        # Update input data for the next prediction
+        if "Close" in feature_index:
+            input_rows[:, feature_index["Close"]] = next_close_historical
+        for name, value in state.advance(next_close_historical).items():
+            if name in feature_index:
+                input_rows[:, feature_index[name]] = value
+        input_rows[np.isnan(input_rows)] = 0
+
+
+def _draw(rng, method, first, second):
+    """
+    Draw one value per series from `rng.<method>(first, second)`.
+
+    `second` holds one parameter per series; with a list of sources each
+    series draws from its own one.
+    """
+    if isinstance(rng, (list, tuple)):
+        return np.array([getattr(source, method)(first, value, size=1)[0] for source, value in zip(rng, second)])
+    return getattr(rng, method)(first, second)
+
+
+def forecast_bands(historical_model, recent_model, input_row, state, days_out, paths, rng=np.random):
+    """
+    Move `paths` Monte Carlo paths forward together and summarise them per day.
+
+    Args:
+        input_row (np.ndarray): Model input of shape (1, n_features).
+        state (IndicatorState): Single-series state seeded from the history.
+        paths (int): Number of paths to simulate.
+
+    Returns:
+        dict: For "historical" and "recent", the per-day mean and p5/p50/p95 quantiles.
+    """
+    input_rows = np.repeat(np.asarray(input_row, dtype=float).reshape(1, -1), paths, axis=0)
+    batched_state = state.repeat(paths)
+
+    historical = np.empty((days_out, paths))
+    recent = np.empty((days_out, paths))
+    steps = iter_forecast(historical_model, recent_model, input_rows, batched_state, days_out, rng)
+    for day, (next_historical, next_recent) in enumerate(steps):
+        historical[day] = next_historical
+        recent[day] = next_recent
+
+    return {
+        "historical": summarize_paths(historical),
+        "recent": summarize_paths(recent),
+    }
+
+
+def summarize_paths(values):
+    """
+    Reduce a (days, paths) matrix to the per-day mean and quantiles.
+    """
+    summary = {"mean": values.mean(axis=1).tolist()}
+    quantiles = np.percentile(values, list(FORECAST_QUANTILES.values()), axis=1)
+    for name, row in zip(FORECAST_QUANTILES, quantiles):
+        summary[name] = row.tolist()
+    return summary
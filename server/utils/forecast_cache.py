@@ -0,0 +1,81 @@
+import hashlib
+import logging
+import pandas as pd
+from utils.redis_helper import get_from_cache, set_to_cache
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# Namespace of cached single-path forecasts
+FORECAST_CACHE_PREFIX = "market_ai:predictions"
+FORECAST_CACHE_EXPIRY = 86400  # 24 hours
+
+# Seeds are drawn from [0, 2**32) so they can seed a NumPy RandomState
+MAX_SEED = 2 ** 32
+
+
+def last_bar_date(transformed_data):
+    """
+    Return the date of the last daily bar as YYYY-MM-DD.
+    """
+    if "Date" in transformed_data.columns:
+        value = transformed_data["Date"].iloc[-1]
+    else:
+        value = transformed_data.index[-1]
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def models_version(*checksums):
+    """
+    Combine the checksums of the models used for a forecast into one short version tag.
+    """
+    return hashlib.sha256("|".join(checksums).encode()).hexdigest()[:16]
+
+
+def default_seed(stock_name, last_bar):
+    """
+    Derive a stable noise seed for a ticker and its last bar.
+
+    Repeated requests on the same day then share one cached forecast, and a
+    new bar yields a fresh noise sequence.
+    """
+    digest = hashlib.sha256(f"{stock_name}:{last_bar}".encode()).hexdigest()
+    return int(digest[:8], 16) % MAX_SEED
+
+
+def forecast_cache_key(stock_name, version, last_bar, seed):
+    """
+    Key of the longest forecast computed for a ticker, model version, last bar and seed.
+
+    A new daily bar or model artifact changes the key, so stale entries are
+    never read again and simply expire.
+    """
+    return f"{FORECAST_CACHE_PREFIX}:{stock_name}:{version}:{last_bar}:{seed}"
+
+
+def get_cached_forecast(key, days_out):
+    """
+    Serve a forecast of `days_out` days by slicing a cached longer one.
+
+    Returns:
+        dict or None: "historical" and "recent" lists, or None if nothing long enough is cached.
+    """
+    entry = get_from_cache(key)
+    if entry is None or entry["days_out"] < days_out:
+        return None
+    return {
+        "historical": entry["historical"][:days_out],
+        "recent": entry["recent"][:days_out],
+    }
+
+
+def store_forecast(key, historical, recent, ttl=FORECAST_CACHE_EXPIRY):
+    """
+    Cache a forecast unless a longer one is already stored under the same key.
+
+    Forecasts with the same seed share their prefix, so only the longest one is kept.
+    """
+    existing = get_from_cache(key)
+    if existing is not None and existing["days_out"] >= len(historical):
+        return
+    set_to_cache(key, {"days_out": len(historical), "historical": historical, "recent": recent}, ttl=ttl)
@@ -0,0 +1,144 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from config import redis_client
+from utils.redis_helper import CacheUnavailableError, call_redis
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# One Redis hash per ticker holding the nightly forecast as packed float32 arrays
+FORECAST_TABLE_PREFIX = "market_ai:forecast_table"
+FORECAST_TABLE_DAYS = 180
+FORECAST_TABLE_DTYPE = np.float32
+# Long enough to survive a weekend between two weekday runs
+FORECAST_TABLE_EXPIRY = 4 * 86400
+# Rows written before the latest regular-session close are stale (holidays are not
+# known, so the day after one falls back to live forecasts until the nightly run)
+MARKET_TIMEZONE = "America/New_York"
+MARKET_CLOSE = "16:00"
+
+
+def forecast_table_key(ticker):
+    """
+    Generate the Redis key of a ticker's precomputed forecast.
+    """
+    return f"{FORECAST_TABLE_PREFIX}:{ticker}"
+
+
+def last_session_close(now=None):
+    """
+    Return the latest weekday market close at or before `now` (default: the current time).
+    """
+    now = pd.Timestamp.now(tz=MARKET_TIMEZONE) if now is None else pd.Timestamp(now).tz_convert(MARKET_TIMEZONE)
+    close = now.normalize() + pd.Timedelta(MARKET_CLOSE + ":00")
+    if close > now:
+        close -= pd.Timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= pd.Timedelta(days=1)
+    return close
+
+
+def is_current(meta, now=None):
+    """
+    Return True if a row was generated after the latest market close, so no newer bar exists.
+    """
+    generated_at = meta.get("generated_at")
+    return generated_at is not None and pd.Timestamp(generated_at) >= last_session_close(now)
+
+
+def write_forecast_rows(rows, ttl=FORECAST_TABLE_EXPIRY, now=None):
+    """
+    Store precomputed forecasts for several tickers in a single round trip.
+
+    Parameters:
+        rows (dict): Ticker to a dict with "historical" and "recent" arrays and a "meta" dict.
+        ttl (int): Expiry of each row in seconds.
+        now (Timestamp): Generation time recorded in each row's meta (default: the current time).
+    """
+    generated_at = (pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)).isoformat()
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for ticker, row in rows.items():
+            key = forecast_table_key(ticker)
+            meta = dict(row["meta"], days_out=len(row["historical"]), generated_at=generated_at)
+            pipeline.hset(key, mapping={
+                "historical": np.asarray(row["historical"], dtype=FORECAST_TABLE_DTYPE).tobytes(),
+                "recent": np.asarray(row["recent"], dtype=FORECAST_TABLE_DTYPE).tobytes(),
+                "meta": json.dumps(meta),
+            })
+            pipeline.expire(key, ttl)
+        call_redis(pipeline.execute, f"write of {len(rows)} forecast table rows")
+        logging.info(f"Wrote {len(rows)} forecast table rows with TTL: {ttl}")
+    except Exception as e:
+        logging.error(f"Error writing forecast table rows: {e}")
+        raise RuntimeError(f"Redis forecast table write error: {e}")
+
+
+def _parse_forecast_row(row, days_out=None):
+    """
+    Unpack a row read with HGETALL; None if it is missing or shorter than `days_out`.
+    """
+    if not row:
+        return None
+
+    meta = json.loads(row[b"meta"])
+    if days_out is not None and meta["days_out"] < days_out:
+        return None
+
+    return {
+        "historical": np.frombuffer(row[b"historical"], dtype=FORECAST_TABLE_DTYPE)[:days_out].tolist(),
+        "recent": np.frombuffer(row[b"recent"], dtype=FORECAST_TABLE_DTYPE)[:days_out].tolist(),
+        "meta": meta,
+    }
+
+
+def read_forecast_row(ticker, days_out=None):
+    """
+    Read a ticker's precomputed forecast, optionally sliced to the first `days_out` days.
+
+    Returns:
+        dict or None: "historical" and "recent" float lists plus "meta", or None
+        when no row is stored, it is shorter than `days_out` or Redis is unavailable.
+    """
+    try:
+        row = call_redis(lambda: redis_client.hgetall(forecast_table_key(ticker)), f"forecast table row of {ticker}")
+    except CacheUnavailableError as e:
+        logging.warning(f"Forecast table unavailable for {ticker}: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"Error reading forecast table row for {ticker}: {e}")
+        raise RuntimeError(f"Redis forecast table read error: {e}")
+
+    if not row:
+        logging.info(f"Forecast table miss for ticker: {ticker}")
+    return _parse_forecast_row(row, days_out)
+
+
+def read_forecast_rows(tickers, days_out=None):
+    """
+    Read the precomputed forecasts of several tickers in a single round trip.
+
+    Parameters:
+        tickers (list): Tickers to read.
+        days_out (int): Slice every row like read_forecast_row.
+
+    Returns:
+        dict: Ticker to the row read_forecast_row would return (None on a miss).
+    """
+    tickers = list(dict.fromkeys(tickers))
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for ticker in tickers:
+            pipeline.hgetall(forecast_table_key(ticker))
+        rows = call_redis(pipeline.execute, f"{len(tickers)} forecast table rows")
+    except CacheUnavailableError as e:
+        logging.warning(f"Forecast table unavailable for {len(tickers)} tickers: {e}")
+        return dict.fromkeys(tickers)
+    except Exception as e:
+        logging.error(f"Error reading {len(tickers)} forecast table rows: {e}")
+        raise RuntimeError(f"Redis forecast table read error: {e}")
+
+    logging.info(f"Read {sum(1 for row in rows if row)} of {len(tickers)} forecast table rows")
+    return {ticker: _parse_forecast_row(row, days_out) for ticker, row in zip(tickers, rows)}
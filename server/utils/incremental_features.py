@@ -0,0 +1,346 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.redis_helper import get_from_cache, set_to_cache
+from utils.indicator_engine import (
+    PRICE_COLUMNS, DERIVED_COLUMNS, MA_LONG_WINDOW, EMA_SHORT_SPAN, EMA_LONG_SPAN, MACD_FAST_SPAN,
+    MACD_SLOW_SPAN, MACD_SIGNAL_SPAN, PSAR_STEP, add_indicators, compute_indicators, ema,
+    on_balance_volume, signed_volume, continue_parabolic_sar, forward_fill, session_vwap,
+)
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# Full history plus carry state per ticker; outlives the 24h transformed-data cache
+MATERIALIZED_PREFIX = "market_ai:stock_data:materialized"
+MATERIALIZED_EXPIRY = 30 * 86400
+
+# Raw bars kept around the end of the history to recompute window indicators
+TAIL_ROWS = MA_LONG_WINDOW
+# Indicators that depend on the whole history and are continued from a carry
+CARRIED_COLUMNS = ["EMA_10", "EMA_50", "MACD", "MACD_Signal", "MACD_Hist", "Parabolic_SAR", "OBV", "VWAP"]
+# Relative change of an already stored bar treated as a restatement (splits, dividends)
+RESTATEMENT_RTOL = 1e-9
+CONSISTENCY_RTOL = 1e-9
+
+
+def materialized_key(symbol):
+    """
+    Redis key of a ticker's materialized feature history.
+    """
+    return f"{MATERIALIZED_PREFIX}:{symbol}"
+
+
+def _carry_from(raw, sessions=None):
+    """
+    State of the carried indicators at the last bar of `raw`, or None.
+
+    With `sessions`, the VWAP sums cover only the last session.
+    """
+    prices = {name: raw[name].to_numpy(dtype=float) for name in PRICE_COLUMNS}
+    if len(raw) < TAIL_ROWS or not all(np.isfinite(values).all() for values in prices.values()):
+        return None
+
+    close = prices["Close"]
+    ema_fast = ema(close, MACD_FAST_SPAN)
+    ema_slow = ema(close, MACD_SLOW_SPAN)
+    rising = bool(close[0] > prices["Open"][0])
+    _, psar_state = continue_parabolic_sar(
+        prices["High"], prices["Low"], close,
+        (close[0], rising, prices["High"][0] if rising else prices["Low"][0], PSAR_STEP),
+    )
+    carry = {
+        "ema_10": ema(close, EMA_SHORT_SPAN)[-1],
+        "ema_50": ema(close, EMA_LONG_SPAN)[-1],
+        "ema_fast": ema_fast[-1],
+        "ema_slow": ema_slow[-1],
+        "macd_signal": ema(ema_fast - ema_slow, MACD_SIGNAL_SPAN)[-1],
+        "obv": on_balance_volume(close, prices["Volume"])[-1],
+        "psar": psar_state,
+    }
+    if sessions is None:
+        typical_volume = (close + prices["High"] + prices["Low"]) / 3 * prices["Volume"]
+        carry["typical_volume_sum"] = np.cumsum(typical_volume)[-1]
+        carry["volume_sum"] = np.cumsum(prices["Volume"])[-1]
+    else:
+        _, (carry["session"], carry["typical_volume_sum"], carry["volume_sum"]) = session_vwap(
+            prices["High"], prices["Low"], close, prices["Volume"], sessions,
+        )
+    return carry
+
+
+def _continue_features(tail, carry, previous, new_raw, columns, sessions=None):
+    """
+    Transform bars that directly follow `tail`, continuing from `carry`.
+
+    Args:
+        tail (pd.DataFrame): The last TAIL_ROWS raw bars before `new_raw`.
+        carry (dict): State of the carried indicators at the last bar of `tail`.
+        previous (pd.Series): Last transformed row, to forward fill from.
+        new_raw (pd.DataFrame): New bars with the columns of `tail` and finite prices.
+        columns (list): Derived columns, in the order they are added.
+        sessions (np.ndarray): Session of every new bar for a session-anchored
+            VWAP; None continues the cumulative VWAP.
+
+    Returns:
+        tuple: (transformed rows, carry state at their last bar).
+    """
+    count = len(new_raw)
+    context = pd.concat([tail, new_raw], ignore_index=True)
+    prices = {name: context[name].to_numpy(dtype=float) for name in PRICE_COLUMNS}
+    new = {name: values[-count:] for name, values in prices.items()}
+    carry = dict(carry)
+    values = {}
+
+    # Window indicators only look back TAIL_ROWS bars
+    window_columns = [name for name in columns if name not in CARRIED_COLUMNS]
+    for name, column in compute_indicators(prices, window_columns).items():
+        values[name] = column[-count:]
+
+    close = new["Close"]
+    values["EMA_10"] = ema(close, EMA_SHORT_SPAN, carry["ema_10"])
+    values["EMA_50"] = ema(close, EMA_LONG_SPAN, carry["ema_50"])
+    ema_fast = ema(close, MACD_FAST_SPAN, carry["ema_fast"])
+    ema_slow = ema(close, MACD_SLOW_SPAN, carry["ema_slow"])
+    macd = ema_fast - ema_slow
+    signal = ema(macd, MACD_SIGNAL_SPAN, carry["macd_signal"])
+    values["MACD"] = macd
+    values["MACD_Signal"] = signal
+    values["MACD_Hist"] = macd - signal
+
+    # Running totals continue from the carried sums, in the same summation order
+    steps = signed_volume(prices["Close"][-count - 1:], prices["Volume"][-count - 1:])
+    values["OBV"] = np.cumsum(np.concatenate([[carry["obv"]], steps]))[1:]
+    if sessions is None:
+        typical_volume = (close + new["High"] + new["Low"]) / 3 * new["Volume"]
+        typical_volume_sums = np.cumsum(np.concatenate([[carry["typical_volume_sum"]], typical_volume]))[1:]
+        volume_sums = np.cumsum(np.concatenate([[carry["volume_sum"]], new["Volume"]]))[1:]
+        values["VWAP"] = typical_volume_sums / volume_sums
+        carry["typical_volume_sum"] = typical_volume_sums[-1]
+        carry["volume_sum"] = volume_sums[-1]
+    else:
+        values["VWAP"], (carry["session"], carry["typical_volume_sum"], carry["volume_sum"]) = session_vwap(
+            new["High"], new["Low"], close, new["Volume"], sessions,
+            (carry["session"], carry["typical_volume_sum"], carry["volume_sum"]),
+        )
+
+    psar, carry["psar"] = continue_parabolic_sar(
+        prices["High"][-count - 1:], prices["Low"][-count - 1:], prices["Close"][-count - 1:], carry["psar"],
+    )
+    values["Parabolic_SAR"] = psar[1:]
+
+    carry.update({
+        "ema_10": values["EMA_10"][-1], "ema_50": values["EMA_50"][-1],
+        "ema_fast": ema_fast[-1], "ema_slow": ema_slow[-1], "macd_signal": signal[-1],
+        "obv": values["OBV"][-1],
+    })
+
+    rows = new_raw.copy()
+    for name in columns:
+        rows[name] = values[name]
+    # Forward fill from the previous transformed row
+    for name in rows.select_dtypes(include=[np.number]).columns:
+        column = rows[name].to_numpy(dtype=float)
+        if np.isnan(column).any():
+            rows[name] = forward_fill(np.concatenate([[float(previous[name])], column]))[1:]
+    return rows, carry
+
+
+class FeatureStream:
+    """
+    Transforms consecutive batches of bars with bounded memory.
+
+    Between batches only the last TAIL_ROWS raw bars, the carry state and the
+    last transformed row are kept, so every batch costs time and memory linear
+    in its own length. The first batch is transformed as `transform_data`
+    does (its leading gap is back filled) and must have at least TAIL_ROWS
+    bars; later batches continue as `MaterializedFeatures.extend` does. With
+    `session_column`, VWAP restarts at every session instead of accumulating
+    over the whole history.
+    """
+
+    def __init__(self, columns=DERIVED_COLUMNS, session_column=None, sessions=None):
+        """
+        Args:
+            columns (list): Derived columns, in the order they are added.
+            session_column (str): Column the sessions of the bars are read from.
+            sessions (callable): Maps that column to an array of session ids.
+        """
+        self.columns = list(columns)
+        self.session_column = session_column
+        self.sessions = sessions
+        self.tail = None
+        self.carry = None
+        self.previous = None
+
+    def push(self, raw):
+        """
+        Transform the next batch of bars.
+
+        Returns:
+            pd.DataFrame: The transformed batch, with a fresh index.
+
+        Raises:
+            ValueError: If the previous batches cannot be continued.
+        """
+        raw = raw.reset_index(drop=True)
+        if raw.empty:
+            return raw
+        sessions = None if self.session_column is None else self.sessions(raw[self.session_column])
+
+        if self.tail is None:
+            rows = add_indicators(raw.copy(), self.columns, fill=None)
+            if sessions is not None and "VWAP" in self.columns:
+                rows["VWAP"], _ = session_vwap(
+                    *(raw[name].to_numpy(dtype=float) for name in ("High", "Low", "Close", "Volume")), sessions,
+                )
+            rows = add_indicators(rows, [], fill="ffill")
+            carry = _carry_from(raw, sessions)
+        elif self.carry is None:
+            raise ValueError("Bars with missing prices or a first batch shorter than TAIL_ROWS cannot be continued.")
+        else:
+            if not np.isfinite(raw[PRICE_COLUMNS].to_numpy(dtype=float)).all():
+                raise ValueError("New bars have missing prices.")
+            rows, carry = _continue_features(self.tail, self.carry, self.previous, raw, self.columns, sessions)
+
+        self.tail = pd.concat([self.tail, raw], ignore_index=True).iloc[-TAIL_ROWS:]
+        self.carry = carry
+        self.previous = rows.iloc[-1]
+        return rows
+
+
+class MaterializedFeatures:
+    """
+    A ticker's raw and transformed daily history, extended one batch of new bars at a time.
+
+    Window indicators of new bars are recomputed from the last TAIL_ROWS raw
+    bars; indicators that depend on the whole history continue from carried
+    state (EMA values, the OBV total, the VWAP sums and the Parabolic SAR
+    trend, extreme point and acceleration factor). New rows are forward
+    filled from the previous row, as `transform_data` does. Histories with
+    missing prices are not extended and must be rebuilt. Only final bars
+    are stored: a bar of a session still open would differ from its final
+    version and be taken for a restatement (see `preview`).
+    """
+
+    def __init__(self, raw, transformed, columns, carry):
+        self.raw = raw
+        self.transformed = transformed
+        self.columns = list(columns)
+        self.carry = carry
+
+    @classmethod
+    def build(cls, raw, columns=DERIVED_COLUMNS):
+        """
+        Transform a full raw history and capture the carry state at its last bar.
+
+        Args:
+            raw (pd.DataFrame): Date and OHLCV columns, oldest bar first.
+            columns (list): Derived columns, in the order they are added.
+        """
+        if raw.empty:
+            raise ValueError("Cannot materialize features from empty data.")
+
+        raw = raw.reset_index(drop=True)
+        transformed = add_indicators(raw.copy(), columns, fill="ffill")
+        return cls(raw, transformed, columns, _carry_from(raw))
+
+    @property
+    def last_date(self):
+        return self.raw["Date"].iloc[-1]
+
+    def extend(self, new_raw):
+        """
+        Append the bars of `new_raw` that are newer than the history.
+
+        `new_raw` may start with the last stored bar; if that bar changed,
+        the history was restated and must be rebuilt instead.
+
+        Returns:
+            int: Number of appended rows.
+
+        Raises:
+            ValueError: If the history cannot be extended incrementally.
+        """
+        if self.carry is None:
+            raise ValueError("History has missing prices or is too short to extend.")
+
+        new_raw = new_raw[self.raw.columns]
+        overlap = new_raw[new_raw["Date"] == self.last_date]
+        if not overlap.empty:
+            stored = self.raw.iloc[-1][PRICE_COLUMNS].to_numpy(dtype=float)
+            if not np.allclose(overlap.iloc[0][PRICE_COLUMNS].to_numpy(dtype=float), stored, rtol=RESTATEMENT_RTOL, atol=0):
+                raise ValueError(f"Bar of {self.last_date} was restated.")
+
+        new_raw = new_raw[new_raw["Date"] > self.last_date].reset_index(drop=True)
+        if new_raw.empty:
+            return 0
+        if not np.isfinite(new_raw[PRICE_COLUMNS].to_numpy(dtype=float)).all():
+            raise ValueError("New bars have missing prices.")
+
+        rows = self._transform_new(new_raw)
+        self.raw = pd.concat([self.raw, new_raw], ignore_index=True)
+        self.transformed = pd.concat([self.transformed, rows], ignore_index=True)
+        return len(new_raw)
+
+    def preview(self, pending_raw):
+        """
+        Raw and transformed history with bars that are not final yet, such as
+        today's bar during market hours, appended without being stored.
+
+        Returns:
+            tuple: (raw, transformed) frames; the history itself is unchanged.
+        """
+        pending_raw = pending_raw[self.raw.columns]
+        pending_raw = pending_raw[pending_raw["Date"] > self.last_date].reset_index(drop=True)
+        if pending_raw.empty:
+            return self.raw, self.transformed
+
+        raw = pd.concat([self.raw, pending_raw], ignore_index=True)
+        if self.carry is None or not np.isfinite(pending_raw[PRICE_COLUMNS].to_numpy(dtype=float)).all():
+            return raw, add_indicators(raw.copy(), self.columns, fill="ffill")
+        rows, _ = _continue_features(
+            self.raw.iloc[-TAIL_ROWS:], self.carry, self.transformed.iloc[-1], pending_raw, self.columns,
+        )
+        return raw, pd.concat([self.transformed, rows], ignore_index=True)
+
+    def _transform_new(self, new_raw):
+        rows, self.carry = _continue_features(
+            self.raw.iloc[-TAIL_ROWS:], self.carry, self.transformed.iloc[-1], new_raw, self.columns,
+        )
+        return rows
+
+    def verify(self, rtol=CONSISTENCY_RTOL):
+        """
+        Compare the materialized history with a full recompute.
+
+        Returns:
+            dict: "consistent" flag and the largest absolute difference per mismatching column.
+        """
+        expected = add_indicators(self.raw.copy(), self.columns, fill="ffill")
+        mismatches = {}
+        for name in expected.select_dtypes(include=[np.number]).columns:
+            actual_values = self.transformed[name].to_numpy(dtype=float)
+            expected_values = expected[name].to_numpy(dtype=float)
+            if not np.allclose(actual_values, expected_values, rtol=rtol, atol=0, equal_nan=True):
+                mismatches[name] = float(np.nanmax(np.abs(actual_values - expected_values)))
+        return {"consistent": not mismatches, "rows": len(expected), "mismatches": mismatches}
+
+    def to_dict(self):
+        return {"raw": self.raw, "transformed": self.transformed, "columns": self.columns, "carry": self.carry}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["raw"], state["transformed"], state["columns"], state["carry"])
+
+
+def load_materialized(symbol):
+    """
+    Return a ticker's stored MaterializedFeatures, or None.
+    """
+    state = get_from_cache(materialized_key(symbol))
+    return None if state is None else MaterializedFeatures.from_dict(state)
+
+
+def store_materialized(symbol, materialized, ttl=MATERIALIZED_EXPIRY):
+    set_to_cache(materialized_key(symbol), materialized.to_dict(), ttl=ttl)
@@ -0,0 +1,741 @@
+import sys
+import warnings
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from utils.indicator_registry import IndicatorRegistry
+
+try:
+    # Optional JIT backend for the Parabolic SAR loop
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Raw OHLCV inputs of every indicator
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Columns recomputed by the forecast loop on every new row
+FORECAST_COLUMNS = [
+    "MA_10", "MA_50", "Volatility", "RSI", "MACD", "MACD_Signal",
+    "BB_Lower", "BB_Middle", "BB_Upper", "Williams %R",
+]
+
+# Ways to fill the warm-up gaps of rolling indicators
+FILL_MODES = (None, "ffill", "ffill_zero", "mean")
+
+# Indicator parameters
+MA_SHORT_WINDOW = 10
+MA_LONG_WINDOW = 50
+VOLATILITY_WINDOW = 10
+RSI_WINDOW = 14
+STOCHASTIC_WINDOW = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2
+EMA_SHORT_SPAN = 10
+EMA_LONG_SPAN = 50
+MACD_FAST_SPAN = 12
+MACD_SLOW_SPAN = 26
+MACD_SIGNAL_SPAN = 9
+PSAR_STEP = 0.02
+PSAR_MAX_STEP = 0.2
+STOCHASTIC_SMOOTHING = 3  # pandas_ta's %K smoothing (STOCHk_14_3_3)
+
+
+def rolling_window(values, window, reducer, **kwargs):
+    """
+    Apply `reducer` over trailing windows along the last axis.
+
+    The first `window - 1` entries are NaN, and any NaN inside a window makes
+    its result NaN, as with pandas' rolling(window) defaults.
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        windows = sliding_window_view(values, window, axis=-1)
+        result[..., window - 1:] = reducer(windows, axis=-1, **kwargs)
+    return result
+
+
+def rolling_mean(values, window):
+    return rolling_window(values, window, np.mean)
+
+
+def rolling_std(values, window, ddof=1):
+    return rolling_window(values, window, np.std, ddof=ddof)
+
+
+def rolling_max(values, window):
+    return rolling_window(values, window, np.max)
+
+
+def rolling_min(values, window):
+    return rolling_window(values, window, np.min)
+
+
+def ema(values, span, initial=None):
+    """
+    Exponential moving average along the last axis, as `ewm(span, adjust=False).mean()`.
+
+    With `initial` (the average at the previous bar), the series continues an
+    earlier run instead of starting from its first value.
+    """
+    alpha = 2.0 / (span + 1.0)
+    if values.shape[-1] == 0:
+        return values.copy()
+    if initial is not None:
+        initial = (1.0 - alpha) * np.asarray(initial, dtype=float)[..., None]
+        result, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=-1, zi=initial)
+        return result
+    finite = np.isfinite(values)
+    if not (finite[..., 1:] <= finite[..., :-1]).all():
+        # pandas carries the average across gaps; only needed for incomplete data.
+        # Trailing padding (see pack_by_ticker) never reaches earlier values.
+        rows = values.reshape(-1, values.shape[-1])
+        result = [pd.Series(row).ewm(span=span, adjust=False).mean().to_numpy() for row in rows]
+        return np.asarray(result).reshape(values.shape)
+    # y[t] = (1 - alpha) * y[t-1] + alpha * x[t], started at y[0] = x[0]
+    initial = (1.0 - alpha) * values[..., :1]
+    result, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=-1, zi=initial)
+    return result
+
+
+def cumsum_skipna(values):
+    """
+    Cumulative sum along the last axis that skips NaN but keeps it in place, like pandas.
+    """
+    result = np.nancumsum(values, axis=-1)
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+def on_balance_volume(close, volume):
+    """
+    On-balance volume starting at 0, as a cumulative sum of signed volumes.
+
+    Volume is added on up closes, subtracted on down closes and ignored on
+    unchanged ones. Integer volumes sum exactly in float64 up to 2**53.
+    """
+    start = np.zeros(close.shape[:-1] + (1,))
+    return np.concatenate([start, np.cumsum(signed_volume(close, volume), axis=-1)], axis=-1)
+
+
+def signed_volume(close, volume):
+    """
+    Per-bar OBV steps from the second bar on: +volume, -volume or 0 depending on the close change.
+    """
+    change = np.diff(close, axis=-1)
+    return np.where(change > 0, volume[..., 1:], np.where(change < 0, -volume[..., 1:], 0.0))
+
+
+def _parabolic_sar_kernel(high, low, psar, rising, ep, af, step, max_step):
+    """
+    Parabolic SAR recurrence, written in place into `psar` from index 1 on.
+
+    `psar[0]` and the trend, extreme point and acceleration factor describe
+    the state at the first bar. Returns the state at the last bar.
+
+    Only uses indexing and scalar arithmetic so the same source runs on
+    Python lists and, compiled by numba, on NumPy arrays.
+    """
+    for i in range(1, len(psar)):
+        value = psar[i - 1] + af * (ep - psar[i - 1])
+        if rising:
+            if low[i] < value:
+                rising = False
+                value = ep
+                ep = low[i]
+                af = step
+            elif high[i] > ep:
+                ep = high[i]
+                af = min(af + step, max_step)
+        else:
+            if high[i] > value:
+                rising = True
+                value = ep
+                ep = high[i]
+                af = step
+            elif low[i] < ep:
+                ep = low[i]
+                af = min(af + step, max_step)
+        psar[i] = value
+    return rising, ep, af
+
+
+if njit is not None:
+    _parabolic_sar_jit = njit(cache=True)(_parabolic_sar_kernel)
+else:
+    _parabolic_sar_jit = None
+
+
+def parabolic_sar(open_, high, low, close, step=PSAR_STEP, max_step=PSAR_MAX_STEP, backend="auto"):
+    """
+    Parabolic SAR seeded from the first close; the trend starts rising if the first bar closed up.
+
+    Args:
+        backend (str): "jit" to require numba, "python" for the interpreter
+            loop, or "auto" to use numba when it is installed. Both give
+            bit-identical results.
+    """
+    if close.ndim > 1:
+        rows = [
+            parabolic_sar(o, h, l, c, step, max_step, backend)
+            for o, h, l, c in zip(*(a.reshape(-1, a.shape[-1]) for a in (open_, high, low, close)))
+        ]
+        return np.asarray(rows, dtype=float).reshape(close.shape)
+
+    if close.size == 0:
+        return close.astype(float)
+    rising = bool(close[0] > open_[0])
+    state = (float(close[0]), rising, float(high[0] if rising else low[0]), step)
+    psar, _ = continue_parabolic_sar(high, low, close, state, step, max_step, backend)
+    return psar
+
+
+def continue_parabolic_sar(high, low, close, state, step=PSAR_STEP, max_step=PSAR_MAX_STEP, backend="auto"):
+    """
+    Run the Parabolic SAR over single-series bars, starting from the state at the first bar.
+
+    Args:
+        high, low, close (np.ndarray): Bars, the first being the one `state` describes.
+        state (tuple): (psar, rising, extreme point, acceleration factor) at the first bar.
+
+    Returns:
+        tuple: (SAR of every bar, state at the last bar).
+    """
+    if backend not in ("auto", "jit", "python"):
+        raise ValueError(f"Unknown Parabolic SAR backend: {backend}")
+    if backend == "jit" and _parabolic_sar_jit is None:
+        raise RuntimeError("The jit backend requires numba.")
+
+    value, rising, ep, af = state
+    if _parabolic_sar_jit is not None and backend != "python":
+        psar = np.array(close, dtype=float)
+        psar[0] = value
+        rising, ep, af = _parabolic_sar_jit(
+            np.asarray(high, dtype=float), np.asarray(low, dtype=float), psar, rising, ep, af, step, max_step
+        )
+        return psar, (float(psar[-1]), bool(rising), float(ep), float(af))
+
+    # Python floats index far faster than NumPy scalars
+    psar = np.asarray(close, dtype=float).tolist()
+    psar[0] = value
+    rising, ep, af = _parabolic_sar_kernel(high.tolist(), low.tolist(), psar, rising, ep, af, step, max_step)
+    return np.asarray(psar), (psar[-1], rising, ep, af)
+
+
+def price_change(values):
+    return np.diff(values, axis=-1, prepend=np.nan)
+
+
+def gains(change):
+    return np.where(change > 0, change, 0.0)
+
+
+def losses(change):
+    return np.where(change < 0, -change, 0.0)
+
+
+def difference(minuend, subtrahend):
+    return minuend - subtrahend
+
+
+def relative_strength_index(average_gain, average_loss):
+    rs = average_gain / average_loss
+    return 100 - (100 / (1 + rs))
+
+
+def stochastic_oscillator(close, lowest_low, highest_high):
+    return 100 * (close - lowest_low) / (highest_high - lowest_low)
+
+
+def williams_r(close, lowest_low, highest_high):
+    return -100 * (highest_high - close) / (highest_high - lowest_low)
+
+
+def bollinger_band(middle, std, width):
+    """
+    Band `width` standard deviations above (or, when negative, below) the middle band.
+    """
+    return middle + width * std
+
+
+def volume_weighted_average_price(high, low, close, volume):
+    """
+    Cumulative VWAP of the typical price since the first bar.
+    """
+    typical_volume = (close + high + low) / 3 * volume
+    return cumsum_skipna(typical_volume) / cumsum_skipna(volume)
+
+
+def session_vwap(high, low, close, volume, sessions, initial=None):
+    """
+    VWAP of the typical price, restarted at the first bar of every session.
+
+    Args:
+        high, low, close, volume (np.ndarray): Single-series bars.
+        sessions (np.ndarray): Session of every bar (e.g. the exchange-local
+            trading day); bars of a session must be consecutive.
+        initial (tuple): (session, typical volume sum, volume sum) at the
+            previous bar. The sums continue when the first bar belongs to the
+            same session, so a history split into chunks gives the same result.
+
+    Returns:
+        tuple: (VWAP of every bar, (session, typical volume sum, volume sum) at the last bar).
+    """
+    typical_volume = (close + high + low) / 3 * volume
+    vwap = np.full(len(close), np.nan)
+    if len(close) == 0:
+        return vwap, initial
+
+    boundaries = np.flatnonzero(sessions[1:] != sessions[:-1]) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(close)]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start, end in zip(starts, ends):
+            typical_volume_sums = typical_volume[start:end]
+            volume_sums = volume[start:end]
+            if start == 0 and initial is not None and initial[0] == sessions[0]:
+                # Same summation order as an uninterrupted session
+                typical_volume_sums = np.concatenate([[initial[1]], typical_volume_sums])
+                volume_sums = np.concatenate([[initial[2]], volume_sums])
+                vwap[start:end] = (cumsum_skipna(typical_volume_sums) / cumsum_skipna(volume_sums))[1:]
+            else:
+                vwap[start:end] = cumsum_skipna(typical_volume_sums) / cumsum_skipna(volume_sums)
+
+    # Sums of the last session, accumulated in the same order as the VWAP
+    state = (sessions[-1], np.nancumsum(typical_volume_sums)[-1], np.nancumsum(volume_sums)[-1])
+    return vwap, state
+
+
+def pivot_point(high, low, close):
+    return (high + low + close) / 3
+
+
+def pivot_level(pivot, price):
+    """
+    Reflection of `price` through the pivot: R1 from the low, S1 from the high.
+    """
+    return (2 * pivot) - price
+
+
+def map_rows(function, *arrays):
+    """
+    Apply a single-series `function` to every row of (..., n) arrays.
+
+    Each row is cut before its trailing NaN padding (see pack_by_ticker), so
+    the function sees exactly the bars of one ticker.
+    """
+    shape = arrays[0].shape
+    rows = [np.asarray(array, dtype=float).reshape(-1, shape[-1]) for array in arrays]
+    result = np.full(rows[0].shape, np.nan)
+    for i in range(rows[0].shape[0]):
+        finite = np.flatnonzero(np.isfinite(rows[0][i]))
+        if finite.size:
+            length = finite[-1] + 1
+            result[i, :length] = function(*(row[i, :length] for row in rows))
+    return result.reshape(shape)
+
+
+def _wilder_average(values, window):
+    alpha = 1.0 / window
+    result = np.full(values.shape, np.nan)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return result
+    start = int(np.argmax(finite))
+    if not finite[start:].all():
+        return pd.Series(values).ewm(alpha=alpha, min_periods=window).mean().to_numpy()
+    # Weights (1 - alpha)**age, normalized by their sum as in ewm(adjust=True)
+    weighted = lfilter([1.0], [1.0, alpha - 1.0], values[start:])
+    weights = lfilter([1.0], [1.0, alpha - 1.0], np.ones(len(values) - start))
+    result[start:] = weighted / weights
+    result[:start + window - 1] = np.nan
+    return result
+
+
+def wilder_average(values, window):
+    """
+    Wilder's smoothing as pandas_ta's `rma`: `ewm(alpha=1 / window, min_periods=window).mean()`.
+    """
+    return map_rows(lambda row: _wilder_average(row, window), values)
+
+
+def _sma_seeded_ema(values, span):
+    result = np.full(values.shape, np.nan)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return result
+    start = int(np.argmax(finite))
+    if len(values) - start < span:
+        return result
+    seed = values[start:start + span].mean()
+    if not finite[start:].all():
+        series = pd.Series(values[start:])
+        series.iloc[:span - 1] = np.nan
+        series.iloc[span - 1] = np.nanmean(values[start:start + span])
+        result[start:] = series.ewm(span=span, adjust=False).mean().to_numpy()
+        return result
+    result[start + span - 1] = seed
+    result[start + span:] = ema(values[start + span:], span, initial=seed)
+    return result
+
+
+def sma_seeded_ema(values, span):
+    """
+    pandas_ta's `ema`: NaN for the first `span - 1` valid bars, then an EMA started from their SMA.
+
+    Leading NaN (e.g. the MACD warm-up feeding its signal line) are skipped first.
+    """
+    return map_rows(lambda row: _sma_seeded_ema(row, span), values)
+
+
+def gains_keep_nan(change):
+    return np.where(change < 0, 0.0, change)
+
+
+def losses_keep_nan(change):
+    return np.where(change > 0, 0.0, -change)
+
+
+def wilder_relative_strength_index(average_gain, average_loss):
+    return 100 * average_gain / (average_gain + average_loss)
+
+
+def non_zero_range(high, low):
+    """
+    `high - low`, shifted by machine epsilon in every bar of a series that has a zero range, as in pandas_ta.
+    """
+    spread = high - low
+    return spread + np.where((spread == 0).any(axis=-1, keepdims=True), sys.float_info.epsilon, 0.0)
+
+
+def stochastic_raw(close, lowest_low, highest_high):
+    return 100 * (close - lowest_low) / non_zero_range(highest_high, lowest_low)
+
+
+def on_balance_volume_from_first(close, volume):
+    """
+    pandas_ta's OBV: the first bar counts as an up bar, so the series starts at its volume.
+    """
+    steps = np.concatenate([volume[..., :1], signed_volume(close, volume)], axis=-1)
+    return np.cumsum(steps, axis=-1)
+
+
+def bar_vwap(high, low, close, volume):
+    """
+    VWAP anchored to every bar, as pandas_ta's daily-anchored `vwap` on daily bars: the typical price where volume traded.
+    """
+    typical_price = (high + low + close) / 3.0
+    return typical_price * volume / volume
+
+
+def _parabolic_sar_long(high, low, close, step, max_step):
+    high = high.tolist()
+    low = low.tolist()
+    long = [np.nan] * len(high)
+    if not long:
+        return np.asarray(long)
+
+    # Falling if the directional movement down of the second bar is positive
+    falling = False
+    if len(high) > 1:
+        up = high[1] - high[0]
+        down = low[0] - low[1]
+        falling = down > up and down >= sys.float_info.epsilon
+    ep = low[0] if falling else high[0]
+    sar = float(close[0])
+    af = step
+
+    for row in range(1, len(high)):
+        value = sar + af * (ep - sar)
+        # pandas_ta reads bar row - 2 even on the second bar, i.e. the last bar
+        if falling:
+            reverse = high[row] > value
+            if low[row] < ep:
+                ep = low[row]
+                af = min(af + step, max_step)
+            value = max(high[row - 1], high[row - 2], value)
+        else:
+            reverse = low[row] < value
+            if high[row] > ep:
+                ep = high[row]
+                af = min(af + step, max_step)
+            value = min(low[row - 1], low[row - 2], value)
+
+        if reverse:
+            value = ep
+            af = step
+            falling = not falling
+            ep = low[row] if falling else high[row]
+        sar = value
+        if not falling:
+            long[row] = sar
+    return np.asarray(long)
+
+
+def parabolic_sar_long(high, low, close, step=PSAR_STEP, max_step=PSAR_MAX_STEP):
+    """
+    pandas_ta's long-side Parabolic SAR (`PSARl`): the SAR during rising trends, NaN while falling.
+    """
+    return map_rows(lambda h, l, c: _parabolic_sar_long(h, l, c, step, max_step), high, low, close)
+
+
+# Every indicator, declared once with its inputs and parameters. Names starting
+# with "_" are shared intermediates; the other names, in declaration order, are
+# the derived columns the models expect. Identical steps are merged by the
+# planner, so e.g. a declared 20-day moving average would reuse BB_Middle's step.
+INDICATORS = IndicatorRegistry(PRICE_COLUMNS)
+INDICATORS.declare("MA_10", rolling_mean, ["Close"], window=MA_SHORT_WINDOW)
+INDICATORS.declare("MA_50", rolling_mean, ["Close"], window=MA_LONG_WINDOW)
+INDICATORS.declare("Volatility", rolling_std, ["Close"], window=VOLATILITY_WINDOW)
+
+INDICATORS.declare("_price_change", price_change, ["Close"])
+INDICATORS.declare("_average_gain", rolling_mean, ["_gain"], window=RSI_WINDOW)
+INDICATORS.declare("_average_loss", rolling_mean, ["_loss"], window=RSI_WINDOW)
+INDICATORS.declare("_gain", gains, ["_price_change"])
+INDICATORS.declare("_loss", losses, ["_price_change"])
+INDICATORS.declare("RSI", relative_strength_index, ["_average_gain", "_average_loss"])
+
+INDICATORS.declare("_ema_fast", ema, ["Close"], span=MACD_FAST_SPAN)
+INDICATORS.declare("_ema_slow", ema, ["Close"], span=MACD_SLOW_SPAN)
+INDICATORS.declare("MACD", difference, ["_ema_fast", "_ema_slow"])
+INDICATORS.declare("MACD_Signal", ema, ["MACD"], span=MACD_SIGNAL_SPAN)
+INDICATORS.declare("MACD_Hist", difference, ["MACD", "MACD_Signal"])
+
+INDICATORS.declare("_lowest_low", rolling_min, ["Low"], window=STOCHASTIC_WINDOW)
+INDICATORS.declare("_highest_high", rolling_max, ["High"], window=STOCHASTIC_WINDOW)
+INDICATORS.declare("Stochastic", stochastic_oscillator, ["Close", "_lowest_low", "_highest_high"])
+INDICATORS.declare("Williams %R", williams_r, ["Close", "_lowest_low", "_highest_high"])
+
+INDICATORS.declare("_bollinger_std", rolling_std, ["Close"], window=BOLLINGER_WINDOW)
+INDICATORS.declare("BB_Lower", bollinger_band, ["BB_Middle", "_bollinger_std"], width=-BOLLINGER_WIDTH)
+INDICATORS.declare("BB_Middle", rolling_mean, ["Close"], window=BOLLINGER_WINDOW)
+INDICATORS.declare("BB_Upper", bollinger_band, ["BB_Middle", "_bollinger_std"], width=BOLLINGER_WIDTH)
+
+INDICATORS.declare("EMA_10", ema, ["Close"], span=EMA_SHORT_SPAN)
+INDICATORS.declare("EMA_50", ema, ["Close"], span=EMA_LONG_SPAN)
+INDICATORS.declare(
+    "Parabolic_SAR", parabolic_sar, ["Open", "High", "Low", "Close"], step=PSAR_STEP, max_step=PSAR_MAX_STEP,
+)
+INDICATORS.declare("OBV", on_balance_volume, ["Close", "Volume"])
+INDICATORS.declare("VWAP", volume_weighted_average_price, ["High", "Low", "Close", "Volume"])
+INDICATORS.declare("Pivot", pivot_point, ["High", "Low", "Close"])
+INDICATORS.declare("R1", pivot_level, ["Pivot", "Low"])
+INDICATORS.declare("S1", pivot_level, ["Pivot", "High"])
+
+# The same columns as pandas_ta computed them for the offline enhancers
+# (DataTransformer, DataEnhancer, Top25DataEnhancer), whose CSVs feed the LSTM
+# models and backtests: Wilder RSI, SMA-seeded EMAs and MACD, smoothed %K,
+# population-std Bollinger Bands, long-only SAR, OBV from the first volume and
+# VWAP anchored to each daily bar.
+PANDAS_TA_INDICATORS = INDICATORS.copy()
+PANDAS_TA_INDICATORS.declare("_ta_gain", gains_keep_nan, ["_price_change"])
+PANDAS_TA_INDICATORS.declare("_ta_loss", losses_keep_nan, ["_price_change"])
+PANDAS_TA_INDICATORS.declare("_ta_average_gain", wilder_average, ["_ta_gain"], window=RSI_WINDOW)
+PANDAS_TA_INDICATORS.declare("_ta_average_loss", wilder_average, ["_ta_loss"], window=RSI_WINDOW)
+PANDAS_TA_INDICATORS.declare(
+    "RSI", wilder_relative_strength_index, ["_ta_average_gain", "_ta_average_loss"], replace=True,
+)
+PANDAS_TA_INDICATORS.declare("_ta_ema_fast", sma_seeded_ema, ["Close"], span=MACD_FAST_SPAN)
+PANDAS_TA_INDICATORS.declare("_ta_ema_slow", sma_seeded_ema, ["Close"], span=MACD_SLOW_SPAN)
+PANDAS_TA_INDICATORS.declare("MACD", difference, ["_ta_ema_fast", "_ta_ema_slow"], replace=True)
+PANDAS_TA_INDICATORS.declare("MACD_Signal", sma_seeded_ema, ["MACD"], replace=True, span=MACD_SIGNAL_SPAN)
+PANDAS_TA_INDICATORS.declare("_ta_stochastic", stochastic_raw, ["Close", "_lowest_low", "_highest_high"])
+PANDAS_TA_INDICATORS.declare(
+    "Stochastic", rolling_mean, ["_ta_stochastic"], replace=True, window=STOCHASTIC_SMOOTHING,
+)
+PANDAS_TA_INDICATORS.declare("_ta_bollinger_std", rolling_std, ["Close"], window=BOLLINGER_WINDOW, ddof=0)
+PANDAS_TA_INDICATORS.declare(
+    "BB_Lower", bollinger_band, ["BB_Middle", "_ta_bollinger_std"], replace=True, width=-BOLLINGER_WIDTH,
+)
+PANDAS_TA_INDICATORS.declare(
+    "BB_Upper", bollinger_band, ["BB_Middle", "_ta_bollinger_std"], replace=True, width=BOLLINGER_WIDTH,
+)
+PANDAS_TA_INDICATORS.declare("EMA_10", sma_seeded_ema, ["Close"], replace=True, span=EMA_SHORT_SPAN)
+PANDAS_TA_INDICATORS.declare("EMA_50", sma_seeded_ema, ["Close"], replace=True, span=EMA_LONG_SPAN)
+PANDAS_TA_INDICATORS.declare(
+    "Parabolic_SAR", parabolic_sar_long, ["High", "Low", "Close"], replace=True,
+    step=PSAR_STEP, max_step=PSAR_MAX_STEP,
+)
+PANDAS_TA_INDICATORS.declare("OBV", on_balance_volume_from_first, ["Close", "Volume"], replace=True)
+PANDAS_TA_INDICATORS.declare("VWAP", bar_vwap, ["High", "Low", "Close", "Volume"], replace=True)
+
+# Derived columns in the order the models expect them
+DERIVED_COLUMNS = INDICATORS.columns
+FEATURE_COLUMNS = PRICE_COLUMNS + DERIVED_COLUMNS
+# The training script keeps the Volatility column shipped with its datasets
+TRAINING_COLUMNS = [name for name in DERIVED_COLUMNS if name != "Volatility"]
+
+
+def columns_for_features(feature_names):
+    """
+    Derived columns a model reads, given its input features (e.g. `feature_names_in_`).
+
+    Raw price columns and names the engine does not know are skipped.
+
+    Returns:
+        list: Derived columns, in DERIVED_COLUMNS order.
+    """
+    wanted = set(feature_names)
+    return [name for name in DERIVED_COLUMNS if name in wanted]
+
+
+def compute_indicators(prices, columns=DERIVED_COLUMNS, registry=INDICATORS):
+    """
+    Compute derived indicator columns from OHLCV arrays.
+
+    Arrays may carry leading axes (e.g. one row per ticker); every indicator is
+    computed along the last axis. Only the requested columns and the steps
+    they depend on run, and a step shared by several columns runs once.
+
+    Args:
+        prices (dict): "Open", "High", "Low", "Close" and "Volume" float arrays.
+            Open is only needed for Parabolic_SAR and Volume for OBV and VWAP.
+        columns (list): Derived columns to compute (any declared in `registry`).
+        registry (IndicatorRegistry): INDICATORS, or PANDAS_TA_INDICATORS for
+            the definitions of the offline enhancers.
+
+    Returns:
+        dict: Column name to float array with the shape of the inputs.
+    """
+    return registry.plan(columns).run(prices)
+
+
+def forward_fill(values):
+    """
+    Carry the last non-NaN value forward along the last axis.
+    """
+    positions = np.arange(values.shape[-1])
+    last_valid = np.where(np.isnan(values), 0, positions)
+    np.maximum.accumulate(last_valid, axis=-1, out=last_valid)
+    return np.take_along_axis(values, last_valid, axis=-1)
+
+
+def fill_missing(values, mode):
+    """
+    Fill NaN along the last axis.
+
+    Modes:
+        "ffill": forward fill, then back fill the leading gap.
+        "ffill_zero": as "ffill", then zero whatever is still missing.
+        "mean": replace NaN with the mean of the series.
+        None: leave values untouched.
+    """
+    if mode not in FILL_MODES:
+        raise ValueError(f"Unknown fill mode: {mode}")
+    if mode is None or not np.isnan(values).any():
+        return values
+
+    if mode == "mean":
+        with warnings.catch_warnings():
+            # All-NaN series stay NaN
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(values, axis=-1, keepdims=True)
+        return np.where(np.isnan(values), means, values)
+
+    filled = forward_fill(values)
+    filled = forward_fill(filled[..., ::-1])[..., ::-1]
+    if mode == "ffill_zero":
+        filled = np.where(np.isnan(filled), 0.0, filled)
+    return filled
+
+
+def add_indicators(data, columns=DERIVED_COLUMNS, fill="ffill", dtype=np.float64, registry=INDICATORS):
+    """
+    Compute indicator columns for a single-series DataFrame in place.
+
+    As in the original pandas implementations, `fill` is applied to every
+    numeric column of the frame afterwards, not only to the new ones.
+    Indicators are always computed in float64; `dtype` only sets how the new
+    columns are stored, and filled columns keep their own dtype.
+
+    Args:
+        data (pd.DataFrame): Frame with OHLCV columns (oldest row first).
+        columns (list): Derived columns to (re)compute.
+        fill (str): One of FILL_MODES.
+        dtype: Storage type of the new columns (np.float32 for compact frames).
+        registry (IndicatorRegistry): Where the columns are declared (see compute_indicators).
+
+    Returns:
+        pd.DataFrame: The same frame.
+    """
+    prices = {name: data[name].to_numpy(dtype=float) for name in PRICE_COLUMNS if name in data.columns}
+    for name, values in compute_indicators(prices, columns, registry).items():
+        data[name] = values.astype(dtype, copy=False)
+
+    if fill is not None:
+        numeric = data.select_dtypes(include=[np.number])
+        block = numeric.to_numpy(dtype=float).T
+        missing = np.isnan(block).any(axis=-1)
+        if missing.any():
+            filled = fill_missing(block[missing], fill)
+            for name, values in zip(numeric.columns[missing], filled):
+                data[name] = values.astype(numeric[name].dtype, copy=False)
+    return data
+
+
+def pack_by_ticker(data, ticker_column="Ticker", date_column="Date"):
+    """
+    Lay a long multi-ticker frame out as (tickers x rows) arrays.
+
+    Each ticker's rows are sorted by date and packed to the left of its row,
+    with NaN padding after its last bar. Windows therefore never cross ticker
+    boundaries, and a ticker missing some trading days is computed exactly
+    as it would be on its own.
+
+    Returns:
+        tuple: (prices, codes, positions, lengths) where `prices` maps each
+        available OHLCV column to a 2D array and `codes`/`positions` give the
+        array cell of every input row, in input order.
+    """
+    codes, _ = pd.factorize(data[ticker_column], sort=True)
+    order = np.lexsort((data[date_column].to_numpy(), codes))
+    lengths = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    positions = np.empty(len(data), dtype=np.intp)
+    positions[order] = np.arange(len(data)) - starts[codes[order]]
+
+    shape = (len(lengths), int(lengths.max()) if len(lengths) else 0)
+    prices = {}
+    for name in PRICE_COLUMNS:
+        if name in data.columns:
+            values = np.full(shape, np.nan)
+            values[codes, positions] = data[name].to_numpy(dtype=float)
+            prices[name] = values
+    return prices, codes, positions, lengths
+
+
+def add_indicators_by_ticker(
+    data, columns=DERIVED_COLUMNS, fill=None, ticker_column="Ticker", date_column="Date", dtype=np.float64,
+    registry=INDICATORS,
+):
+    """
+    Compute indicator columns for every ticker of a long-format frame at once, in place.
+
+    Unlike `add_indicators`, `fill` only applies to the computed columns, and
+    each ticker is filled from its own rows.
+
+    Args:
+        data (pd.DataFrame): Rows of several tickers, in any order.
+        columns (list): Derived columns to (re)compute.
+        fill (str): One of FILL_MODES.
+        dtype: Storage type of the new columns; they are computed in float64.
+        registry (IndicatorRegistry): Where the columns are declared (see compute_indicators).
+
+    Returns:
+        pd.DataFrame: The same frame, rows in their original order.
+    """
+    if data.empty:
+        return data
+
+    prices, codes, positions, lengths = pack_by_ticker(data, ticker_column, date_column)
+    padding = np.arange(prices["Close"].shape[-1]) >= lengths[:, None]
+    for name, values in compute_indicators(prices, columns, registry).items():
+        # Path-dependent kernels keep running through the padding
+        values[padding] = np.nan
+        values = fill_missing(values, fill)
+        if fill is not None:
+            values[padding] = np.nan
+        data[name] = values[codes, positions].astype(dtype, copy=False)
+    return data
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class IndicatorRegistry:
+    """
+    Declarations of indicators: each names its function, inputs and parameters.
+
+    Inputs are raw price columns or other declared names. Names starting with
+    an underscore are intermediates; the others are the columns the registry
+    produces, in declaration order. `plan` turns a column request into a
+    graph in which identical steps (same function, inputs and parameters) are
+    merged, so a rolling statistic used by several indicators runs once.
+    """
+
+    def __init__(self, inputs):
+        self.inputs = list(inputs)
+        self.declarations = {}
+
+    def declare(self, name, function, inputs, replace=False, **params):
+        """
+        Declare `name` as `function(*inputs, **params)`.
+
+        Args:
+            name (str): Column name, or an intermediate name starting with "_".
+            function (callable): Array function applied along the last axis.
+            inputs (list): Price columns or declared names passed positionally.
+            replace (bool): Allow overriding an existing declaration.
+        """
+        if name in self.inputs or (name in self.declarations and not replace):
+            raise ValueError(f"Indicator already declared: {name}")
+        self.declarations[name] = (function, list(inputs), params)
+
+    def copy(self):
+        registry = IndicatorRegistry(self.inputs)
+        registry.declarations = dict(self.declarations)
+        return registry
+
+    @property
+    def columns(self):
+        return [name for name in self.declarations if not name.startswith("_")]
+
+    def plan(self, columns):
+        """
+        Resolve the steps needed for `columns`, merged and in topological order.
+
+        Raises:
+            ValueError: For unknown names or circular declarations.
+        """
+        return IndicatorPlan(self, columns)
+
+    def describe(self, columns=None):
+        """
+        JSON-friendly description of every declaration reachable from `columns`.
+
+        Used to version anything computed from the registry: changing a
+        function, an input or a parameter changes the description.
+        """
+        plan = self.plan(self.columns if columns is None else columns)
+        description = {}
+        for name in plan.names:
+            function, inputs, params = self.declarations[name]
+            description[name] = {"function": function.__name__, "inputs": inputs, "params": params}
+        return description
+
+
+class IndicatorPlan:
+    """
+    The merged steps computing a set of columns, ready to run on price arrays.
+    """
+
+    def __init__(self, registry, columns):
+        self.registry = registry
+        self.steps = []  # (key, function, input keys, params)
+        self.names = []  # Declarations visited, first use first
+        self.keys = {}
+        self.outputs = {}
+        planned = set()
+        visiting = set()
+
+        def resolve(name):
+            if name in self.registry.inputs:
+                return name
+            if name in self.keys:
+                return self.keys[name]
+            if name not in self.registry.declarations:
+                raise ValueError(f"Unknown indicator: {name}")
+            if name in visiting:
+                raise ValueError(f"Circular indicator declaration: {name}")
+
+            visiting.add(name)
+            function, inputs, params = self.registry.declarations[name]
+            input_keys = tuple(resolve(dependency) for dependency in inputs)
+            visiting.discard(name)
+
+            # Steps with the same function, inputs and parameters are computed once
+            key = (function, input_keys, tuple(sorted(params.items())))
+            if key not in planned:
+                planned.add(key)
+                self.steps.append((key, function, input_keys, params))
+            self.keys[name] = key
+            self.names.append(name)
+            return key
+
+        for column in columns:
+            if column.startswith("_") or column in self.registry.inputs:
+                raise ValueError(f"Not an indicator column: {column}")
+            self.outputs[column] = resolve(column)
+
+    def run(self, prices):
+        """
+        Compute the planned columns.
+
+        Args:
+            prices (dict): Price column name to array; only the inputs the
+                plan uses are read.
+
+        Returns:
+            dict: Column name to array, in the requested order.
+        """
+        values = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for key, function, input_keys, params in self.steps:
+                arguments = [prices[dependency] if dependency in prices else values[dependency] for dependency in input_keys]
+                values[key] = function(*arguments, **params)
+        return {column: values[key] for column, key in self.outputs.items()}
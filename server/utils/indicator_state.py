@@ -0,0 +1,253 @@
+import copy
+import numpy as np
+import pandas as pd
+from utils.indicator_engine import (
+    MA_SHORT_WINDOW, MA_LONG_WINDOW, VOLATILITY_WINDOW, RSI_WINDOW, BOLLINGER_WINDOW, BOLLINGER_WIDTH,
+    STOCHASTIC_WINDOW, MACD_FAST_SPAN, MACD_SLOW_SPAN, MACD_SIGNAL_SPAN,
+)
+
+# Window of the close-price volatility that scales the forecast noise
+NOISE_VOLATILITY_WINDOW = 90
+
+# Columns recalculated on every forecast step
+STATE_COLUMNS = [
+    "MA_10", "MA_50", "Volatility", "RSI", "MACD", "MACD_Signal",
+    "BB_Lower", "BB_Middle", "BB_Upper", "Williams %R",
+]
+
+
+def _ema_alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+def _tail(values, size):
+    """
+    Return the last `size` entries of a 1D array, left-padded with NaN.
+    """
+    values = np.asarray(values, dtype=float)[-size:]
+    if len(values) < size:
+        values = np.concatenate([np.full(size - len(values), np.nan), values])
+    return values
+
+
+class RingBuffer:
+    """
+    Fixed-size window over the last `size` observations of one or more series.
+
+    Values have shape (..., size); the leading axes index independent series.
+    """
+
+    def __init__(self, values):
+        self.values = np.array(values, dtype=float)
+        self.size = self.values.shape[-1]
+        self.pos = 0  # Slot holding the oldest observation
+
+    def append(self, value):
+        self.values[..., self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+
+    def last(self, count):
+        """
+        Return the most recent `count` observations, oldest first.
+        """
+        index = (self.pos - count + np.arange(count)) % self.size
+        return self.values[..., index]
+
+
+class IndicatorState:
+    """
+    Streaming equivalent of `update_derived_features` for the recursive forecast loop.
+
+    The state is seeded once from a transformed history and then advanced one
+    forecast row at a time. Rolling indicators are served from ring buffers and
+    MACD from carried EMA values, so each step costs O(window) instead of a
+    full recompute over the history. Missing values follow the same
+    forward-fill-then-zero rule as `update_derived_features`. Seeded with a
+    model's feature names, only the columns that model reads are recalculated.
+    """
+
+    def __init__(self, closes, highs, lows, gains, losses, ema_fast, ema_slow, macd_signal, last_values):
+        self.closes = RingBuffer(closes)
+        self.highs = RingBuffer(highs)
+        self.lows = RingBuffer(lows)
+        self.gains = RingBuffer(gains)
+        self.losses = RingBuffer(losses)
+        self.ema_fast = np.asarray(ema_fast, dtype=float)
+        self.ema_slow = np.asarray(ema_slow, dtype=float)
+        self.macd_signal = np.asarray(macd_signal, dtype=float)
+        self.last_values = {name: np.asarray(value, dtype=float) for name, value in last_values.items()}
+        self.last_close = self.closes.last(1)[..., 0]
+
+    @classmethod
+    def from_history(cls, data, feature_names=None):
+        """
+        Seed the state from a transformed history (oldest row first).
+
+        Args:
+            data (pd.DataFrame): Frame with at least High, Low and Close columns.
+            feature_names (list): Model inputs (e.g. `feature_names_in_`); only
+                the STATE_COLUMNS among them are recalculated by `advance`.
+                Defaults to every state column.
+
+        Returns:
+            IndicatorState: State positioned after the last row of `data`.
+        """
+        if data.empty:
+            raise ValueError("Cannot seed indicator state from empty data.")
+
+        close = data["Close"].to_numpy(dtype=float)
+        high = data["High"].to_numpy(dtype=float)
+        low = data["Low"].to_numpy(dtype=float)
+
+        delta = np.diff(close, prepend=np.nan)
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+
+        # EMAs depend on the whole series, so they are carried from a single pass
+        close_series = pd.Series(close)
+        ema_fast = close_series.ewm(span=MACD_FAST_SPAN, adjust=False).mean()
+        ema_slow = close_series.ewm(span=MACD_SLOW_SPAN, adjust=False).mean()
+        macd_signal = (ema_fast - ema_slow).ewm(span=MACD_SIGNAL_SPAN, adjust=False).mean()
+
+        if feature_names is None:
+            columns = STATE_COLUMNS
+        else:
+            feature_names = set(feature_names)
+            columns = [name for name in STATE_COLUMNS if name in feature_names]
+        last_row = data.iloc[-1]
+        last_values = {
+            name: float(last_row[name]) if name in data.columns else np.nan
+            for name in columns
+        }
+
+        return cls(
+            closes=_tail(close, max(MA_LONG_WINDOW, NOISE_VOLATILITY_WINDOW)),
+            highs=_tail(high, STOCHASTIC_WINDOW),
+            lows=_tail(low, STOCHASTIC_WINDOW),
+            gains=_tail(gains, RSI_WINDOW),
+            losses=_tail(losses, RSI_WINDOW),
+            ema_fast=ema_fast.iloc[-1],
+            ema_slow=ema_slow.iloc[-1],
+            macd_signal=macd_signal.iloc[-1],
+            last_values=last_values,
+        )
+
+    def _arrays(self):
+        return [
+            ("ema_fast", self.ema_fast), ("ema_slow", self.ema_slow),
+            ("macd_signal", self.macd_signal), ("last_close", self.last_close),
+        ]
+
+    def _buffers(self):
+        return [self.closes, self.highs, self.lows, self.gains, self.losses]
+
+    @classmethod
+    def concat(cls, states):
+        """
+        Stack single-series states (e.g. one per ticker) into one batched state.
+
+        Every returned value then has a leading axis with one entry per state.
+        """
+        positions = {tuple(buffer.pos for buffer in state._buffers()) for state in states}
+        if len(positions) != 1:
+            raise ValueError("Indicator states must share ring positions to be stacked.")
+        if len({tuple(state.last_values) for state in states}) != 1:
+            raise ValueError("Indicator states must recalculate the same columns to be stacked.")
+
+        batched = copy.deepcopy(states[0])
+        for index, buffer in enumerate(batched._buffers()):
+            buffer.values = np.stack([state._buffers()[index].values for state in states])
+        for name, _ in batched._arrays():
+            setattr(batched, name, np.stack([getattr(state, name) for state in states]))
+        batched.last_values = {
+            name: np.stack([state.last_values[name] for state in states])
+            for name in batched.last_values
+        }
+        return batched
+
+    def repeat(self, count):
+        """
+        Return a batched copy of a single-series state with `count` identical series.
+
+        Used to move several Monte Carlo paths forward together.
+        """
+        return IndicatorState.concat([self] * count)
+
+    def close_volatility(self, window=NOISE_VOLATILITY_WINDOW):
+        """
+        Sample standard deviation of the last `window` closes (NaN until the window is full).
+        """
+        return self.closes.last(window).std(axis=-1, ddof=1)
+
+    def advance(self, close, high=None, low=None):
+        """
+        Append one forecast row and return its recalculated indicators.
+
+        High and Low default to the previous row's values, matching the
+        forecast loop which carries them forward.
+
+        Returns:
+            dict: Indicator name to value (a float, or an array for batched series).
+        """
+        close = np.asarray(close, dtype=float)
+        high = self.highs.last(1)[..., 0] if high is None else np.asarray(high, dtype=float)
+        low = self.lows.last(1)[..., 0] if low is None else np.asarray(low, dtype=float)
+
+        delta = close - self.last_close
+        self.gains.append(np.where(delta > 0, delta, 0.0))
+        self.losses.append(np.where(delta < 0, -delta, 0.0))
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.last_close = close
+
+        fast_alpha = _ema_alpha(MACD_FAST_SPAN)
+        slow_alpha = _ema_alpha(MACD_SLOW_SPAN)
+        signal_alpha = _ema_alpha(MACD_SIGNAL_SPAN)
+        self.ema_fast = (1.0 - fast_alpha) * self.ema_fast + fast_alpha * close
+        self.ema_slow = (1.0 - slow_alpha) * self.ema_slow + slow_alpha * close
+        macd = self.ema_fast - self.ema_slow
+        self.macd_signal = (1.0 - signal_alpha) * self.macd_signal + signal_alpha * macd
+
+        # Only the columns the model reads are recalculated
+        wanted = self.last_values
+        raw = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if "MA_10" in wanted:
+                raw["MA_10"] = self.closes.last(MA_SHORT_WINDOW).mean(axis=-1)
+            if "MA_50" in wanted:
+                raw["MA_50"] = self.closes.last(MA_LONG_WINDOW).mean(axis=-1)
+            if "Volatility" in wanted:
+                raw["Volatility"] = self.closes.last(VOLATILITY_WINDOW).std(axis=-1, ddof=1)
+            if "RSI" in wanted:
+                gain = self.gains.last(RSI_WINDOW).mean(axis=-1)
+                loss = self.losses.last(RSI_WINDOW).mean(axis=-1)
+                rs = gain / loss
+                raw["RSI"] = 100 - (100 / (1 + rs))
+            if "MACD" in wanted:
+                raw["MACD"] = macd
+            if "MACD_Signal" in wanted:
+                raw["MACD_Signal"] = self.macd_signal
+
+            if wanted.keys() & {"BB_Lower", "BB_Middle", "BB_Upper"}:
+                bollinger_window = self.closes.last(BOLLINGER_WINDOW)
+                rolling_mean = bollinger_window.mean(axis=-1)
+                rolling_std = bollinger_window.std(axis=-1, ddof=1)
+                raw["BB_Lower"] = rolling_mean - (BOLLINGER_WIDTH * rolling_std)
+                raw["BB_Middle"] = rolling_mean
+                raw["BB_Upper"] = rolling_mean + (BOLLINGER_WIDTH * rolling_std)
+
+            if "Williams %R" in wanted:
+                high_14 = self.highs.last(STOCHASTIC_WINDOW).max(axis=-1)
+                low_14 = self.lows.last(STOCHASTIC_WINDOW).min(axis=-1)
+                raw["Williams %R"] = ((high_14 - close) / (high_14 - low_14)) * -100
+
+        # Forward-fill from the previous row, then fall back to zero
+        values = {}
+        for name in wanted:
+            value = raw[name]
+            previous = np.nan_to_num(self.last_values[name], nan=0.0, posinf=np.inf, neginf=-np.inf)
+            value = np.where(np.isnan(value), previous, value)
+            self.last_values[name] = value
+            values[name] = value if value.ndim else float(value)
+        return values
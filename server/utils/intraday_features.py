@@ -0,0 +1,74 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.indicator_engine import PRICE_COLUMNS, DERIVED_COLUMNS
+from utils.incremental_features import TAIL_ROWS, FeatureStream
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# yFinance intervals shorter than a day; their histories run to millions of bars
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m"}
+# Bars transformed at once; bounds the temporary arrays whatever the history length
+INTRADAY_CHUNK_ROWS = 100_000
+# Timestamp column of intraday yFinance histories after reset_index()
+INTRADAY_TIME_COLUMN = "Datetime"
+
+
+def session_ids(timestamps):
+    """
+    Trading session of every bar: its calendar day in the exchange's local time.
+
+    yFinance returns intraday timestamps in the exchange time zone, so the
+    local date never splits a session. Naive timestamps are taken as local.
+
+    Returns:
+        np.ndarray: Days since the epoch (int64).
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps))
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+def iter_intraday_features(raw, columns=DERIVED_COLUMNS, chunk_rows=INTRADAY_CHUNK_ROWS, time_column=INTRADAY_TIME_COLUMN):
+    """
+    Transform an intraday history chunk by chunk, with VWAP anchored to each session.
+
+    Indicators continue across chunk boundaries from carried state (see
+    FeatureStream), so the chunks are identical to transforming the whole
+    history at once, in time linear in its number of bars. Bars without
+    prices carry no information intraday and are dropped first.
+
+    Args:
+        raw (pd.DataFrame): Timestamp and OHLCV columns, oldest bar first.
+        columns (list): Derived columns, in the order they are added.
+        chunk_rows (int): Bars per chunk; at least TAIL_ROWS.
+
+    Yields:
+        pd.DataFrame: Transformed chunks, indexed like `raw`.
+    """
+    if raw.empty:
+        raise ValueError("Input data for transformation is empty.")
+
+    complete = np.isfinite(raw[PRICE_COLUMNS].to_numpy(dtype=float)).all(axis=1)
+    if not complete.all():
+        logging.info(f"Dropping {int((~complete).sum())} intraday bars without prices.")
+        raw = raw[complete]
+
+    chunk_rows = max(int(chunk_rows), TAIL_ROWS)
+    stream = FeatureStream(columns, session_column=time_column, sessions=session_ids)
+    for start in range(0, len(raw), chunk_rows):
+        chunk = raw.iloc[start:start + chunk_rows]
+        yield stream.push(chunk).set_axis(chunk.index)
+
+
+def transform_intraday(raw, columns=DERIVED_COLUMNS, chunk_rows=INTRADAY_CHUNK_ROWS, time_column=INTRADAY_TIME_COLUMN):
+    """
+    Transform a whole intraday history with `iter_intraday_features`.
+
+    Returns:
+        pd.DataFrame: Transformed bars with a fresh index.
+    """
+    chunks = iter_intraday_features(raw, columns, chunk_rows, time_column)
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,103 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class LocalCache:
+    """
+    In-process LRU of decoded cache values, bounded by an estimate of their size in bytes.
+
+    Entries expire at their own deadline (the Redis TTL of the value) and
+    never outlive `max_age` seconds, which bounds staleness should an
+    invalidation be lost. Values are shared, not copied, so callers must not
+    mutate them.
+    """
+
+    def __init__(self, max_bytes, max_age, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, nbytes, expires_at)
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        """
+        Return `(True, value)` for a live entry, else `(False, None)`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self.clock():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[0]
+
+    def generation(self):
+        """
+        Counter of invalidations, to pass to `put` for values read from Redis.
+        """
+        with self._lock:
+            return self._generation
+
+    def put(self, key, value, nbytes, ttl=None, generation=None):
+        """
+        Store a decoded value.
+
+        Args:
+            nbytes (int): Size estimate of the value (its encoded length).
+            ttl (float): Seconds the value stays valid in Redis; None if it never expires.
+            generation (int): Result of `generation()` taken before the value was read.
+                If an invalidation arrived since, the value may be stale and is not stored.
+        """
+        if self.max_bytes <= 0 or nbytes > self.max_bytes:
+            return
+        age = self.max_age if ttl is None else min(ttl, self.max_age)
+        if age <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, nbytes, self.clock() + age)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key=None):
+        """
+        Drop one key, or every entry when `key` is None.
+        """
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def stats(self):
+        """
+        Return hit and eviction counts, the hit ratio and the current size.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else None
+        return stats
@@ -0,0 +1,228 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from joblib import load
+from utils.flat_forest import FlatForest, FLAT_FOREST_MAX_ROWS
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# Directory holding the trained Random Forest artifacts
+MODEL_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../ml_components/RF_multi_output/models')
+
+
+def get_model_path(sector, timeframe):
+    """
+    Returns the absolute path to the model based on sector and timeframe.
+    """
+    return os.path.abspath(os.path.join(MODEL_DIRECTORY, f"rf_{sector}_{timeframe}.joblib"))
+
+
+def get_flat_forest_path(model_path):
+    """
+    Returns the path of the flattened forest exported next to a joblib artifact.
+    """
+    return os.path.splitext(model_path)[0] + "_flat.npz"
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 checksum of a file without reading it into memory at once.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def estimate_model_nbytes(model):
+    """
+    Estimate the in-memory footprint of a fitted tree ensemble.
+
+    Sums the node and value arrays of every fitted tree, which dominate the
+    size of a forest. Returns None for models without `estimators_`.
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        return None
+
+    total = 0
+    for estimator in estimators:
+        tree = getattr(estimator, "tree_", None)
+        if tree is None:
+            continue
+        state = tree.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of deserialized models keyed by (sector, timeframe).
+
+    Each artifact is loaded once and kept warm. On every lookup the file is
+    stat'ed; it is only reloaded when its mtime/size changed *and* its
+    checksum differs from the one that was loaded.
+    """
+
+    def __init__(self, path_resolver=get_model_path, loader=load):
+        self.path_resolver = path_resolver
+        self.loader = loader
+        self._entries = {}
+        # Guards the dicts only; checksums, loads and flattening hold the key's own lock
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _warm(self, key, signature):
+        """
+        Return the warm model if it was loaded from a file with this signature, counting a hit.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["signature"] != signature:
+                return None
+            entry["hits"] += 1
+            return entry["model"]
+
+    def get(self, sector, timeframe):
+        """
+        Return the warm model for a sector/timeframe, loading or reloading it if needed.
+
+        A load only blocks lookups of the same sector/timeframe.
+
+        Raises:
+            FileNotFoundError: If the model artifact does not exist.
+        """
+        path = self.path_resolver(sector, timeframe)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model not found: {path}")
+
+        key = (sector, timeframe)
+        stat = os.stat(path)
+        model = self._warm(key, (stat.st_mtime_ns, stat.st_size))
+        if model is not None:
+            return model
+
+        with self._key_lock(key):
+            # Another thread may have loaded the file while this one waited
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            model = self._warm(key, signature)
+            if model is not None:
+                return model
+
+            with self._lock:
+                entry = self._entries.get(key)
+            checksum = file_checksum(path)
+            if entry is not None and entry["checksum"] == checksum:
+                # File was touched but its contents are unchanged
+                with self._lock:
+                    entry["signature"] = signature
+                    entry["hits"] += 1
+                return entry["model"]
+
+            entry = self._load(key, path, signature, checksum, previous=entry)
+            with self._lock:
+                self._entries[key] = entry
+            return entry["model"]
+
+    def get_predictor(self, sector, timeframe, batch_rows=1):
+        """
+        Return the fastest predictor for calls of `batch_rows` rows.
+
+        Small batches are served by a FlatForest, read from the exported
+        `_flat.npz` next to the artifact when it is up to date, otherwise
+        flattened once per loaded model. Larger batches and non-forest models
+        get the model itself.
+        """
+        model = self.get(sector, timeframe)
+        if batch_rows > FLAT_FOREST_MAX_ROWS:
+            return model
+
+        key = (sector, timeframe)
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None or entry["model"] is not model:
+                # Reloaded or cleared by another thread in the meantime
+                return model
+            if entry["predictor"] is None:
+                entry["predictor"] = self._build_predictor(entry)
+            return entry["predictor"]
+
+    def _build_predictor(self, entry):
+        model = entry["model"]
+        if not hasattr(model, "estimators_"):
+            return model
+
+        flat_path = get_flat_forest_path(entry["path"])
+        if os.path.exists(flat_path) and os.stat(flat_path).st_mtime_ns >= entry["signature"][0]:
+            return FlatForest.load(flat_path)
+        return FlatForest.from_estimator(model)
+
+    def _load(self, key, path, signature, checksum, previous=None):
+        start = time.perf_counter()
+        model = self.loader(path)
+        load_seconds = time.perf_counter() - start
+
+        logging.info(f"Loaded model {key} from {path} in {load_seconds:.3f}s")
+        return {
+            "model": model,
+            "path": path,
+            "signature": signature,
+            "checksum": checksum,
+            "loaded_at": time.time(),
+            "load_seconds": load_seconds,
+            "file_bytes": signature[1],
+            "memory_bytes": estimate_model_nbytes(model),
+            "predictor": None,
+            "hits": 0,
+            "misses": (previous["misses"] if previous else 0) + 1,
+            "reloads": (previous["reloads"] + 1) if previous else 0,
+        }
+
+    def version(self, sector, timeframe):
+        """
+        Return the checksum of the currently loaded artifact, loading it if needed.
+        """
+        self.get(sector, timeframe)
+        with self._lock:
+            return self._entries[(sector, timeframe)]["checksum"]
+
+    def stats(self):
+        """
+        Return load time, memory footprint and hit counts for every warm model.
+        """
+        with self._lock:
+            return {
+                f"{sector}_{timeframe}": {
+                    "path": entry["path"],
+                    "checksum": entry["checksum"],
+                    "loaded_at": entry["loaded_at"],
+                    "load_seconds": entry["load_seconds"],
+                    "file_bytes": entry["file_bytes"],
+                    "memory_bytes": entry["memory_bytes"],
+                    "hits": entry["hits"],
+                    "misses": entry["misses"],
+                    "reloads": entry["reloads"],
+                }
+                for (sector, timeframe), entry in self._entries.items()
+            }
+
+    def clear(self):
+        """
+        Drop every warm model so the next lookup reloads from disk.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared registry for the API process
+model_registry = ModelRegistry()
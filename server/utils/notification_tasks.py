@@ -2,11 +2,14 @@ import sys
 import os
 import logging
 from celery import Celery
+from celery.schedules import crontab
 from flask import current_app
 from config import db  # Database configuration
 from models import Notification, Alert, User, Stock
-from utils.redis_helper import cache_predictions, get_cached_predictions
+from utils.redis_helper import cache_predictions
+from utils.forecast_table import FORECAST_TABLE_DAYS, read_forecast_row, read_forecast_rows, write_forecast_rows
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +32,15 @@ celery = Celery(
     backend='redis://localhost:6379/0',  # Enable result backend
 )
 
+# Periodic jobs run on New York time so they follow the market close
+celery.conf.timezone = "America/New_York"
+celery.conf.beat_schedule = {
+    "precompute-forecasts-after-close": {
+        "task": "utils.notification_tasks.precompute_forecasts",
+        "schedule": crontab(hour=17, minute=30, day_of_week="mon-fri"),
+    },
+}
+
 
 @celery.task
 def test_task():
@@ -61,25 +73,25 @@ def create_notification(user_id, message, channel="in-app", stock_id=None, alert
         logger.info(f"Email notification sent to user_id={user_id}")
 
 
-@celery.task
-def process_alert(alert_id):
-    """
-    Evaluate an alert's condition and trigger a notification if needed.
+def evaluate_alert(alert, forecast):
     """
-    logger.debug(f"Processing alert_id={alert_id}")
-    alert = Alert.query.get(alert_id)
-    if not alert:
-        logger.error(f"Alert ID {alert_id} not found.")
-        return
+    Evaluate an alert's condition against a forecast row and trigger a notification if needed.
 
+    Args:
+        alert (Alert): The alert, with its stock loaded.
+        forecast (dict): Forecast table row of the stock, or None if none is stored.
+
+    Returns:
+        bool: True if the alert was triggered now.
+    """
     stock = alert.stock
-    logger.debug(f"Fetched stock for alert: {stock}")
-    predictions = get_cached_predictions(stock.symbol, alert.days_out)
+    # Rows are stored for the longest horizon; alerts read their own prefix
+    predictions = forecast["historical"][:alert.days_out] if forecast else None
     logger.debug(f"Retrieved predictions: {predictions}")
 
-    if not predictions:
-        logger.warning(f"No predictions found for stock {stock.symbol} and alert {alert_id}.")
-        return
+    if not predictions or len(predictions) < alert.days_out:
+        logger.warning(f"No predictions found for stock {stock.symbol} and alert {alert.id}.")
+        return False
 
     condition_met = eval(alert.condition, {"predicted_gain": predictions[-1] - predictions[0]})
     if condition_met and not alert.is_triggered:
@@ -89,8 +101,25 @@ def process_alert(alert_id):
             stock_id=stock.id,
             alert_id=alert.id,
         )
-        logger.info(f"Alert triggered for alert_id={alert_id}")
+        logger.info(f"Alert triggered for alert_id={alert.id}")
         alert.is_triggered = True
+        return True
+    return False
+
+
+@celery.task
+def process_alert(alert_id):
+    """
+    Evaluate an alert's condition and trigger a notification if needed.
+    """
+    logger.debug(f"Processing alert_id={alert_id}")
+    alert = Alert.query.get(alert_id)
+    if not alert:
+        logger.error(f"Alert ID {alert_id} not found.")
+        return
+
+    logger.debug(f"Fetched stock for alert: {alert.stock}")
+    if evaluate_alert(alert, read_forecast_row(alert.stock.symbol, alert.days_out)):
         db.session.commit()
 
 
@@ -141,10 +170,31 @@ def cleanup_old_notifications():
 def refresh_alerts():
     """
     Refresh alerts for all users and stocks.
+
+    The forecasts of every alerted stock are read in one pipelined round trip
+    and each alert is evaluated in this task. An alert that fails to evaluate
+    is logged and skipped; the others are still evaluated and their triggered
+    flags committed, so alerts already notified are not notified again.
     """
-    alerts = Alert.query.all()
-    for alert in alerts:
-        process_alert.delay(alert.id)
+    alerts = Alert.query.filter_by(is_triggered=False).options(joinedload(Alert.stock)).all()
+    try:
+        forecasts = read_forecast_rows([alert.stock.symbol for alert in alerts])
+    except RuntimeError as e:
+        logger.error(f"Failed to read forecasts for {len(alerts)} alerts: {e}")
+        return
+
+    triggered = failed = 0
+    try:
+        for alert in alerts:
+            try:
+                triggered += evaluate_alert(alert, forecasts[alert.stock.symbol])
+            except Exception as e:
+                failed += 1
+                logger.error(f"Failed to evaluate alert_id={alert.id}: {e}")
+    finally:
+        if triggered:
+            db.session.commit()
+    logger.info(f"Refreshed {len(alerts)} alerts: {triggered} triggered, {failed} failed.")
 
 
 @celery.task
@@ -161,3 +211,33 @@ def refresh_stock_data():
             logger.info(f"Stock data refreshed for {stock.symbol}.")
         except Exception as e:
             logger.error(f"Failed to refresh stock data for {stock.symbol}: {e}")
+
+
+@celery.task(name="utils.notification_tasks.precompute_forecasts")
+def precompute_forecasts(days_out=FORECAST_TABLE_DAYS):
+    """
+    Precompute the default forecasts of every top-25 ticker into the forecast table.
+
+    Runs after the market close with fresh daily bars. Each sector's tickers are
+    advanced together on the warm sector models, then alerts are re-evaluated
+    against the new forecasts.
+    """
+    from resources.analysis_resource import SECTOR_TICKERS, forecast_sector
+
+    written, errors = 0, {}
+    for sector, tickers in SECTOR_TICKERS.items():
+        try:
+            forecasts, sector_errors = forecast_sector(sector, tickers, days_out, refresh=True)
+        except FileNotFoundError as e:
+            logger.error(f"Skipping {sector} forecasts: {e}")
+            errors.update({ticker: str(e) for ticker in tickers})
+            continue
+
+        errors.update(sector_errors)
+        if forecasts:
+            write_forecast_rows(forecasts)
+            written += len(forecasts)
+        logger.info(f"Precomputed {len(forecasts)} {sector} forecasts ({days_out} days).")
+
+    refresh_alerts.delay()
+    return {"written": written, "errors": errors}
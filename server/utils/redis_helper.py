@@ -1,66 +1,508 @@
+import os
 import json
+import time
+import uuid
 import logging
+import threading
 import redis
+import pandas as pd
 from config import redis_client
+from utils.local_cache import LocalCache
+from utils.circuit_breaker import CircuitBreaker
 import pickle
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 
 # Namespace for Redis keys to avoid collisions
 NAMESPACE = "market_ai"
 
+# In-process tier in front of Redis (0 bytes disables it), and the longest time it
+# serves a value without asking Redis in case an invalidation message was lost
+L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", 128 * 2 ** 20))
+L1_MAX_AGE = float(os.getenv("CACHE_L1_MAX_AGE", 300))
+# Writers announce changed keys to the other workers on this channel
+INVALIDATION_CHANNEL = f"{NAMESPACE}:cache:invalidate"
+INVALIDATION_RETRY_SECONDS = 5.0
+INVALIDATION_POLL_SECONDS = 1.0
+
+# Consecutive failed calls (errors, timeouts, or answers slower than SLOW_CALL_SECONDS)
+# after which Redis is left alone, and the backoff between reconnect attempts. Until
+# one succeeds, reads miss, writes stay in the local tier and locks are unavailable.
+BREAKER_FAILURES = int(os.getenv("CACHE_BREAKER_FAILURES", 3))
+BREAKER_RESET_SECONDS = float(os.getenv("CACHE_BREAKER_RESET_SECONDS", 1.0))
+BREAKER_MAX_RESET_SECONDS = float(os.getenv("CACHE_BREAKER_MAX_RESET_SECONDS", 60.0))
+SLOW_CALL_SECONDS = float(os.getenv("CACHE_SLOW_CALL_SECONDS", 1.0))
+
+# Cached values start with the magic, the format version and the tag of their codec;
+# values without the magic are plain pickles written before codecs existed
+CODEC_MAGIC = b"MAIC"
+CODEC_FORMAT_VERSION = 1
+# Preferred codec and Arrow compression ("zstd", "lz4" or "none")
+CACHE_CODEC = os.getenv("CACHE_CODEC", "arrow")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "lz4")
+
+
+class PickleCodec:
+    """
+    Any picklable value. Used for everything the preferred codec does not accept.
+    """
+    name = "pickle"
+    tag = b"P"
+
+    def accepts(self, value):
+        return True
+
+    def encode(self, value):
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload):
+        return pickle.loads(payload)
+
+
+class ArrowCodec:
+    """
+    pandas DataFrames as an Arrow IPC stream, optionally compressed.
+
+    Column types, the index and time zones are restored from the pandas
+    metadata stored with the schema, and the compression is recorded in the
+    IPC messages, so decoding needs no settings.
+    """
+    name = "arrow"
+    tag = b"A"
+
+    def __init__(self, compression=CACHE_COMPRESSION):
+        self.compression = None if compression in (None, "", "none") else compression
+
+    def accepts(self, value):
+        return pa is not None and isinstance(value, pd.DataFrame)
+
+    def encode(self, value):
+        table = pa.Table.from_pandas(value)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, payload):
+        if pa is None:
+            raise RuntimeError("Decoding Arrow cache values requires pyarrow.")
+        return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+
+
+# Codecs by tag; register_codec adds others
+CACHE_CODECS = {}
+
+
+def register_codec(codec):
+    """
+    Make `codec` available to encode_value (by name) and decode_value (by tag).
+
+    A codec has a unique one-byte `tag`, a `name`, and `accepts(value)`,
+    `encode(value)` and `decode(payload)` methods.
+    """
+    if len(codec.tag) != 1:
+        raise ValueError(f"Codec tags are one byte: {codec.tag!r}")
+    CACHE_CODECS[codec.tag] = codec
+
+
+register_codec(PickleCodec())
+register_codec(ArrowCodec())
+
+
+def _codec_named(name):
+    for codec in CACHE_CODECS.values():
+        if codec.name == name:
+            return codec
+    raise ValueError(f"Unknown cache codec: {name}")
+
+
+def encode_value(value, codec=None):
+    """
+    Serialize `value` with a header naming its codec.
+
+    Args:
+        codec (str): Codec to try first (default: CACHE_CODEC); values it does
+            not accept or cannot encode are pickled.
+
+    Returns:
+        bytes: Header followed by the codec's payload.
+    """
+    preferred = _codec_named(codec or CACHE_CODEC)
+    chosen = CACHE_CODECS[PickleCodec.tag]
+    payload = None
+    if preferred.accepts(value):
+        try:
+            payload = preferred.encode(value)
+            chosen = preferred
+        except Exception as e:
+            # e.g. object columns holding mixed types
+            logging.info(f"{preferred.name} codec cannot encode value, pickling it: {e}")
+    if payload is None:
+        payload = chosen.encode(value)
+    return CODEC_MAGIC + bytes([CODEC_FORMAT_VERSION]) + chosen.tag + payload
+
+
+def decode_value(data):
+    """
+    Deserialize a value written by encode_value, or a legacy plain pickle.
+    """
+    if not data.startswith(CODEC_MAGIC):
+        return pickle.loads(data)
+
+    header = len(CODEC_MAGIC) + 2
+    version, tag = data[len(CODEC_MAGIC)], data[len(CODEC_MAGIC) + 1:header]
+    if version != CODEC_FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache format version: {version}")
+    if tag not in CACHE_CODECS:
+        raise ValueError(f"Unknown cache codec tag: {tag!r}")
+    return CACHE_CODECS[tag].decode(memoryview(data)[header:])
+
 def generate_key(key):
     """
     Generate a namespaced Redis key.
     """
     return f"{NAMESPACE}:{key}" if not key.startswith(NAMESPACE) else key
 
-def get_from_cache(key):
+class CacheUnavailableError(RuntimeError):
+    """
+    Redis is unreachable or too slow, or its circuit breaker is open.
+    """
+
+
+local_cache = LocalCache(L1_MAX_BYTES, L1_MAX_AGE)
+redis_breaker = CircuitBreaker("Redis", BREAKER_FAILURES, BREAKER_RESET_SECONDS, BREAKER_MAX_RESET_SECONDS)
+_redis_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+# Identifies this process's own invalidations; the pid tells forked workers apart
+_instance = uuid.uuid4().hex
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def _origin():
+    return f"{os.getpid()}:{_instance}"
+
+
+def _count_redis(name):
+    with _stats_lock:
+        _redis_stats[name] += 1
+
+
+def call_redis(operation, description):
     """
-    Retrieve a value from Redis and deserialize it using Pickle.
+    Run `operation()` against Redis through the circuit breaker.
+
+    Raises:
+        CacheUnavailableError: If the circuit is open, or the call could not
+        connect or timed out. Other Redis errors (the request itself is wrong)
+        propagate unchanged.
     """
+    if redis_client is None or not redis_breaker.allow():
+        raise CacheUnavailableError(f"Redis unavailable, skipped {description}")
+    start = time.monotonic()
     try:
-        serialized_value = redis_client.get(key)  # Fetch raw binary data
-        if serialized_value is None:
-            logging.info(f"Cache miss for key: {key}")
-            return None
-        # Deserialize using Pickle
-        value = pickle.loads(serialized_value)
-        logging.info(f"Cache hit for key: {key}")
+        result = operation()
+    except (redis.ConnectionError, redis.TimeoutError) as e:
+        redis_breaker.record_failure()
+        raise CacheUnavailableError(f"Redis unavailable during {description}: {e}") from e
+    except Exception:
+        # Redis answered
+        redis_breaker.record_success()
+        raise
+    elapsed = time.monotonic() - start
+    if elapsed > SLOW_CALL_SECONDS:
+        logging.warning(f"Slow Redis call: {description} took {elapsed:.2f}s")
+        redis_breaker.record_failure()
+    else:
+        redis_breaker.record_success()
+    return result
+
+
+def _store_locally(key, value, nbytes, ttl):
+    # Readers of the previous value in this process must not store it after this write
+    local_cache.invalidate(key)
+    local_cache.put(key, value, nbytes, ttl)
+
+
+def _ensure_invalidation_listener():
+    """
+    Start the pub/sub listener once per process (workers forked after import need their own).
+    """
+    global _listener_pid
+    if L1_MAX_BYTES <= 0 or redis_client is None or _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener_pid = os.getpid()
+        threading.Thread(target=_listen_for_invalidations, name="cache-invalidation", daemon=True).start()
+
+
+def _listen_for_invalidations():
+    while True:
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Changes announced while not subscribed were missed
+            local_cache.invalidate()
+            while True:
+                # Polling keeps the socket timeout of the pool from ending an idle subscription
+                message = pubsub.get_message(timeout=INVALIDATION_POLL_SECONDS)
+                if message is not None:
+                    handle_invalidation(message["data"])
+        except Exception as e:
+            logging.warning(f"Cache invalidation listener disconnected: {e}")
+            time.sleep(INVALIDATION_RETRY_SECONDS)
+
+
+def handle_invalidation(data):
+    """
+    Drop a key announced by another process from the local tier.
+    """
+    origin, _, key = data.decode().partition(" ")
+    if origin != _origin():
+        local_cache.invalidate(key)
+
+
+def publish_invalidation(key):
+    """
+    Tell the other processes to drop `key` from their local tier.
+    """
+    try:
+        call_redis(lambda: redis_client.publish(INVALIDATION_CHANNEL, f"{_origin()} {key}"), f"PUBLISH {key}")
+    except Exception as e:
+        # Their entries still expire after L1_MAX_AGE
+        logging.warning(f"Could not publish cache invalidation for key {key}: {e}")
+
+
+def cache_stats():
+    """
+    Return the hit ratio of each tier (the local tier, then Redis for local
+    misses) and the state of the Redis circuit breaker.
+    """
+    with _stats_lock:
+        redis_stats = dict(_redis_stats)
+    lookups = redis_stats["hits"] + redis_stats["misses"]
+    redis_stats["hit_ratio"] = redis_stats["hits"] / lookups if lookups else None
+    return {"l1": local_cache.stats(), "redis": redis_stats, "circuit": redis_breaker.stats()}
+
+
+def get_from_cache(key):
+    """
+    Retrieve a value from the local tier, or from Redis and deserialize it with the codec named in its header.
+
+    Values read from Redis are kept decoded in the local tier until their
+    Redis TTL ends, another process announces a change or L1_MAX_AGE passes.
+    They are shared, not copied, so callers must not mutate them. While Redis
+    is unavailable, keys missing from the local tier are misses.
+    """
+    found, value = local_cache.get(key)
+    if found:
         return value
-    except (pickle.UnpicklingError, TypeError, KeyError) as e:
-        logging.error(f"Error deserializing cache for key {key}: {e}")
-        raise RuntimeError(f"Pickle deserialization error for key {key}: {e}")
+
+    _ensure_invalidation_listener()
+    generation = local_cache.generation()
+
+    def get_with_ttl():
+        # Value and remaining TTL in one round-trip
+        pipeline = redis_client.pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        return pipeline.execute()
+
+    try:
+        serialized_value, ttl_ms = call_redis(get_with_ttl, f"GET {key}")
+    except CacheUnavailableError as e:
+        logging.info(f"Cache miss for key {key}: {e}")
+        return None
     except Exception as e:
         logging.error(f"Error getting cache for key {key}: {e}")
         raise RuntimeError(f"Redis get error: {e}")
-    
-def set_to_cache(key, value, ttl=86400):
+
+    if serialized_value is None:
+        _count_redis("misses")
+        logging.info(f"Cache miss for key: {key}")
+        return None
+    try:
+        value = decode_value(serialized_value)
+    except (pickle.UnpicklingError, TypeError, KeyError, ValueError) as e:
+        logging.error(f"Error deserializing cache for key {key}: {e}")
+        raise RuntimeError(f"Cache deserialization error for key {key}: {e}")
+    _count_redis("hits")
+    local_cache.put(key, value, len(serialized_value), ttl_ms / 1000 if ttl_ms > 0 else None, generation)
+    logging.info(f"Cache hit for key: {key}")
+    return value
+
+def set_to_cache(key, value, ttl=86400, codec=None):
     """
-    Store a value in the Redis cache using Pickle.
+    Store a value in the Redis cache; DataFrames use the Arrow codec, other values Pickle.
+
+    While Redis is unavailable the value is kept in the local tier only.
+
+    Parameters:
+        codec (str): Codec to try first instead of CACHE_CODEC.
     """
     try:
-        # Serialize the value with Pickle
-        serialized_value = pickle.dumps(value)
-        redis_client.set(key, serialized_value, ex=ttl)
+        serialized_value = encode_value(value, codec)
+        _ensure_invalidation_listener()
+        call_redis(lambda: redis_client.set(key, serialized_value, ex=ttl), f"SET {key}")
+        _store_locally(key, value, len(serialized_value), ttl)
+        publish_invalidation(key)
         logging.info(f"Value set in cache for key: {key} with TTL: {ttl}")
+    except CacheUnavailableError as e:
+        _store_locally(key, value, len(serialized_value), ttl)
+        logging.info(f"Value for key {key} kept in the local tier only: {e}")
     except Exception as e:
         logging.error(f"Error setting cache for key {key}: {e}")
         raise RuntimeError(f"Redis set error: {e}")
 
 
+def get_many(keys):
+    """
+    Retrieve several values in one round-trip: the local tier first, then MGET for the rest.
+
+    Parameters:
+        keys (list): Cache keys, used as given (like get_from_cache).
+
+    Returns:
+        dict: Key to value, None for keys not cached (or not in the local tier
+        while Redis is unavailable).
+    """
+    values = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        found, value = local_cache.get(key)
+        if found:
+            values[key] = value
+        else:
+            missing.append(key)
+    if not missing:
+        return values
+
+    _ensure_invalidation_listener()
+    generation = local_cache.generation()
+
+    def get_with_ttls():
+        pipeline = redis_client.pipeline(transaction=False)
+        pipeline.mget(missing)
+        for key in missing:
+            pipeline.pttl(key)
+        return pipeline.execute()
+
+    try:
+        serialized_values, *ttls_ms = call_redis(get_with_ttls, f"MGET of {len(missing)} keys")
+    except CacheUnavailableError as e:
+        logging.info(f"Cache miss for {len(missing)} keys: {e}")
+        values.update(dict.fromkeys(missing))
+        return values
+    except Exception as e:
+        logging.error(f"Error getting {len(missing)} keys from cache: {e}")
+        raise RuntimeError(f"Redis get error: {e}")
+
+    for key, serialized_value, ttl_ms in zip(missing, serialized_values, ttls_ms):
+        if serialized_value is None:
+            _count_redis("misses")
+            values[key] = None
+            continue
+        try:
+            values[key] = decode_value(serialized_value)
+        except (pickle.UnpicklingError, TypeError, KeyError, ValueError) as e:
+            logging.error(f"Error deserializing cache for key {key}: {e}")
+            raise RuntimeError(f"Cache deserialization error for key {key}: {e}")
+        _count_redis("hits")
+        local_cache.put(key, values[key], len(serialized_value), ttl_ms / 1000 if ttl_ms > 0 else None, generation)
+    logging.info(f"Bulk cache read: {len(keys)} keys, {len(missing)} from Redis")
+    return values
+
+
+def set_many(values, ttl=86400, codec=None):
+    """
+    Store several values in one pipelined round-trip, or in the local tier only while Redis is unavailable.
+
+    Parameters:
+        values (dict): Key to value.
+        ttl (int | dict): Expiry in seconds for every key, or key to expiry.
+        codec (str): Codec to try first instead of CACHE_CODEC.
+    """
+    try:
+        encoded = {}
+        for key, value in values.items():
+            key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+            encoded[key] = (encode_value(value, codec), key_ttl)
+        _ensure_invalidation_listener()
+
+        def set_all():
+            pipeline = redis_client.pipeline(transaction=False)
+            for key, (serialized_value, key_ttl) in encoded.items():
+                pipeline.set(key, serialized_value, ex=key_ttl)
+                # Announced in the same round-trip
+                pipeline.publish(INVALIDATION_CHANNEL, f"{_origin()} {key}")
+            pipeline.execute()
+
+        call_redis(set_all, f"SET of {len(values)} keys")
+        logging.info(f"Values set in cache for {len(values)} keys")
+    except CacheUnavailableError as e:
+        logging.info(f"Values for {len(values)} keys kept in the local tier only: {e}")
+    except Exception as e:
+        logging.error(f"Error setting {len(values)} keys in cache: {e}")
+        raise RuntimeError(f"Redis set error: {e}")
+    for key, (serialized_value, key_ttl) in encoded.items():
+        _store_locally(key, values[key], len(serialized_value), key_ttl)
+
+
+def exists_many(keys):
+    """
+    Check several keys in one pipelined round-trip.
+
+    Parameters:
+        keys (list): Cache keys (namespaced like cache_key_exists).
+
+    Returns:
+        dict: Key to True if it exists; False for every key while Redis is unavailable.
+    """
+    keys = list(dict.fromkeys(keys))
+
+    def exists_all():
+        pipeline = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.exists(generate_key(key))
+        return pipeline.execute()
+
+    try:
+        return {key: count > 0 for key, count in zip(keys, call_redis(exists_all, f"EXISTS of {len(keys)} keys"))}
+    except CacheUnavailableError as e:
+        logging.info(f"Treating {len(keys)} keys as missing: {e}")
+        return dict.fromkeys(keys, False)
+    except redis.ConnectionError as e:
+        logging.error(f"Redis connection error while checking {len(keys)} keys: {str(e)}")
+        raise RuntimeError(f"Redis connection error: {str(e)}")
+
+
 def delete_from_cache(key):
     """
-    Delete a value from the Redis cache.
+    Delete a value from the Redis cache (only from the local tier while Redis is unavailable).
 
     Parameters:
         key (str): The cache key.
     """
+    namespaced_key = generate_key(key)
     try:
-        namespaced_key = generate_key(key)
-        redis_client.delete(namespaced_key)
+        call_redis(lambda: redis_client.delete(namespaced_key), f"DEL {namespaced_key}")
+        for local_key in {key, namespaced_key}:
+            local_cache.invalidate(local_key)
+            publish_invalidation(local_key)
         logging.info(f"Key deleted from cache: {namespaced_key}")
+    except CacheUnavailableError as e:
+        for local_key in {key, namespaced_key}:
+            local_cache.invalidate(local_key)
+        logging.warning(f"Key {namespaced_key} deleted from the local tier only: {e}")
     except redis.ConnectionError as e:
         logging.error(f"Redis connection error while deleting key {key}: {str(e)}")
         raise RuntimeError(f"Redis connection error: {str(e)}")
@@ -74,13 +516,16 @@ def cache_key_exists(key):
         key (str): The cache key.
 
     Returns:
-        bool: True if the key exists, False otherwise.
+        bool: True if the key exists, False otherwise (or while Redis is unavailable).
     """
     try:
         namespaced_key = generate_key(key)
-        exists = redis_client.exists(namespaced_key) > 0
+        exists = call_redis(lambda: redis_client.exists(namespaced_key), f"EXISTS {namespaced_key}") > 0
         logging.info(f"Key exists check for {namespaced_key}: {exists}")
         return exists
+    except CacheUnavailableError as e:
+        logging.info(f"Treating key {key} as missing: {e}")
+        return False
     except redis.ConnectionError as e:
         logging.error(f"Redis connection error while checking key {key}: {str(e)}")
         raise RuntimeError(f"Redis connection error: {str(e)}")
@@ -99,10 +544,10 @@ def increment_cache_key(key, amount=1):
     """
     try:
         namespaced_key = generate_key(key)
-        new_value = redis_client.incrby(namespaced_key, amount)
+        new_value = call_redis(lambda: redis_client.incrby(namespaced_key, amount), f"INCRBY {namespaced_key}")
         logging.info(f"Incremented key {namespaced_key} by {amount}. New value: {new_value}")
         return new_value
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, CacheUnavailableError) as e:
         logging.error(f"Redis connection error while incrementing key {key}: {str(e)}")
         raise RuntimeError(f"Redis connection error: {str(e)}")
 
@@ -119,25 +564,79 @@ def get_ttl(key):
     """
     try:
         namespaced_key = generate_key(key)
-        ttl = redis_client.ttl(namespaced_key)
+        ttl = call_redis(lambda: redis_client.ttl(namespaced_key), f"TTL {namespaced_key}")
         logging.info(f"TTL for key {namespaced_key}: {ttl}")
         return ttl
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, CacheUnavailableError) as e:
         logging.error(f"Redis connection error while getting TTL for key {key}: {str(e)}")
         raise RuntimeError(f"Redis connection error: {str(e)}")
 
+# Deletes a lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_lock(key, ttl_ms=30000):
+    """
+    Try to take a short-lived Redis lock with SET NX PX.
+
+    Parameters:
+        key (str): The lock key.
+        ttl_ms (int): Lock expiry in milliseconds, so a crashed holder cannot block others.
+
+    Returns:
+        str or None: A token to release the lock with, or None if it is held elsewhere.
+    """
+    try:
+        namespaced_key = generate_key(key)
+        token = uuid.uuid4().hex
+        if call_redis(lambda: redis_client.set(namespaced_key, token, nx=True, px=ttl_ms), f"lock {namespaced_key}"):
+            logging.info(f"Lock acquired: {namespaced_key}")
+            return token
+        return None
+    except Exception as e:
+        logging.error(f"Redis error while acquiring lock {key}: {str(e)}")
+        raise RuntimeError(f"Redis lock error: {str(e)}")
+
+
+def release_lock(key, token):
+    """
+    Release a lock taken with `acquire_lock`, unless it expired and was taken by someone else.
+
+    Returns:
+        bool: True if the lock was released.
+    """
+    try:
+        namespaced_key = generate_key(key)
+        released = call_redis(
+            lambda: redis_client.eval(RELEASE_LOCK_SCRIPT, 1, namespaced_key, token), f"unlock {namespaced_key}"
+        ) == 1
+        logging.info(f"Lock released: {namespaced_key} ({released})")
+        return released
+    except Exception as e:
+        logging.error(f"Redis error while releasing lock {key}: {str(e)}")
+        raise RuntimeError(f"Redis lock error: {str(e)}")
+
 import logging
 
 logger = logging.getLogger(__name__)
 
 def cache_predictions(key, predictions, ttl=3600):
     logger.debug(f"Caching predictions with key={key}, ttl={ttl}")
-    redis_client.setex(key, ttl, json.dumps(predictions))
+    call_redis(lambda: redis_client.setex(key, ttl, json.dumps(predictions)), f"SETEX {key}")
     logger.info(f"Cached predictions: {predictions}")
 
 def get_cached_predictions(key):
     logger.debug(f"Fetching cached predictions with key={key}")
-    data = redis_client.get(key)
+    try:
+        data = call_redis(lambda: redis_client.get(key), f"GET {key}")
+    except CacheUnavailableError as e:
+        logger.warning(f"Cache miss for key={key}: {e}")
+        return None
     if data:
         logger.debug(f"Cache hit for key={key}")
     else:
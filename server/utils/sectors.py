@@ -0,0 +1,9 @@
+# Top-25 tickers covered by each sector model
+SECTOR_TICKERS = {
+    "tech": ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "ADBE", "AVGO", "CRM", "INTC", "AMD", "CSCO", "QCOM", "TXN", "INTU", "ORCL", "IBM", "V", "PYPL", "ADI", "SNOW", "SHOP", "NOW", "SQ", "MA"],
+    "finance": ["JPM", "BAC", "WFC", "GS", "MS", "PNC", "USB", "AXP", "RY", "TD", "SPGI", "CB", "CME", "MET", "ICE", "HSBC", "MCO", "SCHW", "COF", "C", "BLK", "BNS", "MUFG", "BMO", "CINF"],
+    "health": ["JNJ", "PFE", "MRK", "TMO", "UNH", "ABBV", "LLY", "BMY", "AMGN", "CVS", "MDT", "ABT", "SYK", "DHR", "BSX", "GILD", "HCA", "EW", "REGN", "CI", "IQV", "ILMN", "HUM", "ZBH", "BAX"],
+}
+
+# Span of the "recent" training datasets, as fetched by top_25_stocks_per_sector_fetch
+RECENT_DAYS = 365 * 2
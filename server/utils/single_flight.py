@@ -0,0 +1,231 @@
+import math
+import time
+import random
+import logging
+import threading
+from utils.redis_helper import acquire_lock, release_lock, cache_key_exists
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+# Namespace of the cross-worker single-flight locks
+LOCK_PREFIX = "market_ai:lock"
+DEFAULT_LOCK_TTL_MS = 30000  # Longest expected computation
+DEFAULT_WAIT_TIMEOUT = 30.0  # Seconds a worker waits on another worker's result
+DEFAULT_POLL_INTERVAL = 0.05
+# XFetch β: values above 1 refresh earlier before expiry, below 1 later
+DEFAULT_EARLY_REFRESH_BETA = 1.0
+
+# Every group by name, for the /cache/stats endpoint
+_groups = {}
+
+
+class _Call:
+    """
+    One in-flight computation that followers in the same process wait on.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical computations so only one runs per key.
+
+    Within a process, callers arriving while a key is being computed wait for
+    the first caller (the leader) and share its result or exception. Across
+    workers, the leader also holds a short-lived Redis lock; a worker that
+    finds the lock taken polls `lookup` (usually a cache read) until the
+    holder has published its result, and computes itself only if the lock
+    disappears or the wait times out. Results are shared, not copied, so
+    callers must not mutate them.
+    """
+
+    def __init__(self, name, lock_ttl_ms=DEFAULT_LOCK_TTL_MS, wait_timeout=DEFAULT_WAIT_TIMEOUT,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        self.name = name
+        self.lock_ttl_ms = lock_ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "leaders": 0, "coalesced_local": 0, "coalesced_remote": 0, "lock_fallbacks": 0,
+            "refreshes": 0, "refreshes_skipped": 0, "refresh_errors": 0,
+        }
+        _groups[name] = self
+
+    def do(self, key, compute, lookup=None):
+        """
+        Return `compute()` for a key, running it at most once among concurrent callers.
+
+        Args:
+            key (str): Identity of the computation.
+            compute (callable): Produces the result; expected to publish it where `lookup` finds it.
+            lookup (callable): Reads a result published by another worker, or returns None.
+                Without it, coalescing stays within the process.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced_local"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_once_across_workers(key, compute, lookup)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_once_across_workers(self, key, compute, lookup):
+        if lookup is None:
+            return compute()
+
+        lock_key = f"{LOCK_PREFIX}:{self.name}:{key}"
+        try:
+            token = acquire_lock(lock_key, self.lock_ttl_ms)
+        except RuntimeError as e:
+            # Redis is unavailable: in-process coalescing still applies
+            logging.warning(f"Single-flight lock unavailable for {lock_key}: {e}")
+            return compute()
+
+        if token is not None:
+            try:
+                return compute()
+            finally:
+                try:
+                    release_lock(lock_key, token)
+                except RuntimeError as e:
+                    # The lock expires on its own
+                    logging.warning(f"Could not release {lock_key}: {e}")
+
+        # Another worker is computing: wait for its result
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            result = lookup()
+            if result is not None:
+                self._count("coalesced_remote")
+                return result
+            if not cache_key_exists(lock_key):
+                break
+            time.sleep(self.poll_interval)
+
+        result = lookup()
+        if result is not None:
+            self._count("coalesced_remote")
+            return result
+        logging.warning(f"No result published under {lock_key}; computing locally.")
+        self._count("lock_fallbacks")
+        return compute()
+
+    def refresh(self, key, compute):
+        """
+        Recompute a key in a background thread while callers keep using its current value.
+
+        Nothing starts if the key is already being computed in this process,
+        or in another worker holding the key's Redis lock (the one `do` takes).
+        The lock expires after `lock_ttl_ms`, so a worker that dies mid-refresh
+        does not block the key.
+
+        Returns:
+            bool: True if this call started the refresh.
+        """
+        with self._lock:
+            busy = key in self._refreshing or key in self._calls
+            if not busy:
+                self._refreshing.add(key)
+        if busy:
+            self._count("refreshes_skipped")
+            return False
+
+        lock_key = f"{LOCK_PREFIX}:{self.name}:{key}"
+        try:
+            token = acquire_lock(lock_key, self.lock_ttl_ms)
+        except RuntimeError as e:
+            # Without Redis the current value is served until it expires
+            logging.warning(f"Single-flight lock unavailable for {lock_key}: {e}")
+            token = None
+        if token is None:
+            with self._lock:
+                self._refreshing.discard(key)
+            self._count("refreshes_skipped")
+            return False
+
+        def run():
+            try:
+                compute()
+            except Exception as e:
+                logging.error(f"Background refresh of {key} failed: {e}")
+                self._count("refresh_errors")
+            finally:
+                try:
+                    release_lock(lock_key, token)
+                except RuntimeError as e:
+                    # The lock expires on its own
+                    logging.warning(f"Could not release {lock_key}: {e}")
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._count("refreshes")
+        threading.Thread(target=run, name=f"refresh:{self.name}:{key}", daemon=True).start()
+        return True
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """
+        Return leader and coalesced request counts.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+            stats["refreshing"] = len(self._refreshing)
+        stats["coalesced"] = stats["coalesced_local"] + stats["coalesced_remote"]
+        return stats
+
+
+def should_refresh(expires_at, delta, beta=DEFAULT_EARLY_REFRESH_BETA, now=None, rng=random):
+    """
+    Probabilistic early expiry (XFetch): whether a reader should refresh a value now.
+
+    Each reader refreshes with a probability that rises as expiry approaches,
+    scaled by `delta`, the time the last computation took. Readers spread
+    out their refreshes instead of all missing at the expiry instant.
+
+    Args:
+        expires_at (float): Epoch seconds at which the value stops being fresh.
+        delta (float): Seconds the value took to compute.
+
+    Returns:
+        bool: True once expired, and with rising probability shortly before.
+    """
+    now = time.time() if now is None else now
+    # 1 - random() lies in (0, 1], so the logarithm is finite and <= 0
+    return now - delta * beta * math.log(1.0 - rng.random()) >= expires_at
+
+
+def single_flight_stats():
+    """
+    Return the stats of every single-flight group in this process.
+    """
+    return {name: group.stats() for name, group in _groups.items()}
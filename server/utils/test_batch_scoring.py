@@ -0,0 +1,61 @@
+import logging
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from utils.batch_scoring import BatchScorer
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def make_model(n_outputs=1):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 5))
+    y = X[:, 0] + rng.normal(scale=0.1, size=300)
+    if n_outputs > 1:
+        y = np.column_stack([y * (i + 1) for i in range(n_outputs)])
+    return RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_batches_are_returned_in_input_order(tmp_path, backend):
+    """
+    Test that batched parallel scoring equals a single predict call, row for row.
+    """
+    model = make_model()
+    model_path = tmp_path / "rf_tech_recent.joblib"
+    dump(model, model_path)
+    X = np.random.default_rng(1).normal(size=(1037, 5))
+
+    scorer = BatchScorer(model_path=str(model_path), batch_size=100, n_workers=3, backend=backend)
+
+    np.testing.assert_array_equal(scorer.predict(X), model.predict(X))
+
+
+def test_multi_output_models_keep_one_column_per_target():
+    """
+    Test the output shape of multi-output models.
+    """
+    model = make_model(n_outputs=2)
+    X = np.random.default_rng(2).normal(size=(250, 5))
+
+    predictions = BatchScorer(model=model, batch_size=64, n_workers=2, backend="thread").predict(X)
+
+    assert predictions.shape == (250, 2)
+    np.testing.assert_array_equal(predictions, model.predict(X))
+
+
+def test_only_tree_ensembles_are_scored_in_float32():
+    """
+    Test that non-tree models keep float64 inputs and their exact predictions.
+    """
+    X = np.random.default_rng(3).normal(size=(500, 5)) * 1e3
+    y = X @ np.array([1.0, -2.0, 0.5, 3.0, 1e-3]) + 1e-4
+    linear = LinearRegression().fit(X, y)
+
+    scorer = BatchScorer(model=linear, batch_size=64, n_workers=2, backend="thread")
+    assert scorer.dtype == np.float64
+    np.testing.assert_array_equal(scorer.predict(X), linear.predict(X))
+    assert BatchScorer(model=make_model()).dtype == np.float32
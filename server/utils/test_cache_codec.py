@@ -0,0 +1,51 @@
+import logging
+import pickle
+import pandas as pd
+import pytest
+from utils import redis_helper
+from utils.redis_helper import CODEC_MAGIC, ArrowCodec, encode_value, decode_value
+from utils.indicator_engine import add_indicators
+from benchmarks.fixtures import make_minute_bars
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+requires_pyarrow = pytest.mark.skipif(redis_helper.pa is None, reason="pyarrow is not installed")
+
+
+def test_values_name_their_codec():
+    """
+    Test that non-frame values are pickled behind a header and legacy pickles still decode.
+    """
+    value = {"days_out": 3, "historical": [1.0, 2.0, 3.0]}
+    encoded = encode_value(value)
+    assert encoded.startswith(CODEC_MAGIC + bytes([redis_helper.CODEC_FORMAT_VERSION]) + b"P")
+    assert decode_value(encoded) == value
+    assert decode_value(pickle.dumps(value)) == value
+
+    with pytest.raises(ValueError):
+        decode_value(CODEC_MAGIC + bytes([redis_helper.CODEC_FORMAT_VERSION]) + b"?" + b"payload")
+
+
+@requires_pyarrow
+@pytest.mark.parametrize("compression", ["none", "lz4", "zstd"])
+def test_arrow_round_trip_keeps_types(monkeypatch, compression):
+    """
+    Test that transformed frames come back with their dtypes, time zone and index.
+    """
+    monkeypatch.setitem(redis_helper.CACHE_CODECS, ArrowCodec.tag, ArrowCodec(compression))
+    frame = add_indicators(make_minute_bars(2))
+    encoded = encode_value(frame)
+    assert encoded[len(CODEC_MAGIC) + 1:len(CODEC_MAGIC) + 2] == b"A"
+    pd.testing.assert_frame_equal(decode_value(encoded), frame, check_exact=True)
+
+
+@requires_pyarrow
+def test_frames_arrow_cannot_encode_are_pickled():
+    """
+    Test the fallback for object columns holding mixed types.
+    """
+    frame = pd.DataFrame({"value": [1, "a", 2.5]})
+    encoded = encode_value(frame)
+    assert encoded[len(CODEC_MAGIC) + 1:len(CODEC_MAGIC) + 2] == b"P"
+    pd.testing.assert_frame_equal(decode_value(encoded), frame)
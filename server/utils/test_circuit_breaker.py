@@ -0,0 +1,97 @@
+import os
+import sys
+import random
+import subprocess
+import logging
+import pytest
+import redis
+from utils import redis_helper
+from utils.local_cache import LocalCache
+from utils.circuit_breaker import CircuitBreaker
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_circuit_opens_backs_off_and_closes(clock):
+    """
+    Test the failure threshold, the single half-open probe and the doubling backoff.
+    """
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=1.0, max_reset_timeout=3.0,
+                             clock=clock, rng=random.Random(0))
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state() == "open" and not breaker.allow()
+
+    clock.now = 1.0  # The jittered backoff is at most reset_timeout
+    assert breaker.allow() and not breaker.allow()  # One probe at a time
+    breaker.record_failure()
+    assert breaker.state() == "open"
+    clock.now = 2.0
+    assert not breaker.allow()  # Backoff doubled to 2s
+    clock.now = 3.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state() == "closed" and breaker.allow()
+
+    stats = breaker.stats()
+    assert stats["trips"] == 1 and stats["probes"] == 2 and stats["recoveries"] == 1 and stats["rejected"] == 3
+
+
+class DownRedis:
+    """
+    A client whose every call fails like an unreachable server.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            self.calls += 1
+            raise redis.ConnectionError("Connection refused")
+        return fail
+
+
+def test_cache_degrades_to_the_local_tier(monkeypatch):
+    """
+    Test that reads miss, writes stay local and locks fail fast while Redis is down.
+    """
+    client = DownRedis()
+    monkeypatch.setattr(redis_helper, "redis_client", client)
+    monkeypatch.setattr(redis_helper, "local_cache", LocalCache(max_bytes=1 << 20, max_age=60))
+    monkeypatch.setattr(redis_helper, "redis_breaker", CircuitBreaker("Redis", failure_threshold=2))
+    monkeypatch.setattr(redis_helper, "_listener_pid", os.getpid())
+
+    assert redis_helper.get_from_cache("market_ai:test:down") is None
+    redis_helper.set_to_cache("market_ai:test:down", {"close": 1.0}, ttl=60)
+    assert redis_helper.get_from_cache("market_ai:test:down") == {"close": 1.0}
+    assert redis_helper.get_many(["market_ai:test:down", "market_ai:test:other"]) == {
+        "market_ai:test:down": {"close": 1.0}, "market_ai:test:other": None,
+    }
+    assert redis_helper.cache_key_exists("test:down") is False
+
+    # The circuit opened after two failures: Redis is no longer called
+    assert client.calls == 2 and redis_helper.cache_stats()["circuit"]["state"] == "open"
+    with pytest.raises(RuntimeError):
+        redis_helper.acquire_lock("lock:test:down")
+    assert client.calls == 2
+
+
+def test_app_starts_when_redis_times_out():
+    """
+    Test that a hung Redis (a timeout, not a refused connection) does not stop the app from importing.
+    """
+    script = (
+        "import redis\n"
+        "def ping(self):\n"
+        "    raise redis.TimeoutError('Timeout connecting to server')\n"
+        "redis.StrictRedis.ping = ping\n"
+        "import app\n"
+        "from config import redis_client\n"
+        "assert redis_client is not None\n"
+    )
+    server_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    result = subprocess.run([sys.executable, "-c", script], cwd=server_root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
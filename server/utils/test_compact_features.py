@@ -0,0 +1,51 @@
+import logging
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from utils.compact_features import FLOAT32_RTOL, compact_frame, feature_drift, sliding_windows
+from utils.indicator_engine import FEATURE_COLUMNS, add_indicators
+from benchmarks.fixtures import make_ohlcv
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_float32_indicators_stay_within_rounding():
+    """
+    Test that compact indicator columns only differ from float64 by one rounding.
+    """
+    data = make_ohlcv(2000)
+    reference = add_indicators(data.copy())
+    compact = add_indicators(data.copy(), dtype=np.float32)
+
+    derived = [name for name in FEATURE_COLUMNS if name not in data.columns]
+    assert all(compact[name].dtype == np.float32 for name in derived)
+    drift = feature_drift(reference[derived], compact[derived])
+    assert max(drift.values()) <= FLOAT32_RTOL, drift
+
+
+def test_sliding_windows_match_copied_windows():
+    """
+    Test the zero-copy windows against the list of sliced windows they replace.
+    """
+    features = np.random.default_rng(0).normal(size=(260, 4))
+    windows = sliding_windows(features, 200)
+    legacy = np.array([features[i:i + 200] for i in range(len(features) - 200 + 1)])
+
+    assert windows.shape == legacy.shape and windows.dtype == np.float32
+    np.testing.assert_array_equal(windows, legacy.astype(np.float32))
+    assert np.shares_memory(windows[0], windows[-1])
+    assert sliding_windows(features[:50], 200).shape == (0, 200, 4)
+
+
+def test_forest_is_unchanged_by_compact_inputs():
+    """
+    Test that fitting and predicting on float32 features gives the float64 forest's predictions.
+    """
+    data = add_indicators(make_ohlcv(400))
+    X = data[FEATURE_COLUMNS]
+    y = data["Close"].shift(-1).ffill().to_numpy()
+
+    reference = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    compact = RandomForestRegressor(n_estimators=5, random_state=0).fit(compact_frame(X), y)
+
+    np.testing.assert_array_equal(compact.predict(compact_frame(X)), reference.predict(X))
@@ -0,0 +1,128 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from utils import feature_store
+from utils.indicator_engine import add_indicators, rolling_mean
+from benchmarks.fixtures import make_ohlcv
+
+pytestmark = pytest.mark.skipif(feature_store.pa is None, reason="pyarrow is not installed")
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def make_universe(tickers, rows=800):
+    return pd.concat(
+        [make_ohlcv(rows, seed=seed).assign(Ticker=ticker) for seed, ticker in enumerate(tickers)],
+        ignore_index=True,
+    )
+
+
+def test_round_trip_matches_per_ticker_features(tmp_path):
+    """
+    Test that stored features equal the engine's output for each ticker.
+    """
+    raw = make_universe(["AAPL", "MSFT"])
+    version = feature_store.write_features(raw, root=str(tmp_path))
+
+    assert feature_store.has_version(version, root=str(tmp_path))
+    stored = feature_store.read_features(["MSFT"], root=str(tmp_path))
+    expected = add_indicators(raw[raw["Ticker"] == "MSFT"].drop(columns=["Ticker"]).reset_index(drop=True), fill="ffill")
+
+    assert list(stored["Ticker"].unique()) == ["MSFT"]
+    for name in ["Close", "RSI", "Parabolic_SAR", "OBV"]:
+        np.testing.assert_allclose(stored[name], expected[name], rtol=1e-12)
+
+
+def test_projection_and_date_pushdown(tmp_path):
+    """
+    Test column projection, date-range filtering and year partition layout.
+    """
+    root = str(tmp_path)
+    feature_store.write_features(make_universe(["AAPL", "MSFT", "NVDA"]), root=root)
+
+    frame = feature_store.read_features(["AAPL", "NVDA"], columns=["RSI"], start="2001-03-01", end="2002-06-30", root=root)
+
+    assert list(frame.columns) == ["Ticker", "Date", "RSI"]
+    assert set(frame["Ticker"]) == {"AAPL", "NVDA"}
+    assert frame["Date"].min() >= pd.Timestamp("2001-03-01")
+    assert frame["Date"].max() <= pd.Timestamp("2002-06-30")
+    assert sorted(os.listdir(os.path.join(feature_store.version_path(root=root), "Ticker=AAPL")))[0] == "year=2000"
+
+
+def test_version_follows_indicator_configuration(tmp_path, monkeypatch):
+    """
+    Test that changing an indicator parameter targets a new, empty version.
+    """
+    root = str(tmp_path)
+    feature_store.write_features(make_universe(["AAPL"], rows=100), root=root)
+    version = feature_store.feature_version()
+
+    indicators = feature_store.indicator_engine.INDICATORS.copy()
+    indicators.declare("_average_gain", rolling_mean, ["_gain"], replace=True, window=21)
+    monkeypatch.setattr(feature_store.indicator_engine, "INDICATORS", indicators)
+
+    assert feature_store.feature_version() != version
+    assert not feature_store.has_version(root=root)
+    with pytest.raises(FileNotFoundError):
+        feature_store.read_features(root=root)
+
+
+def test_csv_fallback_matches_stored_features(tmp_path, monkeypatch):
+    """
+    Test that training data read from a pooled CSV equals the store's per-ticker features.
+    """
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "ml_components", "RF_multi_output"))
+    import train_rf_multi_output
+
+    root = str(tmp_path / "store")
+    raw = make_universe(["AAPL", "MSFT", "NVDA"], rows=300)
+    feature_store.write_features(raw, root=root)
+    expected = feature_store.read_features(root=root).drop(columns=feature_store.KEY_COLUMNS)
+
+    # Rows of the tickers interleaved, with a stale indicator column as shipped in the datasets
+    path = tmp_path / "final_enhanced_top25_tech_historical.csv"
+    raw.sample(frac=1, random_state=0).assign(MA_10=0.0).to_csv(path, index=False)
+    monkeypatch.setattr(train_rf_multi_output, "has_version", lambda: False)
+
+    data = train_rf_multi_output.load_dataset(str(path))
+    pd.testing.assert_frame_equal(data, expected, check_exact=False, rtol=1e-12)
+    subset = train_rf_multi_output.load_dataset(str(path), ["Close", "RSI", "MACD_Hist"])
+    assert set(subset.columns) >= {"Close", "RSI", "MACD_Hist"}
+    pd.testing.assert_frame_equal(subset, expected[subset.columns], check_exact=False, rtol=1e-12)
+
+
+def test_store_is_read_for_the_dataset_window_only_if_it_covers_it(tmp_path, monkeypatch):
+    """
+    Test that the store serves exactly the dataset's rows, and the CSV is used when the store lacks some.
+    """
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "ml_components", "RF_multi_output"))
+    import train_rf_multi_output
+
+    root = str(tmp_path / "store")
+    raw = make_universe(["AAPL", "MSFT"], rows=300)
+    feature_store.write_features(raw[raw["Date"] < raw["Date"].iloc[250]], root=root)
+    stored = feature_store.read_features(root=root)
+
+    def read_features(*args, **kwargs):
+        return feature_store.read_features(*args, root=root, **kwargs)
+
+    monkeypatch.setattr(train_rf_multi_output, "has_version", lambda: True)
+    monkeypatch.setattr(train_rf_multi_output, "read_features", read_features)
+
+    # A recent dataset inside the stored history: its rows, warmed up on the whole history
+    recent = raw.groupby("Ticker").nth(slice(200, 250))
+    path = tmp_path / "final_enhanced_top25_tech_recent.csv"
+    recent.to_csv(path, index=False)
+    data = train_rf_multi_output.load_dataset(str(path), ["Close", "RSI"])
+    expected = stored[stored["Date"] >= recent["Date"].min()].reset_index(drop=True)
+    pd.testing.assert_frame_equal(data, expected[["Close", "RSI"]])
+
+    # A dataset exported after the store was built: computed from the CSV
+    path = tmp_path / "final_enhanced_top25_tech_historical.csv"
+    raw.to_csv(path, index=False)
+    data = train_rf_multi_output.load_dataset(str(path))
+    assert len(data) == len(raw)
+    pd.testing.assert_frame_equal(data, feature_store.compute_features(raw).drop(columns=feature_store.KEY_COLUMNS))
@@ -0,0 +1,67 @@
+import logging
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from utils.flat_forest import FlatForest, export_flat_forest
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def make_forest(n_outputs=1, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(400, 6)), columns=[f"f{i}" for i in range(6)])
+    y = X["f0"] * 2 + np.sin(X["f1"]) + rng.normal(scale=0.1, size=len(X))
+    if n_outputs > 1:
+        y = np.column_stack([y * (i + 1) for i in range(n_outputs)])
+    model = RandomForestRegressor(n_estimators=20, random_state=seed).fit(X, y)
+    return model, X
+
+
+def test_single_row_matches_sklearn():
+    """
+    Test that a flattened forest reproduces `predict` for one row at a time.
+    """
+    model, X = make_forest()
+    forest = FlatForest.from_estimator(model)
+
+    for row in X.to_numpy()[:25]:
+        expected = model.predict(pd.DataFrame([row], columns=X.columns))
+        np.testing.assert_allclose(forest.predict(row), expected, rtol=1e-12)
+
+
+def test_batch_matches_sklearn():
+    """
+    Test batched predictions, including rows outside the training range.
+    """
+    model, X = make_forest()
+    forest = FlatForest.from_estimator(model)
+    rows = np.vstack([X.to_numpy(), np.random.default_rng(1).normal(scale=5, size=(50, 6))])
+
+    np.testing.assert_allclose(forest.predict(rows), model.predict(pd.DataFrame(rows, columns=X.columns)), rtol=1e-12)
+    assert list(forest.feature_names_in_) == list(X.columns)
+
+
+def test_multi_output_matches_sklearn():
+    """
+    Test that multi-output forests keep one column per target.
+    """
+    model, X = make_forest(n_outputs=3)
+    forest = FlatForest.from_estimator(model)
+
+    predictions = forest.predict(X.to_numpy()[:10])
+    assert predictions.shape == (10, 3)
+    np.testing.assert_allclose(predictions, model.predict(X.iloc[:10]), rtol=1e-12)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    """
+    Test that an exported forest predicts identically after reloading.
+    """
+    model, X = make_forest()
+    path = tmp_path / "rf_tech_recent_flat.npz"
+    exported = export_flat_forest(model, path)
+    loaded = FlatForest.load(path)
+
+    np.testing.assert_array_equal(loaded.predict(X.to_numpy()), exported.predict(X.to_numpy()))
+    assert list(loaded.feature_names_in_) == list(X.columns)
@@ -0,0 +1,73 @@
+import logging
+import numpy as np
+from utils.forecast import iter_forecast, forecast_bands, prepare_input_row
+from utils.indicator_state import IndicatorState
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_single_path_reproduces_scalar_noise_draws(make_history, drift_model):
+    """
+    Test that a one-series batch consumes the random stream like the scalar loop.
+    """
+    history = make_history(150)
+    model = drift_model(0.1)
+    input_row = prepare_input_row(history, model.feature_names_in_)
+    state = IndicatorState.from_history(history)
+
+    steps = list(iter_forecast(model, model, input_row, state.repeat(1), 10, np.random.RandomState(1)))
+
+    rng = np.random.RandomState(1)
+    close = history["Close"].iloc[-1]
+    for day, (historical, _) in enumerate(steps):
+        volatility = state.close_volatility()
+        scale = rng.uniform(0.0000000000016180339887, 1.0)
+        rng.uniform(0.0000000000016180339887, 1.0)
+        noise = rng.normal(0, scale * (volatility / 1.6180339887 ** 2))
+        rng.normal(0, 1.0)
+        close = close + 0.1 + noise
+        state.advance(close)
+        assert np.isclose(historical[0], close), f"Day {day + 1} diverged"
+
+
+def test_forecast_bands_are_ordered(make_history, drift_model):
+    """
+    Test the per-day quantile bands produced for many paths.
+    """
+    history = make_history(150)
+    model = drift_model(0.0)
+    input_row = prepare_input_row(history, model.feature_names_in_)
+    state = IndicatorState.from_history(history)
+
+    bands = forecast_bands(model, model, input_row, state, 15, 500, np.random.RandomState(3))
+
+    for timeframe in ("historical", "recent"):
+        summary = bands[timeframe]
+        assert all(len(summary[name]) == 15 for name in ("mean", "p5", "p50", "p95"))
+        assert np.all(np.array(summary["p5"]) <= np.array(summary["p50"]))
+        assert np.all(np.array(summary["p50"]) <= np.array(summary["p95"]))
+
+
+def test_per_series_sources_match_independent_forecasts(make_history, drift_model):
+    """
+    Test that a batch with one random source per series reproduces each series run alone.
+    """
+    histories = [make_history(150, seed=seed) for seed in (1, 2, 3)]
+    model = drift_model(0.1)
+    input_rows = np.vstack([prepare_input_row(history, model.feature_names_in_) for history in histories])
+    states = [IndicatorState.from_history(history) for history in histories]
+
+    batched = list(iter_forecast(
+        model, model, input_rows, IndicatorState.concat(states), 12,
+        [np.random.RandomState(seed) for seed in (10, 20, 30)],
+    ))
+
+    for column, (history, seed) in enumerate(zip(histories, (10, 20, 30))):
+        alone = list(iter_forecast(
+            model, model, input_rows[column:column + 1], IndicatorState.from_history(history).repeat(1), 12,
+            np.random.RandomState(seed),
+        ))
+        for (historical, recent), (expected_historical, expected_recent) in zip(batched, alone):
+            assert historical[column] == expected_historical[0]
+            assert recent[column] == expected_recent[0]
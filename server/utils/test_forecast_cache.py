@@ -0,0 +1,81 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils import forecast_cache
+from utils.forecast import iter_forecast, prepare_input_row
+from utils.forecast_cache import (
+    default_seed, forecast_cache_key, get_cached_forecast, last_bar_date, models_version, store_forecast,
+)
+from utils.indicator_state import IndicatorState
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def use_dict_cache(monkeypatch):
+    store = {}
+    monkeypatch.setattr(forecast_cache, "get_from_cache", store.get)
+    monkeypatch.setattr(forecast_cache, "set_to_cache", lambda key, value, ttl=None: store.__setitem__(key, value))
+    return store
+
+
+def run_forecast(model, history, days_out, seed):
+    input_row = prepare_input_row(history, model.feature_names_in_)
+    state = IndicatorState.from_history(history).repeat(1)
+    steps = iter_forecast(model, model, input_row, state, days_out, np.random.RandomState(seed))
+    return [float(historical[0]) for historical, _ in steps]
+
+
+def test_shorter_horizon_is_a_prefix_of_longer_one(make_history, drift_model):
+    """
+    Test that a seeded forecast for fewer days equals the start of a longer one.
+    """
+    history = make_history(150)
+    model = drift_model(0.1)
+    assert run_forecast(model, history, 30, seed=7) == run_forecast(model, history, 60, seed=7)[:30]
+
+
+def test_cache_serves_shorter_horizons_and_keeps_longest(monkeypatch):
+    """
+    Test that shorter requests are sliced from the cached forecast and never shrink it.
+    """
+    store = use_dict_cache(monkeypatch)
+    key = forecast_cache_key("AAPL", "v1", "2024-01-02", 7)
+
+    assert get_cached_forecast(key, 30) is None
+    store_forecast(key, list(range(60)), list(range(100, 160)))
+    assert get_cached_forecast(key, 30) == {"historical": list(range(30)), "recent": list(range(100, 130))}
+    assert get_cached_forecast(key, 90) is None
+
+    store_forecast(key, list(range(30)), list(range(30)))
+    assert store[key]["days_out"] == 60
+
+
+def test_key_changes_with_new_bar_and_model():
+    """
+    Test that a new daily bar or model artifact moves the forecast to a new key.
+    """
+    history = pd.DataFrame({"Date": pd.to_datetime(["2024-01-02", "2024-01-03"]), "Close": [1.0, 2.0]})
+    last_bar = last_bar_date(history)
+    assert last_bar == "2024-01-03"
+
+    version = models_version("aaa", "bbb")
+    key = forecast_cache_key("AAPL", version, last_bar, default_seed("AAPL", last_bar))
+    assert key != forecast_cache_key("AAPL", models_version("aaa", "ccc"), last_bar, default_seed("AAPL", last_bar))
+    assert key != forecast_cache_key("AAPL", version, "2024-01-04", default_seed("AAPL", "2024-01-04"))
+    assert default_seed("AAPL", last_bar) == default_seed("AAPL", last_bar)
+
+
+def test_legacy_json_records_keep_their_dates():
+    """
+    Test that histories cached as JSON records by earlier versions key forecasts by their last bar.
+    """
+    from resources.data_resource import cached_records
+
+    history = pd.DataFrame({
+        "Date": pd.to_datetime(["2024-01-02", "2024-01-03"]).tz_localize("America/New_York"),
+        "Close": [1.0, 2.0],
+    })
+    records = cached_records(history.to_json(orient="records"))
+    assert last_bar_date(records) == "2024-01-03"
+    assert records["Date"].dtype == "datetime64[ns]"
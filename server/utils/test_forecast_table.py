@@ -0,0 +1,185 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from utils import redis_helper, forecast_table
+from utils.circuit_breaker import CircuitBreaker
+from utils.forecast_table import is_current, last_session_close, read_forecast_row, read_forecast_rows, write_forecast_rows
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+# A Friday evening, after the nightly run, and the following Monday after the close
+FRIDAY_EVENING = pd.Timestamp("2024-03-08 17:45", tz="America/New_York")
+MONDAY_EVENING = pd.Timestamp("2024-03-11 16:30", tz="America/New_York")
+
+
+@pytest.fixture
+def fake_table(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr(forecast_table, "redis_client", client)
+    monkeypatch.setattr(redis_helper, "redis_client", client)
+    monkeypatch.setattr(redis_helper, "redis_breaker", CircuitBreaker("Redis"))
+    return client
+
+
+def make_row(days, version="v1"):
+    return {
+        "historical": np.linspace(100, 110, days),
+        "recent": np.linspace(200, 190, days),
+        "meta": {"version": version, "last_bar": "2024-03-08", "seed": 7},
+    }
+
+
+def test_rows_round_trip_and_slice(fake_table):
+    """
+    Test that rows come back as float32-rounded lists, sliced to the requested horizon.
+    """
+    write_forecast_rows({"AAPL": make_row(180), "MSFT": make_row(30)}, now=FRIDAY_EVENING)
+
+    row = read_forecast_row("AAPL", 30)
+    assert row["historical"] == pytest.approx(np.linspace(100, 110, 180)[:30], rel=1e-6)
+    assert row["recent"] == pytest.approx(np.linspace(200, 190, 180)[:30], rel=1e-6)
+    assert row["meta"]["days_out"] == 180 and row["meta"]["version"] == "v1"
+    assert pd.Timestamp(row["meta"]["generated_at"]) == FRIDAY_EVENING
+    assert 3600 * 24 * 3 < fake_table.ttl(forecast_table.forecast_table_key("AAPL")) <= forecast_table.FORECAST_TABLE_EXPIRY
+
+    rows = read_forecast_rows(["AAPL", "MSFT", "NVDA"], days_out=60)
+    assert rows["AAPL"]["historical"] == read_forecast_row("AAPL", 60)["historical"]
+    assert rows["MSFT"] is None  # Shorter than requested
+    assert rows["NVDA"] is None
+
+
+def test_rows_are_stale_once_a_session_closes_after_them():
+    """
+    Test the generation time check, across a weekend and a weekday close.
+    """
+    meta = {"generated_at": FRIDAY_EVENING.tz_convert("UTC").isoformat()}
+    assert last_session_close(MONDAY_EVENING) == pd.Timestamp("2024-03-11 16:00", tz="America/New_York")
+    assert is_current(meta, pd.Timestamp("2024-03-10 12:00", tz="America/New_York"))  # Sunday
+    assert is_current(meta, pd.Timestamp("2024-03-11 15:59", tz="America/New_York"))
+    assert not is_current(meta, MONDAY_EVENING)
+    assert not is_current({"version": "v1"}, MONDAY_EVENING)  # Rows written before generated_at existed
+
+
+def test_precompute_writes_every_sector_and_refreshes_alerts(fake_table, monkeypatch):
+    """
+    Test that the nightly job writes each sector's forecasts and collects the errors.
+    """
+    from resources import analysis_resource
+    from utils import notification_tasks
+
+    def forecast_sector(sector, tickers, days_out, refresh=False):
+        assert refresh
+        if sector == "empty":
+            raise FileNotFoundError("no model")
+        return {ticker: make_row(days_out) for ticker in tickers[:-1]}, {tickers[-1]: "no data"}
+
+    refreshed = []
+    monkeypatch.setattr(analysis_resource, "SECTOR_TICKERS", {"tech": ["AAPL", "MSFT", "BAD"], "empty": ["XOM"]})
+    monkeypatch.setattr(analysis_resource, "forecast_sector", forecast_sector)
+    monkeypatch.setattr(notification_tasks.refresh_alerts, "delay", lambda: refreshed.append(True))
+
+    result = notification_tasks.precompute_forecasts(days_out=10)
+    assert result == {"written": 2, "errors": {"BAD": "no data", "XOM": "no model"}}
+    assert refreshed == [True]
+    assert read_forecast_row("MSFT", 10)["meta"]["days_out"] == 10
+    assert is_current(read_forecast_row("MSFT")["meta"])
+
+
+class StubModel:
+    feature_names_in_ = np.array(["Close"])
+
+
+def test_predict_serves_only_current_rows(fake_table, monkeypatch, tmp_path):
+    """
+    Test that default requests use a current table row and compute live once it is stale.
+    """
+    from app import app
+    from resources import analysis_resource
+
+    model_path = tmp_path / "model.joblib"
+    model_path.touch()
+    live = []
+
+    def load_transformed_data(stock_name, refresh=False):
+        live.append(stock_name)
+        raise RuntimeError("live forecast")
+
+    monkeypatch.setattr(analysis_resource, "get_model_path", lambda sector, kind: str(model_path))
+    monkeypatch.setattr(analysis_resource.model_registry, "get_predictor", lambda *args: StubModel())
+    monkeypatch.setattr(analysis_resource.model_registry, "version", lambda sector, kind: kind)
+    monkeypatch.setattr(analysis_resource, "load_transformed_data", load_transformed_data)
+    row = make_row(30)
+    row["meta"]["version"] = analysis_resource.models_version("historical", "recent")
+    client = app.test_client()
+
+    write_forecast_rows({"AAPL": row})
+    response = client.post("/analysis/predict", json={"stock_name": "AAPL", "days_out": 10})
+    assert response.status_code == 200 and len(response.get_json()["historical_predictions"]) == 10
+    assert live == []
+
+    write_forecast_rows({"AAPL": row}, now=pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=4))
+    response = client.post("/analysis/predict", json={"stock_name": "AAPL", "days_out": 10})
+    assert response.status_code == 500 and live == ["AAPL"]
+
+
+class StubQuery:
+    def __init__(self, alerts):
+        self.alerts = alerts
+
+    def filter_by(self, **kwargs):
+        return self
+
+    def options(self, *args):
+        return self
+
+    def all(self):
+        return self.alerts
+
+
+class StubAlert:
+    stock = None
+
+    def __init__(self, alert_id, symbol, condition):
+        self.id = alert_id
+        self.user_id = 1
+        self.days_out = 10
+        self.condition = condition
+        self.is_triggered = False
+        self.stock = type("StubStock", (), {"id": alert_id, "symbol": symbol, "name": symbol})()
+
+
+def test_refresh_alerts_skips_failing_alerts(fake_table, monkeypatch):
+    """
+    Test that a failing alert neither stops the others nor loses their triggered flags.
+    """
+    from utils import notification_tasks
+
+    alerts = [
+        StubAlert(1, "AAPL", "predicted_gain > 0"),
+        StubAlert(2, "AAPL", "predicted_gain >"),  # Invalid condition
+        StubAlert(3, "NVDA", "predicted_gain > 0"),  # No forecast stored
+        StubAlert(4, "MSFT", "predicted_gain > 0"),
+    ]
+    StubAlert.query = StubQuery(alerts)
+    notified, commits = [], []
+    monkeypatch.setattr(notification_tasks, "Alert", StubAlert)
+    monkeypatch.setattr(notification_tasks, "joinedload", lambda attribute: None)
+    monkeypatch.setattr(notification_tasks.db.session, "commit", lambda: commits.append(True))
+    monkeypatch.setattr(notification_tasks.create_notification, "delay", lambda **kwargs: notified.append(kwargs["alert_id"]))
+    write_forecast_rows({"AAPL": make_row(30), "MSFT": make_row(30)})
+
+    notification_tasks.refresh_alerts()
+    assert notified == [1, 4]
+    assert [alert.is_triggered for alert in alerts] == [True, False, False, True]
+    assert commits == [True]
+
+    # Unreadable forecasts leave every alert untriggered
+    def read_forecast_rows(tickers):
+        raise RuntimeError("Redis forecast table read error")
+
+    monkeypatch.setattr(notification_tasks, "read_forecast_rows", read_forecast_rows)
+    notification_tasks.refresh_alerts()
+    assert notified == [1, 4] and commits == [True]
@@ -0,0 +1,127 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from utils.incremental_features import MaterializedFeatures
+from benchmarks.fixtures import make_ohlcv
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_extend_matches_full_recompute():
+    """
+    Test that appending bars in several batches gives exactly the full transform.
+    """
+    raw = make_ohlcv(600)
+    materialized = MaterializedFeatures.build(raw.iloc[:500])
+
+    # The first batch repeats the last stored bar, as a download from the last date does
+    assert materialized.extend(raw.iloc[499:503]) == 3
+    assert materialized.extend(raw.iloc[503:504]) == 1
+    assert materialized.extend(raw.iloc[500:504]) == 0
+    restored = MaterializedFeatures.from_dict(materialized.to_dict())
+    assert restored.extend(raw.iloc[504:]) == 96
+
+    full = MaterializedFeatures.build(raw)
+    pd.testing.assert_frame_equal(restored.transformed, full.transformed, check_exact=True)
+    assert restored.carry == full.carry
+    assert restored.verify()["consistent"]
+
+
+def test_restated_or_incomplete_history_is_rejected():
+    """
+    Test that restated bars and histories with missing prices require a rebuild.
+    """
+    raw = make_ohlcv(200)
+    materialized = MaterializedFeatures.build(raw.iloc[:150])
+
+    restated = raw.iloc[149:160].copy()
+    restated[["Open", "High", "Low", "Close"]] *= 0.5  # 2-for-1 split
+    with pytest.raises(ValueError):
+        materialized.extend(restated)
+
+    gappy = raw.copy()
+    gappy.loc[20, "Close"] = np.nan
+    with pytest.raises(ValueError):
+        MaterializedFeatures.build(gappy.iloc[:150]).extend(raw.iloc[150:])
+
+
+def test_verify_reports_drift():
+    """
+    Test that the consistency check flags columns that differ from a full recompute.
+    """
+    materialized = MaterializedFeatures.build(make_ohlcv(120))
+    materialized.transformed.loc[119, "OBV"] += 1000
+
+    report = materialized.verify()
+    assert not report["consistent"]
+    assert report["mismatches"] == {"OBV": 1000.0}
+
+
+def test_data_endpoint_verifies_on_request(monkeypatch):
+    """
+    Test that /data/<symbol>?verify=true reports the stored history's consistency.
+    """
+    from app import app
+    from resources import data_resource
+
+    materialized = MaterializedFeatures.build(make_ohlcv(120))
+    materialized.transformed.loc[119, "OBV"] += 1000
+    monkeypatch.setattr(data_resource, "get_many", lambda keys: dict.fromkeys(keys))
+    monkeypatch.setattr(data_resource, "set_many", lambda values, ttl: None)
+    monkeypatch.setattr(data_resource, "load_materialized", lambda symbol: materialized)
+    monkeypatch.setattr(data_resource, "store_materialized", lambda symbol, materialized: None)
+    monkeypatch.setattr(data_resource.DataFetchResource, "fetch_raw_data_since", staticmethod(
+        lambda symbol, start: make_ohlcv(120).iloc[119:]
+    ))
+    client = app.test_client()
+
+    response = client.get("/data/AAPL?verify=true")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body["transformed_data"]) == 120
+    assert body["consistency"] == {"consistent": False, "rows": 120, "mismatches": {"OBV": 1000.0}}
+
+    assert "consistency" not in client.get("/data/AAPL").get_json()
+
+
+def test_open_session_bar_is_not_stored(monkeypatch):
+    """
+    Test that a bar fetched during market hours is served but, once its final
+    version differs, the history is extended instead of rebuilt.
+    """
+    from resources import data_resource
+
+    raw = make_ohlcv(301)
+    partial = raw.iloc[:300].copy()
+    partial.loc[299, ["High", "Close", "Volume"]] = [raw.loc[299, "High"] + 5, raw.loc[299, "Close"] + 1, 1000]
+    stored, downloads = {}, []
+    monkeypatch.setattr(data_resource, "load_materialized", stored.get)
+    monkeypatch.setattr(data_resource, "store_materialized", stored.__setitem__)
+    monkeypatch.setattr(data_resource.DataFetchResource, "fetch_raw_data", staticmethod(
+        lambda symbol: downloads.append(symbol) or partial
+    ))
+    monkeypatch.setattr(data_resource.DataFetchResource, "fetch_raw_data_since", staticmethod(
+        lambda symbol, start: raw[raw["Date"] >= start]
+    ))
+    resource = data_resource.DataFetchResource()
+
+    def closed_after(row):
+        close = pd.Timestamp(raw.loc[row, "Date"]).tz_localize("America/New_York") + pd.Timedelta(hours=16)
+        monkeypatch.setattr(data_resource, "last_session_close", lambda now=None: close)
+
+    # During bar 299's session: bar 298 closed the last session
+    closed_after(298)
+    materialized, pending = resource.materialize("AAPL")
+    assert len(materialized.raw) == 299 and len(pending) == 1
+    _, transformed = materialized.preview(pending)
+    expected = MaterializedFeatures.build(partial, data_resource.TRANSFORMED_COLUMNS).transformed
+    pd.testing.assert_frame_equal(transformed, expected, check_exact=False, rtol=1e-9)
+
+    # After the next close the final bar 299 differs from the one served, and bar 300 is new
+    closed_after(300)
+    materialized, pending = resource.materialize("AAPL")
+    assert downloads == ["AAPL"] and pending.empty
+    pd.testing.assert_frame_equal(materialized.transformed, MaterializedFeatures.build(raw, data_resource.TRANSFORMED_COLUMNS).transformed,
+                                  check_exact=False, rtol=1e-9)
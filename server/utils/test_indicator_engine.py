@@ -0,0 +1,368 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from utils.indicator_engine import (
+    DERIVED_COLUMNS, FORECAST_COLUMNS, TRAINING_COLUMNS, PANDAS_TA_INDICATORS, add_indicators, add_indicators_by_ticker,
+    INDICATORS, columns_for_features, compute_indicators, difference, fill_missing, on_balance_volume,
+    parabolic_sar, rolling_min,
+)
+from benchmarks.fixtures import make_ohlcv, legacy_derived_features, legacy_obv, legacy_parabolic_sar, legacy_transform_data
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def legacy_update_derived_features(data):
+    """
+    analysis_resource.update_derived_features before the indicator engine.
+    """
+    data["MA_10"] = data["Close"].rolling(window=10).mean()
+    data["MA_50"] = data["Close"].rolling(window=50).mean()
+    data["Volatility"] = data["Close"].rolling(window=10).std()
+    delta = data["Close"].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
+    rs = gain / loss
+    data["RSI"] = 100 - (100 / (1 + rs))
+    ema_12 = data["Close"].ewm(span=12, adjust=False).mean()
+    ema_26 = data["Close"].ewm(span=26, adjust=False).mean()
+    data["MACD"] = ema_12 - ema_26
+    data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
+    rolling_mean = data["Close"].rolling(window=20).mean()
+    rolling_std = data["Close"].rolling(window=20).std()
+    data["BB_Lower"] = rolling_mean - (2 * rolling_std)
+    data["BB_Middle"] = rolling_mean
+    data["BB_Upper"] = rolling_mean + (2 * rolling_std)
+    high_14 = data["High"].rolling(window=14).max()
+    low_14 = data["Low"].rolling(window=14).min()
+    data["Williams %R"] = ((high_14 - data["Close"]) / (high_14 - low_14)) * -100
+    data = data.ffill()
+    data = data.bfill()
+    return data.fillna(0)
+
+
+def assert_columns_match(actual, expected, columns):
+    for name in columns:
+        np.testing.assert_allclose(
+            actual[name].to_numpy(dtype=float), expected[name].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9, err_msg=f"{name} diverged",
+        )
+
+
+def test_transform_data_matches_legacy():
+    """
+    Test the serving transform (ffill then bfill) against the pandas implementation.
+    """
+    raw = make_ohlcv(400)
+    expected = legacy_transform_data(raw)
+    actual = add_indicators(raw.copy(), DERIVED_COLUMNS, fill="ffill")
+
+    assert_columns_match(actual, expected, DERIVED_COLUMNS)
+    # Path-dependent indicators are exact
+    np.testing.assert_array_equal(actual["Parabolic_SAR"], expected["Parabolic_SAR"])
+    np.testing.assert_array_equal(actual["OBV"], expected["OBV"].astype(float))
+
+
+def test_training_features_match_legacy():
+    """
+    Test the training features (mean fill, Volatility kept from the dataset).
+    """
+    raw = make_ohlcv(300).drop(columns=["Date"]).astype(float)
+    raw["Volatility"] = np.linspace(1, 2, len(raw))
+    expected = legacy_derived_features(raw.copy())
+    expected = expected.fillna(expected.mean())
+    actual = add_indicators(raw.copy(), TRAINING_COLUMNS, fill="mean")
+
+    assert_columns_match(actual, expected, DERIVED_COLUMNS)
+
+
+def test_forecast_update_matches_legacy():
+    """
+    Test the forecast-loop recompute (ffill, bfill, then zero).
+    """
+    history = legacy_transform_data(make_ohlcv(120))
+    history.loc[len(history)] = history.iloc[-1]
+    history.loc[len(history) - 1, ["Close", "MA_10", "RSI"]] = [history["Close"].iloc[-2] + 1, np.nan, np.nan]
+
+    expected = legacy_update_derived_features(history.copy())
+    actual = add_indicators(history.copy(), FORECAST_COLUMNS, fill="ffill_zero")
+
+    assert_columns_match(actual, expected, DERIVED_COLUMNS)
+
+
+def test_batched_series_match_single_series():
+    """
+    Test that stacking tickers along a leading axis gives the per-ticker results.
+    """
+    frames = [make_ohlcv(260, seed=seed) for seed in (1, 2, 3)]
+    prices = {
+        name: np.stack([frame[name].to_numpy(dtype=float) for frame in frames])
+        for name in ["Open", "High", "Low", "Close", "Volume"]
+    }
+    batched = compute_indicators(prices)
+
+    for row, frame in enumerate(frames):
+        single = compute_indicators({name: values[row] for name, values in prices.items()})
+        for name in DERIVED_COLUMNS:
+            np.testing.assert_array_equal(batched[name][row], single[name], err_msg=f"{name} diverged")
+
+
+def test_lazy_columns_compute_only_their_dependencies():
+    """
+    Test that a model's feature subset plans only what it needs and matches the full set.
+    """
+    data = make_ohlcv(200)
+    prices = {name: data[name].to_numpy(dtype=float) for name in ["Open", "High", "Low", "Close", "Volume"]}
+    full = compute_indicators(prices)
+
+    columns = columns_for_features(["Close", "BB_Upper", "Volume", "MA_10", "BB_Lower", "Unknown"])
+    assert columns == ["MA_10", "BB_Lower", "BB_Upper"]
+    assert sorted(INDICATORS.plan(columns).names) == ["BB_Lower", "BB_Middle", "BB_Upper", "MA_10", "_bollinger_std"]
+
+    subset = compute_indicators(prices, columns)
+    assert list(subset) == columns
+    for name in columns:
+        np.testing.assert_array_equal(subset[name], full[name], err_msg=f"{name} diverged")
+
+
+def test_registry_merges_shared_steps():
+    """
+    Test that one declaration adds an indicator and identical rolling statistics run once.
+    """
+    calls = []
+
+    def counted_min(values, window):
+        calls.append(window)
+        return rolling_min(values, window)
+
+    registry = INDICATORS.copy()
+    registry.declare("_lowest_low", counted_min, ["Low"], replace=True, window=14)
+    registry.declare("Low_14", counted_min, ["Low"], window=14)
+    registry.declare("Stochastic_Range", difference, ["_highest_high", "Low_14"])
+    assert registry.columns[-2:] == ["Low_14", "Stochastic_Range"]
+
+    data = make_ohlcv(100)
+    prices = {name: data[name].to_numpy(dtype=float) for name in ["High", "Low", "Close"]}
+    values = registry.plan(["Stochastic", "Williams %R", "Low_14", "Stochastic_Range"]).run(prices)
+
+    assert calls == [14]
+    np.testing.assert_array_equal(values["Stochastic"], compute_indicators(prices, ["Stochastic"])["Stochastic"])
+    with pytest.raises(ValueError):
+        registry.declare("MA_10", counted_min, ["Low"], window=10)
+    registry.declare("_loop", difference, ["Close", "Looped"])
+    registry.declare("Looped", difference, ["Close", "_loop"])
+    with pytest.raises(ValueError):
+        registry.plan(["Looped"])
+
+
+def test_grouped_tickers_match_single_ticker():
+    """
+    Test the long-format grouped computation against each ticker computed alone.
+    """
+    frames = []
+    for seed, (ticker, rows) in enumerate([("AAPL", 300), ("MSFT", 180), ("SNOW", 80)]):
+        frame = make_ohlcv(rows, seed=seed)
+        frame["Date"] = frame["Date"].dt.strftime("%Y-%m-%d")
+        frame["Ticker"] = ticker
+        frames.append(frame.drop(index=[10, 11]) if ticker == "MSFT" else frame)  # Missing trading days
+    long = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+    for fill in (None, "ffill", "mean"):
+        grouped = add_indicators_by_ticker(long.copy(), DERIVED_COLUMNS, fill=fill)
+        assert list(grouped.index) == list(long.index)
+
+        for ticker, frame in grouped.groupby("Ticker"):
+            frame = frame.sort_values("Date")
+            alone = frame[["Date", "Open", "High", "Low", "Close", "Volume"]].reset_index(drop=True)
+            alone = add_indicators(alone, DERIVED_COLUMNS, fill=fill)
+            assert_columns_match(frame.reset_index(drop=True), alone, DERIVED_COLUMNS)
+
+
+def test_path_dependent_kernels_are_exact():
+    """
+    Test OBV and Parabolic SAR against the row loops on a period="max"-sized history.
+    """
+    data = make_ohlcv(10000, seed=5)
+    data["Close"] = data["Close"].round(2)  # Quoted prices repeat often, so unchanged closes are common
+    arrays = {name: data[name].to_numpy(dtype=float) for name in ["Open", "High", "Low", "Close", "Volume"]}
+
+    obv = on_balance_volume(arrays["Close"], arrays["Volume"])
+    np.testing.assert_array_equal(obv, np.asarray(legacy_obv(data), dtype=float))
+
+    psar = parabolic_sar(arrays["Open"], arrays["High"], arrays["Low"], arrays["Close"], backend="python")
+    np.testing.assert_array_equal(psar, legacy_parabolic_sar(data).to_numpy())
+
+
+def test_parabolic_sar_jit_backend_matches_python():
+    """
+    Test that the numba backend, when installed, is bit-identical to the Python loop.
+    """
+    pytest.importorskip("numba")
+    data = make_ohlcv(2000, seed=8)
+    arrays = [data[name].to_numpy(dtype=float) for name in ["Open", "High", "Low", "Close"]]
+
+    np.testing.assert_array_equal(parabolic_sar(*arrays, backend="jit"), parabolic_sar(*arrays, backend="python"))
+
+
+def test_fill_modes():
+    """
+    Test each fill mode on a series with leading, inner and trailing gaps.
+    """
+    values = np.array([[np.nan, 1.0, np.nan, 3.0, np.nan]])
+
+    np.testing.assert_array_equal(fill_missing(values, "ffill"), [[1.0, 1.0, 1.0, 3.0, 3.0]])
+    np.testing.assert_array_equal(fill_missing(np.full((1, 3), np.nan), "ffill_zero"), [[0.0, 0.0, 0.0]])
+    np.testing.assert_array_equal(fill_missing(values, "mean"), [[2.0, 1.0, 2.0, 3.0, 2.0]])
+    assert np.isnan(fill_missing(values, None)).sum() == 3
+
+
+def pandas_ta_psar_long(high, low, close, af0=0.02, max_af=0.2):
+    """
+    `ta.psar(high, low, close)["PSARl_0.02_0.2"]` as written in pandas_ta 0.3.14b.
+    """
+    up = high.iloc[1] - high.iloc[0]
+    dn = low.iloc[0] - low.iloc[1]
+    falling = dn > up and dn > 0 and abs(dn) >= np.finfo(float).eps
+    ep = low.iloc[0] if falling else high.iloc[0]
+    sar = close.iloc[0]
+    af = af0
+    long = pd.Series(np.nan, index=high.index)
+
+    for row in range(1, high.shape[0]):
+        high_ = high.iloc[row]
+        low_ = low.iloc[row]
+        if falling:
+            _sar = sar + af * (ep - sar)
+            reverse = high_ > _sar
+            if low_ < ep:
+                ep = low_
+                af = min(af + af0, max_af)
+            _sar = max(high.iloc[row - 1], high.iloc[row - 2], _sar)
+        else:
+            _sar = sar + af * (ep - sar)
+            reverse = low_ < _sar
+            if high_ > ep:
+                ep = high_
+                af = min(af + af0, max_af)
+            _sar = min(low.iloc[row - 1], low.iloc[row - 2], _sar)
+        if reverse:
+            _sar = ep
+            af = af0
+            falling = not falling
+            ep = low_ if falling else high_
+        sar = _sar
+        if not falling:
+            long.iloc[row] = sar
+    return long
+
+
+def pandas_ta_ema(close, length):
+    """
+    `ta.ema(close, length)`: the first value is the SMA of the first `length` closes.
+    """
+    close = close.loc[close.first_valid_index():].copy()
+    sma_nth = close[0:length].mean()
+    close[:length - 1] = np.nan
+    close.iloc[length - 1] = sma_nth
+    return close.ewm(span=length, adjust=False).mean()
+
+
+def pandas_ta_enhancer_features(data):
+    """
+    The pandas_ta calls of DataTransformer and the enhancers, written out with pandas.
+    """
+    close, high, low, volume = data["Close"], data["High"], data["Low"], data["Volume"].astype(float)
+    features = pd.DataFrame(index=data.index)
+
+    negative = close.diff()
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    positive_avg = positive.ewm(alpha=1 / 14, min_periods=14).mean()
+    negative_avg = negative.ewm(alpha=1 / 14, min_periods=14).mean()
+    features["RSI"] = 100 * positive_avg / (positive_avg + negative_avg.abs())
+
+    macd = pandas_ta_ema(close, 12) - pandas_ta_ema(close, 26)
+    features["MACD"] = macd
+    features["MACD_Signal"] = pandas_ta_ema(macd, 9)
+    features["MACD_Hist"] = features["MACD"] - features["MACD_Signal"]
+
+    lowest_low, highest_high = low.rolling(14).min(), high.rolling(14).max()
+    spread = highest_high - lowest_low
+    if spread.eq(0).any():
+        spread += np.finfo(float).eps
+    stoch = 100 * (close - lowest_low) / spread
+    features["Stochastic"] = stoch.loc[stoch.first_valid_index():].rolling(3).mean()
+    features["Williams %R"] = 100 * ((close - highest_high) / (highest_high - lowest_low))
+
+    middle = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    features["BB_Lower"], features["BB_Middle"], features["BB_Upper"] = middle - 2 * std, middle, middle + 2 * std
+    features["EMA_10"], features["EMA_50"] = pandas_ta_ema(close, 10), pandas_ta_ema(close, 50)
+    features["Parabolic_SAR"] = pandas_ta_psar_long(high, low, close)
+
+    sign = close.diff()
+    sign[sign > 0] = 1
+    sign[sign < 0] = -1
+    sign.iloc[0] = 1
+    features["OBV"] = (sign * volume).cumsum()
+
+    typical_price = (high + low + close) / 3.0
+    dates = data["Date"].dt.to_period("D")
+    features["VWAP"] = (typical_price * volume).groupby(dates).cumsum() / volume.groupby(dates).cumsum()
+    features["Pivot"] = (high + low + close) / 3
+    features["R1"], features["S1"] = 2 * features["Pivot"] - low, 2 * features["Pivot"] - high
+    return features
+
+
+def test_enhancer_columns_match_pandas_ta():
+    """
+    Test PANDAS_TA_INDICATORS against the pandas_ta definitions, alone and grouped by ticker.
+    """
+    raw = make_ohlcv(400)
+    expected = pandas_ta_enhancer_features(raw)
+    actual = add_indicators(raw.copy(), DERIVED_COLUMNS, fill=None, registry=PANDAS_TA_INDICATORS)
+    assert_columns_match(actual, expected, expected.columns)
+    np.testing.assert_array_equal(actual["Parabolic_SAR"], expected["Parabolic_SAR"])
+    np.testing.assert_array_equal(actual["OBV"], expected["OBV"])
+
+    frames = []
+    for seed, (ticker, rows) in enumerate([("AAPL", 260), ("MSFT", 90)]):
+        frame = make_ohlcv(rows, seed=seed)
+        frame["Ticker"] = ticker
+        frames.append(frame)
+    grouped = add_indicators_by_ticker(pd.concat(frames, ignore_index=True), registry=PANDAS_TA_INDICATORS)
+    for ticker, frame in grouped.groupby("Ticker"):
+        expected = pandas_ta_enhancer_features(frame.reset_index(drop=True))
+        assert_columns_match(frame.reset_index(drop=True), expected, expected.columns)
+
+
+def test_enhancer_columns_match_installed_pandas_ta():
+    """
+    Test against pandas_ta itself where it is installed.
+    """
+    ta = pytest.importorskip("pandas_ta")
+    raw = make_ohlcv(400)
+    close, high, low, volume = raw["Close"], raw["High"], raw["Low"], raw["Volume"]
+    macd = ta.macd(close, fast=12, slow=26, signal=9)
+    bbands = ta.bbands(close, length=20, std=2)
+    expected = pd.DataFrame({
+        "RSI": ta.rsi(close, length=14),
+        "MACD": macd["MACD_12_26_9"],
+        "MACD_Signal": macd["MACDs_12_26_9"],
+        "MACD_Hist": macd["MACDh_12_26_9"],
+        "Stochastic": ta.stoch(high, low, close)["STOCHk_14_3_3"],
+        "Williams %R": ta.willr(high, low, close, length=14),
+        "BB_Lower": bbands["BBL_20_2.0"],
+        "BB_Middle": bbands["BBM_20_2.0"],
+        "BB_Upper": bbands["BBU_20_2.0"],
+        "EMA_10": ta.ema(close, length=10),
+        "EMA_50": ta.ema(close, length=50),
+        "Parabolic_SAR": ta.psar(high, low, close, af=0.02, max_af=0.2)["PSARl_0.02_0.2"],
+        "OBV": ta.obv(close, volume),
+        "VWAP": ta.vwap(high.set_axis(raw["Date"]), low.set_axis(raw["Date"]), close.set_axis(raw["Date"]),
+                        volume.set_axis(raw["Date"])).to_numpy(),
+    })
+    actual = add_indicators(raw.copy(), DERIVED_COLUMNS, fill=None, registry=PANDAS_TA_INDICATORS)
+    assert_columns_match(actual, expected, expected.columns)
@@ -0,0 +1,95 @@
+import logging
+import numpy as np
+import pandas as pd
+from resources.analysis_resource import update_derived_features
+from utils.indicator_state import IndicatorState, STATE_COLUMNS
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def run_parity(history, closes):
+    """
+    Advance the streaming state and the full recompute side by side.
+    """
+    state = IndicatorState.from_history(history)
+    data = history.copy()
+    for close in closes:
+        new_row = data.iloc[-1:].drop(columns=["Date"]).copy()
+        new_row["Close"] = close
+        data = update_derived_features(pd.concat([data, new_row], ignore_index=True))
+        expected = data.iloc[-1]
+
+        values = state.advance(close)
+        for name in STATE_COLUMNS:
+            assert np.isclose(values[name], expected[name], rtol=1e-9, atol=1e-9), (
+                f"{name} diverged: {values[name]} != {expected[name]}"
+            )
+        expected_volatility = data["Close"].rolling(window=90).std().iloc[-1]
+        assert np.allclose(state.close_volatility(), expected_volatility, rtol=1e-9, equal_nan=True)
+
+
+def test_streaming_state_matches_full_recompute(make_history):
+    """
+    Test that every streamed forecast row matches update_derived_features.
+    """
+    history = make_history(300)
+    rng = np.random.default_rng(11)
+    closes = history["Close"].iloc[-1] + np.cumsum(rng.normal(0, 1, 120))
+    run_parity(history, closes)
+
+
+def test_flat_forecast_keeps_forward_filled_values(make_history):
+    """
+    Test the NaN fallbacks when the forecast stops moving (zero gain and loss).
+    """
+    history = make_history(300)
+    closes = np.full(40, history["Close"].iloc[-1])
+    run_parity(history, closes)
+
+
+def test_short_history_matches_full_recompute(make_history):
+    """
+    Test a history shorter than the longest window.
+    """
+    history = make_history(30)
+    rng = np.random.default_rng(3)
+    closes = history["Close"].iloc[-1] + np.cumsum(rng.normal(0, 1, 100))
+    run_parity(history, closes)
+
+
+def test_batched_state_matches_independent_series(make_history):
+    """
+    Test that a repeated state advances every series independently.
+    """
+    history = make_history(200)
+    rng = np.random.default_rng(5)
+    closes = history["Close"].iloc[-1] + np.cumsum(rng.normal(0, 1, (25, 3)), axis=0)
+
+    batched = IndicatorState.from_history(history).repeat(3)
+    singles = [IndicatorState.from_history(history) for _ in range(3)]
+    for step in closes:
+        batched_values = batched.advance(step)
+        for path, single in enumerate(singles):
+            single_values = single.advance(step[path])
+            for name in STATE_COLUMNS:
+                assert np.isclose(batched_values[name][path], single_values[name], rtol=1e-12, atol=1e-12)
+        assert np.allclose(batched.close_volatility(), [single.close_volatility() for single in singles])
+
+
+def test_model_subset_matches_full_state(make_history):
+    """
+    Test that a state seeded with a model's features recalculates only those, with the same values.
+    """
+    history = make_history(200)
+    rng = np.random.default_rng(9)
+    closes = history["Close"].iloc[-1] + np.cumsum(rng.normal(0, 1, 30))
+
+    subset = IndicatorState.from_history(history, ["Close", "RSI", "BB_Middle", "Volume"])
+    full = IndicatorState.from_history(history)
+    for close in closes:
+        subset_values = subset.advance(close)
+        full_values = full.advance(close)
+        assert list(subset_values) == ["RSI", "BB_Middle"]
+        for name, value in subset_values.items():
+            assert value == full_values[name]
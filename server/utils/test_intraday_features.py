@@ -0,0 +1,56 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from utils.indicator_engine import DERIVED_COLUMNS, add_indicators
+from utils.intraday_features import session_ids, transform_intraday
+from benchmarks.fixtures import SESSION_BARS, make_minute_bars
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+def test_chunks_match_single_pass():
+    """
+    Test that chunk boundaries, including ones inside a session, do not change any value.
+    """
+    raw = make_minute_bars(6)
+    single = transform_intraday(raw, chunk_rows=len(raw))
+    for chunk_rows in (SESSION_BARS, 517, 50):
+        pd.testing.assert_frame_equal(transform_intraday(raw, chunk_rows=chunk_rows), single, check_exact=True)
+
+    # Apart from VWAP, the columns are those of the daily transform
+    expected = add_indicators(raw.copy(), DERIVED_COLUMNS, fill="ffill")
+    pd.testing.assert_frame_equal(single.drop(columns="VWAP"), expected.drop(columns="VWAP"), check_exact=True)
+
+
+def test_vwap_restarts_every_session():
+    """
+    Test the session-anchored VWAP against a pandas groupby.
+    """
+    raw = make_minute_bars(4)
+    transformed = transform_intraday(raw, chunk_rows=500)
+
+    typical_volume = (raw["Close"] + raw["High"] + raw["Low"]) / 3 * raw["Volume"]
+    session = session_ids(raw["Datetime"])
+    expected = typical_volume.groupby(session).cumsum() / raw["Volume"].groupby(session).cumsum()
+    np.testing.assert_allclose(transformed["VWAP"], expected, rtol=1e-12)
+
+    first_bars = np.flatnonzero(np.diff(session, prepend=-1))
+    assert len(first_bars) == 4
+    np.testing.assert_allclose(
+        transformed["VWAP"].iloc[first_bars], ((raw["Close"] + raw["High"] + raw["Low"]) / 3).iloc[first_bars],
+    )
+
+
+def test_bars_without_prices_are_dropped():
+    """
+    Test that bars without prices are dropped instead of stopping the chunked transform.
+    """
+    raw = make_minute_bars(2)
+    raw.loc[[100, 600], "Close"] = np.nan
+    transformed = transform_intraday(raw, chunk_rows=200)
+    assert len(transformed) == len(raw) - 2
+    assert not transformed[DERIVED_COLUMNS].isna().any().any()
+
+    with pytest.raises(ValueError):
+        transform_intraday(raw.iloc[:0])
@@ -0,0 +1,103 @@
+import os
+import logging
+import pytest
+from utils import redis_helper
+from utils.local_cache import LocalCache
+from utils.circuit_breaker import CircuitBreaker
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_entries_are_bounded_by_bytes_and_age(clock):
+    """
+    Test LRU eviction by size, expiry at the Redis TTL or max age, and the stats.
+    """
+    cache = LocalCache(max_bytes=100, max_age=60, clock=clock)
+    cache.put("a", "A", 40, ttl=10)
+    cache.put("b", "B", 40)
+    assert cache.get("a") == (True, "A")  # "b" is now the least recently used
+    cache.put("c", "C", 40)
+    assert cache.get("b") == (False, None)
+    cache.put("huge", "H", 101)
+    assert cache.get("huge") == (False, None)
+
+    clock.now = 10
+    assert cache.get("a") == (False, None)  # Redis TTL
+    assert cache.get("c") == (True, "C")
+    clock.now = 60
+    assert cache.get("c") == (False, None)  # Max age
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 4 and stats["evictions"] == 1 and stats["expirations"] == 2
+    assert stats["hit_ratio"] == pytest.approx(2 / 6)
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+def test_value_read_before_an_invalidation_is_not_stored():
+    """
+    Test that a value fetched from Redis while the key changed is not cached.
+    """
+    cache = LocalCache(max_bytes=100, max_age=60)
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.put("a", "old", 10, generation=generation)
+    assert cache.get("a") == (False, None)
+
+
+@pytest.fixture
+def two_tier(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setattr(redis_helper, "redis_client", fakeredis.FakeStrictRedis())
+    monkeypatch.setattr(redis_helper, "local_cache", LocalCache(max_bytes=1 << 20, max_age=60))
+    monkeypatch.setattr(redis_helper, "_redis_stats", {"hits": 0, "misses": 0})
+    monkeypatch.setattr(redis_helper, "redis_breaker", CircuitBreaker("Redis"))
+    # No listener thread: invalidations are delivered by calling handle_invalidation
+    monkeypatch.setattr(redis_helper, "_listener_pid", os.getpid())
+    return redis_helper.redis_client
+
+
+def test_reads_are_served_locally_until_another_worker_writes(two_tier):
+    """
+    Test the per-tier hit ratios and the cross-worker invalidation of a key.
+    """
+    redis_helper.set_to_cache("market_ai:test:l1", {"close": 1.0}, ttl=60)
+    redis_helper.local_cache.invalidate()  # As in a worker that did not write it
+
+    assert redis_helper.get_from_cache("market_ai:test:l1") == {"close": 1.0}
+    assert redis_helper.get_from_cache("market_ai:test:l1") == {"close": 1.0}
+    assert redis_helper.get_from_cache("market_ai:test:missing") is None
+
+    # Another worker writes the key: Redis changes and the announcement drops the local copy
+    two_tier.set("market_ai:test:l1", redis_helper.encode_value({"close": 2.0}))
+    assert redis_helper.get_from_cache("market_ai:test:l1") == {"close": 1.0}
+    redis_helper.handle_invalidation(b"other-worker market_ai:test:l1")
+    assert redis_helper.get_from_cache("market_ai:test:l1") == {"close": 2.0}
+
+    # The process ignores its own announcements
+    redis_helper.handle_invalidation(f"{redis_helper._origin()} market_ai:test:l1".encode())
+    assert redis_helper.local_cache.get("market_ai:test:l1") == (True, {"close": 2.0})
+
+    stats = redis_helper.cache_stats()
+    assert stats["l1"]["hits"] == 3 and stats["l1"]["misses"] == 3
+    assert stats["redis"] == {"hits": 2, "misses": 1, "hit_ratio": pytest.approx(2 / 3)}
+
+
+def test_bulk_reads_and_writes_use_one_round_trip(two_tier):
+    """
+    Test get_many, set_many with per-key TTLs and exists_many.
+    """
+    redis_helper.set_many(
+        {"market_ai:test:a": [1, 2], "market_ai:test:b": "B"}, ttl={"market_ai:test:a": 60, "market_ai:test:b": 120}
+    )
+    assert 55 < two_tier.ttl("market_ai:test:a") <= 60 and 115 < two_tier.ttl("market_ai:test:b") <= 120
+
+    redis_helper.local_cache.invalidate()
+    assert redis_helper.get_many(["market_ai:test:a", "market_ai:test:b", "market_ai:test:missing"]) == {
+        "market_ai:test:a": [1, 2], "market_ai:test:b": "B", "market_ai:test:missing": None,
+    }
+    # Found values are now local; only the miss goes back to Redis
+    assert redis_helper.get_many(["market_ai:test:a", "market_ai:test:b"]) == {"market_ai:test:a": [1, 2], "market_ai:test:b": "B"}
+    assert redis_helper.cache_stats()["redis"]["hits"] == 2 and redis_helper.cache_stats()["redis"]["misses"] == 1
+
+    assert redis_helper.exists_many(["test:a", "test:missing"]) == {"test:a": True, "test:missing": False}
@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+import numpy as np
+from joblib import dump, load
+from sklearn.ensemble import RandomForestRegressor
+from utils.flat_forest import FlatForest
+from utils.model_registry import ModelRegistry
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def make_registry(tmp_path):
+    return ModelRegistry(path_resolver=lambda sector, timeframe: str(tmp_path / f"rf_{sector}_{timeframe}.joblib"))
+
+
+def test_model_is_loaded_once_and_kept_warm(tmp_path):
+    """
+    Test that repeated lookups reuse the deserialized model.
+    """
+    dump({"weights": [1, 2, 3]}, tmp_path / "rf_tech_recent.joblib")
+    registry = make_registry(tmp_path)
+
+    first = registry.get("tech", "recent")
+    second = registry.get("tech", "recent")
+
+    assert first is second, "Registry reloaded an unchanged model!"
+    stats = registry.stats()["tech_recent"]
+    assert stats["misses"] == 1 and stats["hits"] == 1
+    assert stats["reloads"] == 0
+
+
+def test_touched_file_with_same_checksum_is_not_reloaded(tmp_path):
+    """
+    Test that an mtime change alone does not trigger a reload.
+    """
+    path = tmp_path / "rf_tech_recent.joblib"
+    dump({"weights": [1, 2, 3]}, path)
+    registry = make_registry(tmp_path)
+
+    first = registry.get("tech", "recent")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    assert registry.get("tech", "recent") is first
+    assert registry.stats()["tech_recent"]["reloads"] == 0
+
+
+def test_changed_artifact_is_reloaded(tmp_path):
+    """
+    Test that a retrained artifact replaces the warm model.
+    """
+    path = tmp_path / "rf_tech_recent.joblib"
+    dump({"weights": [1, 2, 3]}, path)
+    registry = make_registry(tmp_path)
+    registry.get("tech", "recent")
+
+    dump({"weights": [4, 5, 6, 7]}, path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    assert registry.get("tech", "recent") == {"weights": [4, 5, 6, 7]}
+    assert registry.stats()["tech_recent"]["reloads"] == 1
+
+
+def test_missing_model_raises(tmp_path):
+    """
+    Test that a missing artifact surfaces as FileNotFoundError.
+    """
+    registry = make_registry(tmp_path)
+    try:
+        registry.get("tech", "recent")
+    except FileNotFoundError:
+        logging.info("FileNotFoundError raised as expected.")
+    else:
+        raise AssertionError("Expected FileNotFoundError for a missing model.")
+
+
+def test_predictor_is_flattened_once_per_loaded_model(tmp_path):
+    """
+    Test that forests are served as a cached FlatForest for small batches only.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(100, 3))
+    dump(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 0]), tmp_path / "rf_tech_recent.joblib")
+    registry = make_registry(tmp_path)
+
+    predictor = registry.get_predictor("tech", "recent")
+    assert isinstance(predictor, FlatForest)
+    assert registry.get_predictor("tech", "recent") is predictor
+    assert registry.get_predictor("tech", "recent", batch_rows=1000) is registry.get("tech", "recent")
+    np.testing.assert_allclose(predictor.predict(X), registry.get("tech", "recent").predict(X), rtol=1e-12)
+
+
+def test_loading_one_model_does_not_block_others(tmp_path):
+    """
+    Test that lookups of a warm model are served while another model is being loaded.
+    """
+    dump({"sector": "tech"}, tmp_path / "rf_tech_recent.joblib")
+    dump({"sector": "finance"}, tmp_path / "rf_finance_recent.joblib")
+    loading, release = threading.Event(), threading.Event()
+
+    def loader(path):
+        if "finance" in path:
+            loading.set()
+            assert release.wait(5), "Load was never released"
+        return load(path)
+
+    registry = ModelRegistry(
+        path_resolver=lambda sector, timeframe: str(tmp_path / f"rf_{sector}_{timeframe}.joblib"), loader=loader,
+    )
+    registry.get("tech", "recent")
+    results = []
+    slow = threading.Thread(target=lambda: results.append(registry.get("finance", "recent")))
+    slow.start()
+    assert loading.wait(5)
+
+    # The finance load is still blocked: a tech lookup must not wait for it
+    fast = threading.Thread(target=lambda: results.append(registry.get("tech", "recent")))
+    fast.start()
+    fast.join(1)
+    assert not fast.is_alive() and results == [{"sector": "tech"}]
+
+    release.set()
+    slow.join(5)
+    assert results[-1] == {"sector": "finance"}
+    assert registry.stats()["finance_recent"]["misses"] == 1
@@ -0,0 +1,153 @@
+import logging
+import random
+import threading
+import time
+import pandas as pd
+import pytest
+from utils import single_flight
+from utils.single_flight import SingleFlight
+
+# Logging configuration for debugging
+logging.basicConfig(level=logging.INFO)
+
+
+def test_concurrent_callers_share_one_computation():
+    """
+    Test that callers arriving during a computation wait for it instead of recomputing.
+    """
+    flight = SingleFlight("test_local")
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("AAPL", compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["coalesced_local"] < 7:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * 8
+    stats = flight.stats()
+    assert stats["leaders"] == 1 and stats["coalesced"] == 7 and stats["in_flight"] == 0
+
+
+def test_followers_receive_the_leaders_error():
+    """
+    Test that a failed computation is raised to every waiting caller and then forgotten.
+    """
+    flight = SingleFlight("test_error")
+
+    def compute():
+        raise ValueError("download failed")
+
+    with pytest.raises(ValueError):
+        flight.do("AAPL", compute)
+    assert flight.do("AAPL", lambda: "ok") == "ok"
+
+
+def test_waits_for_result_published_by_another_worker(monkeypatch):
+    """
+    Test that a worker finding the Redis lock taken returns the other worker's cached result.
+    """
+    monkeypatch.setattr(single_flight, "acquire_lock", lambda key, ttl_ms: None)
+    monkeypatch.setattr(single_flight, "cache_key_exists", lambda key: True)
+    flight = SingleFlight("test_remote", poll_interval=0.001)
+    lookups = iter([None, None, "published"])
+
+    result = flight.do("AAPL", lambda: pytest.fail("Computed despite the lock being held"), lambda: next(lookups))
+
+    assert result == "published"
+    assert flight.stats()["coalesced_remote"] == 1
+
+
+def test_computes_when_lock_holder_disappears(monkeypatch):
+    """
+    Test the fallback when the lock is released without a published result.
+    """
+    monkeypatch.setattr(single_flight, "acquire_lock", lambda key, ttl_ms: None)
+    monkeypatch.setattr(single_flight, "cache_key_exists", lambda key: False)
+    flight = SingleFlight("test_fallback", poll_interval=0.001)
+
+    assert flight.do("AAPL", lambda: "computed", lambda: None) == "computed"
+    assert flight.stats()["lock_fallbacks"] == 1
+
+
+def test_background_refresh_runs_once_and_frees_the_key(monkeypatch):
+    """
+    Test that a refresh in progress here or in another worker is not started again.
+    """
+    released = []
+    monkeypatch.setattr(single_flight, "acquire_lock", lambda key, ttl_ms: "token")
+    monkeypatch.setattr(single_flight, "release_lock", lambda key, token: released.append(key))
+    flight = SingleFlight("test_refresh")
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("download failed")
+
+    assert flight.refresh("AAPL", compute)
+    assert not flight.refresh("AAPL", compute)
+    release.set()
+    while flight.stats()["refreshing"]:
+        time.sleep(0.01)
+    assert released == ["market_ai:lock:test_refresh:AAPL"]
+
+    # Lock held by another worker
+    monkeypatch.setattr(single_flight, "acquire_lock", lambda key, ttl_ms: None)
+    assert not flight.refresh("AAPL", compute)
+    stats = flight.stats()
+    assert stats["refreshes"] == 1 and stats["refreshes_skipped"] == 2 and stats["refresh_errors"] == 1
+
+
+def test_early_refresh_probability_rises_towards_expiry():
+    """
+    Test the XFetch decision: never far from expiry, sometimes close to it, always after it.
+    """
+    rng = random.Random(3)
+    refreshed = {
+        remaining: sum(single_flight.should_refresh(100.0, 2.0, now=100.0 - remaining, rng=rng) for _ in range(1000))
+        for remaining in (60.0, 2.0, 0.0)
+    }
+    assert refreshed[60.0] == 0
+    assert 200 < refreshed[2.0] < 500  # exp(-1) of the readers
+    assert refreshed[0.0] == 1000
+
+
+def test_stale_value_is_served_while_refreshing(monkeypatch):
+    """
+    Test that an expired market-data value is returned at once and refreshed in the background.
+    """
+    from resources import data_resource
+
+    store = {}
+    monkeypatch.setattr(data_resource, "get_from_cache", store.get)
+    monkeypatch.setattr(data_resource, "set_many", lambda values, ttl=None: store.update(values))
+    monkeypatch.setattr(single_flight, "acquire_lock", lambda key, ttl_ms: "token")
+    monkeypatch.setattr(single_flight, "release_lock", lambda key, token: True)
+    monkeypatch.setattr(data_resource, "stock_data_flight", SingleFlight("test_stale"))
+    downloads = []
+
+    def fetch(symbol):
+        downloads.append(symbol)
+        return pd.DataFrame({"Close": [float(len(downloads))]})
+
+    fetch_and_cache = data_resource.BaseDataFetchResource.fetch_and_cache
+    assert fetch_and_cache("AAPL", "stock_data:AAPL", fetch)["Close"][0] == 1.0
+    assert fetch_and_cache("AAPL", "stock_data:AAPL", fetch)["Close"][0] == 1.0
+    assert downloads == ["AAPL"]
+
+    store["stock_data:AAPL:freshness"]["expires_at"] = time.time() - 1
+    assert fetch_and_cache("AAPL", "stock_data:AAPL", fetch)["Close"][0] == 1.0  # Stale, refresh started
+    while data_resource.stock_data_flight.stats()["refreshing"]:
+        time.sleep(0.01)
+    assert fetch_and_cache("AAPL", "stock_data:AAPL", fetch)["Close"][0] == 2.0